@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Benchmark noise filtering and categorization as used by analyze and rules.
+
+Generates synthetic feedback records (mostly prose, some command output),
+then times the analyze and rules passes against the per-keyword scans
+they replaced, checking that both produce identical results.
+
+Usage:
+    scripts/bench_feedback_filtering.py [--items 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+
+from edify.filtering import classify_content, filter_rule_items
+from edify.models import FeedbackRecord, FeedbackType
+
+_PROSE = [
+    "lorem",
+    "ipsum",
+    "dolor",
+    "sit",
+    "amet",
+    "consectetur",
+    "adipiscing",
+    "elit",
+    "sed",
+    "do",
+    "eiusmod",
+    "tempor",
+    "incididunt",
+    "ut",
+    "labore",
+    "et",
+    "dolore",
+    "magna",
+    "aliqua",
+]
+_FEEDBACK = [
+    "the",
+    "parser",
+    "should",
+    "keep",
+    "module",
+    "state",
+    "small",
+    "and",
+    "we",
+    "plan",
+    "to",
+    "fix",
+    "the",
+    "error",
+    "before",
+    "review",
+    "please",
+    "don't",
+    "refactor",
+    "everything",
+    "it",
+    "is",
+    "wrong",
+    "always",
+    "run",
+    "tests",
+]
+_NOISE = (
+    "<command-name>/clear</command-name>",
+    "<bash-stdout>ok</bash-stdout>",
+    "Caveat: The messages below were generated by the user",
+    "Warmup",
+)
+
+
+def build_records(count: int) -> list[FeedbackRecord]:
+    """Return count synthetic feedback records."""
+    rng = random.Random(0)  # noqa: S311 - reproducible corpus, not crypto
+    records: list[FeedbackRecord] = []
+    for n in range(count):
+        if rng.random() < 0.1:
+            content = rng.choice(_NOISE)
+        else:
+            words = [
+                rng.choice(_PROSE if rng.random() < 0.8 else _FEEDBACK)
+                for _ in range(rng.randint(2, 60))
+            ]
+            content = " ".join(words).capitalize()
+            if rng.random() < 0.05:
+                content = "How " + content
+        records.append(
+            FeedbackRecord(
+                timestamp=f"2025-12-16T{n // 3600 % 24:02d}:{n // 60 % 60:02d}:"
+                f"{n % 60:02d}.000Z",
+                session_id=f"session-{n // 500:04d}",
+                feedback_type=FeedbackType.MESSAGE,
+                content=content,
+            )
+        )
+    return records
+
+
+def _is_noise_before(content: str) -> bool:
+    if "<command-name>" in content:
+        return True
+    if "<bash-stdout>" in content or "<bash-input>" in content:
+        return True
+    if "Caveat:" in content or "Warmup" in content or "<tool_use_error>" in content:
+        return True
+    return len(content) < 10
+
+
+def _categorize_before(content: str) -> str:
+    content_lower = content.lower()
+    for category, keywords in (
+        ("code_review", ["review", "refactor", "improve", "clarity"]),
+        ("process", ["plan", "next step", "workflow", "before", "after"]),
+        ("corrections", ["no", "wrong", "incorrect", "fix", "error"]),
+        ("instructions", ["don't", "never", "always", "must", "should"]),
+    ):
+        if any(keyword in content_lower for keyword in keywords):
+            return category
+    return "instructions"
+
+
+def analyze_before(records: list[FeedbackRecord]) -> dict[str, int]:
+    """Count categories with separate noise and keyword scans."""
+    categories: dict[str, int] = {}
+    for record in records:
+        if _is_noise_before(record.content):
+            continue
+        category = _categorize_before(record.content)
+        categories[category] = categories.get(category, 0) + 1
+    return categories
+
+
+def analyze_after(records: list[FeedbackRecord]) -> dict[str, int]:
+    """Count categories with classify_content."""
+    categories: dict[str, int] = {}
+    for record in records:
+        category = classify_content(record.content)
+        if category is not None:
+            categories[category] = categories.get(category, 0) + 1
+    return categories
+
+
+def rules_before(records: list[FeedbackRecord]) -> list[FeedbackRecord]:
+    """Select rule items with the lowercasing filter chain."""
+    filtered = [r for r in records if not _is_noise_before(r.content)]
+    rule_items = [
+        r
+        for r in filtered
+        if not (
+            r.content.lower().startswith("how ")
+            or r.content.lower().startswith("claude code:")
+            or len(r.content) < 20
+            or len(r.content) > 1000
+        )
+    ]
+    rule_items.sort(key=lambda r: r.timestamp)
+    seen: set[str] = set()
+    deduped = []
+    for r in rule_items:
+        prefix = r.content[:100].lower()
+        if prefix not in seen:
+            seen.add(prefix)
+            deduped.append(r)
+    return deduped
+
+
+def _timed(
+    label: str, before: Callable[[], object], after: Callable[[], object]
+) -> None:
+    start = time.perf_counter()
+    expected = before()
+    before_s = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = after()
+    after_s = time.perf_counter() - start
+    if actual != expected:
+        msg = f"{label}: results differ"
+        raise SystemExit(msg)
+    print(f"{label:<8} {before_s:6.2f}s -> {after_s:6.2f}s ({before_s / after_s:.2f}x)")
+
+
+def main() -> None:
+    """Build the records and print timings for analyze and rules."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    args = parser.parse_args()
+    records = build_records(args.items)
+
+    print(f"{args.items} items")
+    _timed("analyze", lambda: analyze_before(records), lambda: analyze_after(records))
+    _timed(
+        "rules",
+        lambda: rules_before(records),
+        lambda: filter_rule_items(records, 20),
+    )
+
+
+if __name__ == "__main__":
+    main()
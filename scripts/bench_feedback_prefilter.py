@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark the byte-level user-entry prefilter in feedback extraction.
+
+Generates a synthetic session corpus shaped like Claude Code transcripts
+(large assistant and tool-result entries, occasional user prompts), then
+times full json.loads on every line against the prefiltered extractor.
+
+Usage:
+    scripts/bench_feedback_prefilter.py [--size-mb 500] [--file-mb 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from edify.parsing import _extract_feedback_from_file, extract_feedback_from_entry
+
+
+def _text(rng: random.Random, size: int) -> str:
+    words = ["parser", "token", "state", "refactor", "module", "line", "cache"]
+    out: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        out.append(word)
+        length += len(word) + 1
+    return " ".join(out)
+
+
+def _entry(rng: random.Random, session_id: str, n: int) -> dict[str, object]:
+    base = {
+        "sessionId": session_id,
+        "timestamp": f"2025-12-16T08:{n // 60 % 60:02d}:{n % 60:02d}.000Z",
+        "userType": "external",
+        "uuid": f"{n:032x}",
+    }
+    roll = rng.random()
+    if roll < 0.45:
+        content = [
+            {"type": "thinking", "thinking": _text(rng, 2_000)},
+            {"type": "tool_use", "id": f"t{n}", "input": {"s": _text(rng, 6_000)}},
+        ]
+        return {**base, "type": "assistant", "message": {"content": content}}
+    if roll < 0.80:
+        result = {"type": "tool_result", "tool_use_id": f"t{n}"}
+        result["content"] = _text(rng, 8_000)
+        return {**base, "type": "user", "message": {"content": [result]}}
+    if roll < 0.85:
+        prompt = _text(rng, 200)
+        return {**base, "type": "user", "message": {"content": prompt}}
+    return {**base, "type": "progress", "data": {"output": _text(rng, 1_000)}}
+
+
+def build_corpus(directory: Path, size_mb: int, file_mb: int) -> list[Path]:
+    """Write synthetic session files totalling about size_mb megabytes."""
+    rng = random.Random(0)  # noqa: S311 - reproducible corpus, not crypto
+    files: list[Path] = []
+    total = 0
+    n = 0
+    while total < size_mb * 1_000_000:
+        path = directory / f"session-{len(files):04d}.jsonl"
+        written = 0
+        with path.open("w") as f:
+            while written < file_mb * 1_000_000:
+                line = json.dumps(_entry(rng, path.stem, n)) + "\n"
+                f.write(line)
+                written += len(line)
+                n += 1
+        files.append(path)
+        total += written
+    return files
+
+
+def extract_without_prefilter(path: Path) -> int:
+    """Decode every line, as extraction did before the prefilter."""
+    count = 0
+    for line in path.read_text().strip().split("\n"):
+        if not line:
+            continue
+        try:
+            if extract_feedback_from_entry(json.loads(line)):
+                count += 1
+        except json.JSONDecodeError:
+            continue
+    return count
+
+
+def main() -> None:
+    """Build the corpus and print throughput for both extractors."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--file-mb", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = build_corpus(Path(tmp), args.size_mb, args.file_mb)
+        size_mb = sum(f.stat().st_size for f in files) / 1_000_000
+
+        start = time.perf_counter()
+        baseline = sum(extract_without_prefilter(f) for f in files)
+        baseline_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        prefiltered = sum(len(_extract_feedback_from_file(f)) for f in files)
+        prefiltered_s = time.perf_counter() - start
+
+    if baseline != prefiltered:
+        msg = f"Item count mismatch: {baseline} != {prefiltered}"
+        raise SystemExit(msg)
+    print(f"Corpus: {len(files)} files, {size_mb:.0f} MB, {baseline} items")
+    print(f"json.loads every line: {baseline_s:6.2f}s")
+    print(f"byte prefilter:        {prefiltered_s:6.2f}s")
+    print(f"Speedup: {baseline_s / prefiltered_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark FeedbackRecord against pydantic FeedbackItem in bulk pipelines.
+
+Times the three stages that dominate collect, analyze and rules on large
+inputs (building items from entries, writing NDJSON, reading it back) and
+measures peak memory of holding every item, once per representation.
+
+Usage:
+    scripts/bench_feedback_records.py [--items 300000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+
+from edify.models import FeedbackItem, FeedbackRecord, FeedbackType
+
+_ITEM = TypeAdapter(FeedbackItem)
+_RECORD = TypeAdapter(FeedbackRecord)
+
+
+def _fields(n: int) -> dict[str, object]:
+    return {
+        "timestamp": f"2025-12-16T08:{n // 60 % 60:02d}:{n % 60:02d}.000Z",
+        "session_id": f"session-{n // 500:04d}",
+        "feedback_type": FeedbackType.MESSAGE,
+        "content": f"Please keep the parser module free of global state ({n})",
+        "agent_id": None,
+        "slug": "quiet-parser",
+        "tool_use_id": None,
+    }
+
+
+def _timed[T](label: str, func: Callable[[], T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<8} {elapsed:6.2f}s")
+    return result, elapsed
+
+
+def _peak_mb(func: Callable[[], object]) -> float:
+    tracemalloc.start()
+    kept = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del kept
+    return peak / 1_000_000
+
+
+def bench_items(rows: list[dict[str, object]]) -> float:
+    """Run the pipeline on pydantic items, returning total seconds."""
+    print("FeedbackItem")
+    items, build = _timed("build", lambda: [FeedbackItem(**r) for r in rows])  # type: ignore[arg-type]
+    text, dump = _timed(
+        "dump", lambda: "".join(i.model_dump_json() + "\n" for i in items)
+    )
+    _, load = _timed(
+        "load", lambda: [_ITEM.validate_json(line) for line in io.StringIO(text)]
+    )
+    return build + dump + load
+
+
+def bench_records(rows: list[dict[str, object]]) -> float:
+    """Run the pipeline on slots records, returning total seconds."""
+    print("FeedbackRecord")
+    records, build = _timed(
+        "build", lambda: [FeedbackRecord.from_dict(r) for r in rows]
+    )
+
+    text, dump = _timed(
+        "dump", lambda: "".join(_RECORD.dump_json(r).decode() + "\n" for r in records)
+    )
+    _, load = _timed(
+        "load", lambda: [_RECORD.validate_json(line) for line in io.StringIO(text)]
+    )
+    return build + dump + load
+
+
+def main() -> None:
+    """Print per-stage timings and peak memory for both representations."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=300_000)
+    args = parser.parse_args()
+    rows = [_fields(n) for n in range(args.items)]
+
+    item_s = bench_items(rows)
+    record_s = bench_records(rows)
+    item_mb = _peak_mb(lambda: [FeedbackItem(**r) for r in rows])  # type: ignore[arg-type]
+    record_mb = _peak_mb(lambda: [FeedbackRecord.from_dict(r) for r in rows])
+
+    print(f"{args.items} items")
+    print(f"Time:   {item_s:6.2f}s vs {record_s:6.2f}s ({item_s / record_s:.2f}x)")
+    print(
+        f"Memory: {item_mb:6.1f}MB vs {record_mb:6.1f}MB ({item_mb / record_mb:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
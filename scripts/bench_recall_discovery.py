@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark discovery pattern classification in recall analysis.
+
+Generates one session of tool calls and a set of referenced files, then
+times classifying every file by rescanning the tool calls, as recall
+did before the file access index, against one FileAccessIndex per
+session.
+
+Usage:
+    scripts/bench_recall_discovery.py [--tool-calls 10000] [--entries 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from edify.recall.file_access import FileAccessIndex, _extract_file_from_input
+from edify.recall.recall import DiscoveryPattern, classify_discovery_pattern
+from edify.recall.relevance import RelevanceScore
+from edify.recall.tool_calls import ToolCall
+
+_DIRS = ["agents/decisions", "agents/learnings", "src/edify", "plugin/skills"]
+
+
+def _matches_file_or_parent(target_file: str, tool_file: str) -> bool:
+    """Match a tool path against a referenced file, as recall did per call."""
+    target_path = Path(target_file)
+    tool_path = Path(tool_file)
+    if target_path == tool_path:
+        return True
+    if tool_path.is_absolute() != target_path.is_absolute():
+        abs_path, rel_path = (
+            (tool_path, target_path)
+            if tool_path.is_absolute()
+            else (target_path, tool_path)
+        )
+        if (
+            len(rel_path.parts) <= len(abs_path.parts)
+            and abs_path.parts[-len(rel_path.parts) :] == rel_path.parts
+        ):
+            return True
+    try:
+        target_path.relative_to(tool_path)
+    except ValueError:
+        return False
+    return not tool_path.suffix
+
+
+def classify_by_scanning(
+    tool_calls: list[ToolCall], referenced_file: str
+) -> DiscoveryPattern:
+    """Classify by scanning every tool call, as recall did before the index."""
+    read_calls = [
+        tc
+        for tc in tool_calls
+        if tc.tool_name == "Read"
+        and _matches_file_or_parent(
+            referenced_file, _extract_file_from_input(tc.input) or ""
+        )
+    ]
+    if not read_calls:
+        return DiscoveryPattern.NOT_FOUND
+    for tc in tool_calls[: tool_calls.index(read_calls[0])]:
+        if tc.tool_name in {"Grep", "Glob"}:
+            tool_file = _extract_file_from_input(tc.input)
+            if tool_file and _matches_file_or_parent(referenced_file, tool_file):
+                return DiscoveryPattern.SEARCH_THEN_READ
+    return DiscoveryPattern.DIRECT
+
+
+def build_session(
+    rng: random.Random, tool_calls: int, files: list[str]
+) -> list[ToolCall]:
+    """Tool calls reading and searching a mix of referenced and other files."""
+    calls = []
+    for n in range(tool_calls):
+        name = rng.choice(["Read", "Read", "Grep", "Glob", "Bash", "Write"])
+        target = rng.choice(files) if rng.random() < 0.3 else f"tmp/other-{n}.py"
+        if name in {"Grep", "Glob"} and rng.random() < 0.5:
+            target = str(Path(target).parent)
+        if rng.random() < 0.5:
+            target = f"/home/user/project/{target}"
+        key = "path" if name in {"Grep", "Glob"} else "file_path"
+        calls.append(
+            ToolCall(
+                tool_name=name,
+                tool_id=f"toolu_{n}",
+                input={} if name == "Bash" else {key: target},
+                timestamp=f"2025-12-16T08:00:{n:06d}",
+                session_id="bench",
+            )
+        )
+    return calls
+
+
+def main() -> None:
+    """Build the session and print timings for both classifiers."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tool-calls", type=int, default=10_000)
+    parser.add_argument("--entries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(0)  # noqa: S311 - reproducible session, not crypto
+    files = [f"{rng.choice(_DIRS)}/topic-{i}.md" for i in range(args.entries)]
+    calls = build_session(rng, args.tool_calls, files)
+
+    start = time.perf_counter()
+    scanned = [classify_by_scanning(calls, f) for f in files]
+    scanned_s = time.perf_counter() - start
+
+    score = RelevanceScore(
+        session_id="bench",
+        entry_key="",
+        score=1.0,
+        is_relevant=True,
+        matched_keywords=set(),
+    )
+    start = time.perf_counter()
+    access = FileAccessIndex(calls)
+    indexed = [
+        classify_discovery_pattern(score, calls, f, "bench", access) for f in files
+    ]
+    indexed_s = time.perf_counter() - start
+
+    if scanned != indexed:
+        msg = "Classification mismatch between scan and index"
+        raise SystemExit(msg)
+    counts = {p.value: indexed.count(p) for p in DiscoveryPattern}
+    print(f"Session: {len(calls)} tool calls, {len(files)} entries, {counts}")
+    print(f"scan per entry:    {scanned_s:8.3f}s")
+    print(f"file access index: {indexed_s:8.3f}s")
+    print(f"Speedup: {scanned_s / indexed_s:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Per-file byte-offset checkpoints for incremental feedback extraction.
+
+Session and agent files are append-only, so a file only needs parsing
+from the offset reached on the previous run. Each checkpoint stores that
+offset, the feedback extracted before it and a fingerprint of the bytes
+around it, which detects files that were truncated or replaced. The
+fingerprint also covers the extraction rules version, so feedback
+extracted under older rules is extracted again.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import Integer, String, Text, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Mapped, mapped_column, sessionmaker
+
+from edify.models import FeedbackRecord
+from edify.parsing import FEEDBACK_RULES_VERSION, scan_feedback
+from edify.session_index import Base, get_default_engine
+
+logger = logging.getLogger(__name__)
+
+# Bytes hashed from the start of the file and from just before the offset
+_FINGERPRINT_SPAN = 4096
+
+
+class CheckpointEntry(Base):
+    """Stored checkpoint for one JSONL file, keyed by path."""
+
+    __tablename__ = "feedback_checkpoints"
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    directory: Mapped[str] = mapped_column(String, index=True)
+    offset: Mapped[int] = mapped_column(Integer)
+    fingerprint: Mapped[str] = mapped_column(String)
+    agent_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    items: Mapped[str] = mapped_column(Text)
+
+
+@dataclass
+class Checkpoint:
+    """Extraction state of a file up to a byte offset."""
+
+    offset: int
+    fingerprint: str
+    agent_id: str | None = None
+    items: list[FeedbackRecord] = field(default_factory=list)
+
+
+@dataclass
+class CheckpointSet:
+    """Checkpoints for one history directory during a run.
+
+    New checkpoints go to updated, so only they need saving afterwards.
+    """
+
+    saved: dict[str, Checkpoint] = field(default_factory=dict)
+    updated: dict[str, Checkpoint] = field(default_factory=dict)
+
+    def get(self, path: Path) -> Checkpoint | None:
+        """Return the latest checkpoint for path, if any."""
+        key = str(path)
+        return self.updated.get(key) or self.saved.get(key)
+
+
+def fingerprint(path: Path, offset: int) -> str:
+    """Hash the rules version, the head of path and the bytes before offset."""
+    digest = hashlib.md5(usedforsecurity=False)
+    digest.update(f"rules-v{FEEDBACK_RULES_VERSION}\n".encode())
+    with path.open("rb") as f:
+        digest.update(f.read(min(offset, _FINGERPRINT_SPAN)))
+        tail_start = max(0, offset - _FINGERPRINT_SPAN)
+        f.seek(tail_start)
+        digest.update(f.read(offset - tail_start))
+    return digest.hexdigest()
+
+
+def _resume_point(path: Path, checkpoint: Checkpoint | None) -> Checkpoint | None:
+    """Return checkpoint if path still holds the bytes it was taken from."""
+    if checkpoint is None:
+        return None
+    if path.stat().st_size < checkpoint.offset:
+        return None
+    if fingerprint(path, checkpoint.offset) != checkpoint.fingerprint:
+        return None
+    return checkpoint
+
+
+def extract_file_incrementally(
+    path: Path, checkpoints: CheckpointSet, *, find_agent_id: bool = False
+) -> tuple[list[FeedbackRecord], str | None]:
+    """Extract feedback from path, parsing only bytes past its checkpoint.
+
+    Only newline-terminated lines advance the checkpoint. Feedback from a
+    final partial line is returned but parsed again on the next run.
+
+    Args:
+        path: Path to session or agent JSONL file
+        checkpoints: Checkpoints for the file's history directory
+        find_agent_id: Whether to look for the agentId field (agent files)
+
+    Returns:
+        Tuple of (feedback items, agent ID)
+    """
+    checkpoint = _resume_point(path, checkpoints.get(path))
+    start, items, agent_id = (
+        (checkpoint.offset, checkpoint.items, checkpoint.agent_id)
+        if checkpoint is not None
+        else (0, [], None)
+    )
+    scan = scan_feedback(path, start, agent_id, find_agent_id=find_agent_id)
+    items = items + scan.items
+    if checkpoint is None or scan.offset != start:
+        checkpoints.updated[str(path)] = Checkpoint(
+            offset=scan.offset,
+            fingerprint=fingerprint(path, scan.offset),
+            agent_id=scan.agent_id,
+            items=items,
+        )
+    return items + scan.tail, scan.agent_id
+
+
+class CheckpointStore:
+    """Checkpoint storage backed by SQLite via SQLAlchemy."""
+
+    def __init__(self, engine: Engine) -> None:
+        """Initialize store with database engine."""
+        self._session_factory = sessionmaker(bind=engine)
+
+    def load(self, history_dir: Path) -> CheckpointSet:
+        """Load every checkpoint stored for files in history_dir."""
+        with self._session_factory() as session:
+            entries = session.scalars(
+                select(CheckpointEntry).where(
+                    CheckpointEntry.directory == str(history_dir)
+                )
+            )
+            saved = {
+                entry.path: Checkpoint(
+                    offset=entry.offset,
+                    fingerprint=entry.fingerprint,
+                    agent_id=entry.agent_id,
+                    items=[
+                        FeedbackRecord.from_dict(item)
+                        for item in json.loads(entry.items)
+                    ],
+                )
+                for entry in entries
+            }
+        return CheckpointSet(saved=saved)
+
+    def save(self, history_dir: Path, checkpoints: Mapping[str, Checkpoint]) -> None:
+        """Insert or replace checkpoints in a single transaction."""
+        with self._session_factory() as session:
+            for path, checkpoint in checkpoints.items():
+                session.merge(
+                    CheckpointEntry(
+                        path=path,
+                        directory=str(history_dir),
+                        offset=checkpoint.offset,
+                        fingerprint=checkpoint.fingerprint,
+                        agent_id=checkpoint.agent_id,
+                        items=json.dumps([item.to_dict() for item in checkpoint.items]),
+                    )
+                )
+            session.commit()
+
+
+def load_checkpoints(history_dir: Path) -> CheckpointSet:
+    """Load checkpoints for history_dir from the default store.
+
+    Starts from an empty set when the store is unavailable.
+    """
+    try:
+        return CheckpointStore(get_default_engine()).load(history_dir)
+    except SQLAlchemyError, OSError:
+        logger.warning("Checkpoint store unavailable, extracting from scratch")
+    return CheckpointSet()
+
+
+def save_checkpoints(history_dir: Path, checkpoints: CheckpointSet) -> None:
+    """Persist checkpoints updated during this run, if any."""
+    if not checkpoints.updated:
+        return
+    try:
+        CheckpointStore(get_default_engine()).save(history_dir, checkpoints.updated)
+    except SQLAlchemyError, OSError:
+        logger.warning("Checkpoint store unavailable, checkpoints not saved")
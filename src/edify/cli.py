@@ -4,90 +4,44 @@ import json
 import logging
 import re
 import sys
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
-from typing import cast
 
 import click
 
 from edify.account.cli import account
-from edify.compose import compose, load_config
-from edify.discovery import list_top_level_sessions
+from edify.checkpoints import CheckpointSet, load_checkpoints, save_checkpoints
+from edify.compose_cli import compose_command
+from edify.discovery import (
+    AgentGraph,
+    list_history_sessions,
+    list_projects,
+    list_top_level_sessions,
+)
 from edify.exceptions import ClaudeUtilsError
-from edify.extraction import extract_feedback_recursively
-from edify.filtering import categorize_feedback, filter_feedback
+from edify.extraction import (
+    extract_feedback_recursively,
+    extract_history_feedback,
+    extract_sessions_parallel,
+)
+from edify.feedback_io import FEEDBACK_FORMATS, read_feedback, write_feedback
+from edify.filtering import classify_content, filter_rule_items
 from edify.git_cli import git_group
 from edify.markdown import process_file
 from edify.model.cli import model
-from edify.models import FeedbackItem
+from edify.models import FeedbackItem, FeedbackRecord
 from edify.paths import get_project_history_dir
+from edify.projects import collect_projects, find_session_in_projects, tag_feedback
 from edify.recall.cli import recall
 from edify.recall_cli.cli import recall_cmd
 from edify.session.cli import commit_cmd, handoff_cmd, status_cmd
 from edify.statusline.cli import statusline
-from edify.tokens_cli import handle_tokens
+from edify.tokens_cli import tokens
 from edify.validation.cli import validate
 from edify.when.cli import when_cmd
 from edify.worktree.cli import worktree
 
 
-def _handle_compose_error(e: Exception) -> None:
-    """Handle compose errors and exit with appropriate code."""
-    if isinstance(e, FileNotFoundError):
-        error_msg = str(e)
-        if "Fragment not found" in error_msg:
-            click.echo(f"Error: {e}", err=True)
-            sys.exit(2)
-        else:
-            click.echo(f"Error: Configuration file not found: {e}", err=True)
-            sys.exit(4)
-    elif isinstance(e, ValueError):
-        click.echo(f"Configuration error: {e}", err=True)
-        sys.exit(1)
-    elif isinstance(e, (TypeError, OSError)):
-        click.echo(f"Error: {e}", err=True)
-        sys.exit(3)
-
-
-def _show_compose_plan(config_file: str, config: dict[str, object]) -> None:
-    """Display compose plan in dry-run mode."""
-    click.echo("Dry-run mode - plan:")
-    click.echo(f"  Config: {config_file}")
-    fragments_list = config.get("fragments", [])
-    frag_count = len(fragments_list) if isinstance(fragments_list, list) else 0
-    click.echo(f"  Fragments: {frag_count} file(s)")
-    click.echo(f"  Output: {config.get('output', 'N/A')}")
-
-
-def _filter_rule_items(
-    items: list[FeedbackItem], min_length: int
-) -> list[FeedbackItem]:
-    """Filter and deduplicate feedback items for rules extraction."""
-    filtered_items = filter_feedback(items)
-    rule_items = [
-        item
-        for item in filtered_items
-        if not (
-            (
-                item.content.lower().startswith("how ")
-                or item.content.lower().startswith("claude code:")
-            )
-            or len(item.content) < min_length
-            or len(item.content) > 1000
-        )
-    ]
-
-    # Sort and deduplicate
-    rule_items.sort(key=lambda x: x.timestamp)
-    seen_prefixes: set[str] = set()
-    deduped_items = []
-    for item in rule_items:
-        prefix = item.content[:100].lower()
-        if prefix not in seen_prefixes:
-            seen_prefixes.add(prefix)
-            deduped_items.append(item)
-    return deduped_items
-
-
 def find_session_by_prefix(prefix: str, project_dir: str) -> str:
     """Find unique session ID matching prefix."""
     history_dir = get_project_history_dir(project_dir)
@@ -114,6 +68,39 @@ def find_session_by_prefix(prefix: str, project_dir: str) -> str:
     return matches[0]
 
 
+def _extract_sessions(
+    session_ids: list[str], project_dir: str, checkpoints: CheckpointSet | None
+) -> Iterator[tuple[str, list[FeedbackRecord], str | None]]:
+    """Extract sessions in-process, yielding (session_id, feedback, error).
+
+    All sessions share one agent graph, so the history directory is
+    scanned at most once per run.
+    """
+    agent_graph = AgentGraph(get_project_history_dir(project_dir))
+    for session_id in session_ids:
+        try:
+            feedback = extract_feedback_recursively(
+                session_id, project_dir, agent_graph, checkpoints
+            )
+        except (ValueError, OSError, RuntimeError) as e:
+            yield session_id, [], str(e)
+        else:
+            yield session_id, feedback, None
+
+
+def _warn_failures(
+    results: Iterable[tuple[str, Sequence[FeedbackItem | FeedbackRecord], str | None]],
+) -> Iterator[FeedbackItem | FeedbackRecord]:
+    """Yield extracted items, reporting failed sessions on stderr."""
+    for session_id, feedback, error in results:
+        if error is not None:
+            print(
+                f"Warning: Failed to extract from {session_id}: {error}",
+                file=sys.stderr,
+            )
+        yield from feedback
+
+
 @click.version_option(package_name="edify-cli", message="%(package)s %(version)s")
 @click.group(
     help="Extract feedback from Claude Code sessions",
@@ -131,20 +118,30 @@ def cli() -> None:
     )
 
 
+_ALL_PROJECTS_HELP = "Every project in ~/.claude/projects, tagged by project path"
+
+
 @cli.command("list", help="List top-level sessions")
 @click.option("--project", default=None, help="Project directory")
-def list_sessions(project: str | None) -> None:
+@click.option("--all-projects", is_flag=True, help=_ALL_PROJECTS_HELP)
+def list_sessions(project: str | None, all_projects: bool) -> None:  # noqa: FBT001
     """List sessions in project history."""
-    project = project or str(Path.cwd())
-    sessions = list_top_level_sessions(project)
-    if not sessions:
-        print("No sessions found")
+    if all_projects:
+        lines = [
+            f"{p.project_dir} [{session.session_id[:8]}] {session.title}"
+            for p in list_projects()
+            for session in list_history_sessions(p.history_dir)
+        ]
     else:
-        for session in sessions:
-            print(f"[{session.session_id[:8]}] {session.title}")
+        lines = [
+            f"[{session.session_id[:8]}] {session.title}"
+            for session in list_top_level_sessions(project or str(Path.cwd()))
+        ]
+    print("\n".join(lines) if lines else "No sessions found")
 
 
 cli.add_command(account)
+cli.add_command(compose_command)
 cli.add_command(model)
 cli.add_command(recall)
 cli.add_command(recall_cmd)
@@ -156,49 +153,111 @@ cli.add_command(handoff_cmd, "_handoff")
 cli.add_command(commit_cmd, "_commit")
 cli.add_command(status_cmd, "_status")
 cli.add_command(git_group)
+cli.add_command(tokens)
 
 
 @cli.command(help="Extract feedback from session")
 @click.argument("session_prefix")
 @click.option("--project", default=None, help="Project directory")
+@click.option("--all-projects", is_flag=True, help=_ALL_PROJECTS_HELP)
 @click.option("--output", help="Output file path")
-def extract(session_prefix: str, project: str | None, output: str | None) -> None:
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(FEEDBACK_FORMATS),
+    default="json",
+    show_default=True,
+    help="Output format (ndjson streams one item per line)",
+)
+def extract(
+    session_prefix: str,
+    project: str | None,
+    all_projects: bool,  # noqa: FBT001
+    output: str | None,
+    output_format: str,
+) -> None:
     """Extract feedback from session by prefix."""
     project = project or str(Path.cwd())
     try:
-        session_id = find_session_by_prefix(session_prefix, project)
+        if all_projects:
+            found, session_id = find_session_in_projects(
+                session_prefix, list_projects()
+            )
+        else:
+            session_id = find_session_by_prefix(session_prefix, project)
     except ValueError as e:
         print(str(e), file=sys.stderr)
         sys.exit(1)
-    feedback = extract_feedback_recursively(session_id, project)
-    json_output = json.dumps([item.model_dump(mode="json") for item in feedback])
-    (Path(output).write_text if output else print)(json_output)
+    feedback: Sequence[FeedbackItem | FeedbackRecord] = (
+        tag_feedback(extract_history_feedback(session_id, found.history_dir), found)
+        if all_projects
+        else extract_feedback_recursively(session_id, project)
+    )
+    write_feedback(feedback, output, output_format)
 
 
 @cli.command(help="Batch collect feedback from all sessions")
 @click.option("--project", default=None, help="Project directory")
+@click.option("--all-projects", is_flag=True, help=_ALL_PROJECTS_HELP)
 @click.option("--output", help="Output file path")
-def collect(project: str | None, output: str | None) -> None:
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(FEEDBACK_FORMATS),
+    default="json",
+    show_default=True,
+    help="Output format (ndjson streams one item per line)",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help=(
+        "Worker processes for extraction (0 = all cores) "
+        "[default: 1, or all cores with --all-projects]"
+    ),
+)
+@click.option(
+    "--checkpoints/--no-checkpoints",
+    default=True,
+    show_default=True,
+    help="Parse only what was appended to each file since the last run",
+)
+def collect(  # noqa: PLR0913, PLR0917
+    project: str | None,
+    all_projects: bool,  # noqa: FBT001
+    output: str | None,
+    output_format: str,
+    jobs: int | None,
+    checkpoints: bool,  # noqa: FBT001
+) -> None:
     """Collect feedback from all project sessions."""
+    if all_projects:
+        results = collect_projects(
+            list_projects(), 0 if jobs is None else jobs, use_checkpoints=checkpoints
+        )
+        write_feedback(_warn_failures(results), output, output_format)
+        return
+    jobs = 1 if jobs is None else jobs
     project = project or str(Path.cwd())
-    sessions = list_top_level_sessions(project)
-    all_feedback = []
-    for session in sessions:
-        try:
-            feedback = extract_feedback_recursively(session.session_id, project)
-            all_feedback.extend(feedback)
-        except (ValueError, OSError, RuntimeError) as e:
-            print(
-                f"Warning: Failed to extract from {session.session_id}: {e}",
-                file=sys.stderr,
-            )
-    json_output = json.dumps([item.model_dump(mode="json") for item in all_feedback])
-    (Path(output).write_text if output else print)(json_output)
+    history_dir = get_project_history_dir(project)
+    session_ids = [s.session_id for s in list_top_level_sessions(project)]
+    loaded = load_checkpoints(history_dir) if checkpoints else None
+    results = (
+        _extract_sessions(session_ids, project, loaded)
+        if jobs == 1
+        else extract_sessions_parallel(
+            session_ids, project, jobs or None, checkpoints=loaded
+        )
+    )
+    write_feedback(_warn_failures(results), output, output_format)
+    if loaded is not None:
+        save_checkpoints(history_dir, loaded)
 
 
 @cli.command(help="Analyze feedback items")
 @click.option(
-    "--input", "input_path", required=True, help="Input JSON file, or '-' for stdin"
+    "--input", "input_path", required=True, help="JSON/NDJSON file, or '-' for stdin"
 )
 @click.option(
     "--format",
@@ -209,32 +268,28 @@ def collect(project: str | None, output: str | None) -> None:
 )
 def analyze(input_path: str, output_format: str) -> None:
     """Analyze and categorize feedback."""
-    json_text = sys.stdin.read() if input_path == "-" else Path(input_path).read_text()
-    items = [FeedbackItem.model_validate(item) for item in json.loads(json_text)]
-    filtered_items = filter_feedback(items)
+    total = filtered = 0
     categories: dict[str, int] = {}
-    for item in filtered_items:
-        category = categorize_feedback(item)
+    for item in read_feedback(input_path):
+        total += 1
+        category = classify_content(item.content)
+        if category is None:
+            continue
+        filtered += 1
         categories[category] = categories.get(category, 0) + 1
     if output_format == "json":
         print(
-            json.dumps(
-                {
-                    "total": len(items),
-                    "filtered": len(filtered_items),
-                    "categories": categories,
-                }
-            )
+            json.dumps({"total": total, "filtered": filtered, "categories": categories})
         )
     else:
-        print(f"total: {len(items)}\nfiltered: {len(filtered_items)}\ncategories:")
+        print(f"total: {total}\nfiltered: {filtered}\ncategories:")
         for category, count in categories.items():
             print(f"  {category}: {count}")
 
 
 @cli.command(help="Extract rule-worthy feedback items")
 @click.option(
-    "--input", "input_path", required=True, help="Input JSON file, or '-' for stdin"
+    "--input", "input_path", required=True, help="JSON/NDJSON file, or '-' for stdin"
 )
 @click.option(
     "--min-length",
@@ -251,9 +306,7 @@ def analyze(input_path: str, output_format: str) -> None:
 )
 def rules(input_path: str, min_length: int, output_format: str) -> None:
     """Extract actionable rules from feedback."""
-    json_text = sys.stdin.read() if input_path == "-" else Path(input_path).read_text()
-    items = [FeedbackItem.model_validate(item) for item in json.loads(json_text)]
-    deduped_items = _filter_rule_items(items, min_length)
+    deduped_items = filter_rule_items(read_feedback(input_path), min_length)
     if output_format == "json":
         output = [
             {
@@ -270,103 +323,6 @@ def rules(input_path: str, min_length: int, output_format: str) -> None:
             print(f"{i}. {item.content}")
 
 
-@cli.command(help="Count tokens in one or more files using Anthropic API")
-@click.option(
-    "--model",
-    default="sonnet",
-    show_default=True,
-    metavar="{haiku,sonnet,opus}",
-    help="Model to use for token counting",
-)
-@click.argument("files", nargs=-1, required=True, metavar="FILE...")
-@click.option(
-    "--json", "json_output", is_flag=True, help="Output JSON format instead of text"
-)
-def tokens(model: str, files: tuple[str, ...], *, json_output: bool) -> None:
-    """Count tokens in files via Anthropic API."""
-    handle_tokens(model, list(files), json_output=json_output)
-
-
-@cli.command(
-    help="Compose markdown from YAML configuration",
-    epilog=(
-        "Load composition configuration from YAML file and compose markdown "
-        "fragments into a single output file. Supports header adjustment, "
-        "custom separators, and strict/warn validation modes."
-    ),
-)
-@click.argument("config_file", type=click.Path())
-@click.option(
-    "--output",
-    type=click.Path(),
-    default=None,
-    help="Override output path from config",
-)
-@click.option(
-    "--validate",
-    type=click.Choice(["strict", "warn"]),
-    default="strict",
-    help="Validation mode for missing fragments",
-)
-@click.option(
-    "--verbose",
-    is_flag=True,
-    help="Show detailed output",
-)
-@click.option(
-    "--dry-run",
-    is_flag=True,
-    help="Show plan without writing",
-)
-def compose_command(
-    config_file: str,
-    output: str | None,
-    validate: str,
-    verbose: bool,  # noqa: FBT001
-    dry_run: bool,  # noqa: FBT001
-) -> None:
-    """Compose markdown from configuration."""
-    config_path = Path(config_file)
-    if not config_path.exists():
-        click.echo(f"Error: Configuration file not found: {config_file}", err=True)
-        sys.exit(4)
-
-    try:
-        if verbose:
-            click.echo(f"Loading config from {config_file}")
-
-        config = load_config(config_file)
-
-        if output:
-            config["output"] = output
-
-        if dry_run:
-            _show_compose_plan(config_file, config)
-            return
-
-        # Extract config values with type narrowing
-        fragments_val = cast("list[Path | str]", config.get("fragments", []))
-        output_val = cast("Path | str", config["output"])
-        title_val = cast("str | None", config.get("title"))
-        adjust_headers_val = cast("bool", config.get("adjust_headers", False))
-        separator_val = cast("str", config.get("separator", "---"))
-
-        compose(
-            fragments=fragments_val,
-            output=output_val,
-            title=title_val,
-            adjust_headers=adjust_headers_val,
-            separator=separator_val,
-            validate_mode=validate,
-        )
-
-        if verbose:
-            click.echo(f"Successfully composed to {config.get('output')}")
-
-    except (FileNotFoundError, ValueError, TypeError, OSError) as e:
-        _handle_compose_error(e)
-
-
 @cli.command(help="Process markdown files")
 def markdown() -> None:
     """Process markdown files from stdin."""
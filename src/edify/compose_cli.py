@@ -0,0 +1,118 @@
+"""CLI handler for compose subcommand."""
+
+import sys
+from pathlib import Path
+from typing import cast
+
+import click
+
+from edify.compose import compose, load_config
+
+
+def _handle_compose_error(e: Exception) -> None:
+    """Handle compose errors and exit with appropriate code."""
+    if isinstance(e, FileNotFoundError):
+        error_msg = str(e)
+        if "Fragment not found" in error_msg:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(2)
+        else:
+            click.echo(f"Error: Configuration file not found: {e}", err=True)
+            sys.exit(4)
+    elif isinstance(e, ValueError):
+        click.echo(f"Configuration error: {e}", err=True)
+        sys.exit(1)
+    elif isinstance(e, (TypeError, OSError)):
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(3)
+
+
+def _show_compose_plan(config_file: str, config: dict[str, object]) -> None:
+    """Display compose plan in dry-run mode."""
+    click.echo("Dry-run mode - plan:")
+    click.echo(f"  Config: {config_file}")
+    fragments_list = config.get("fragments", [])
+    frag_count = len(fragments_list) if isinstance(fragments_list, list) else 0
+    click.echo(f"  Fragments: {frag_count} file(s)")
+    click.echo(f"  Output: {config.get('output', 'N/A')}")
+
+
+@click.command(
+    "compose",
+    help="Compose markdown from YAML configuration",
+    epilog=(
+        "Load composition configuration from YAML file and compose markdown "
+        "fragments into a single output file. Supports header adjustment, "
+        "custom separators, and strict/warn validation modes."
+    ),
+)
+@click.argument("config_file", type=click.Path())
+@click.option(
+    "--output",
+    type=click.Path(),
+    default=None,
+    help="Override output path from config",
+)
+@click.option(
+    "--validate",
+    type=click.Choice(["strict", "warn"]),
+    default="strict",
+    help="Validation mode for missing fragments",
+)
+@click.option(
+    "--verbose",
+    is_flag=True,
+    help="Show detailed output",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show plan without writing",
+)
+def compose_command(
+    config_file: str,
+    output: str | None,
+    validate: str,
+    verbose: bool,  # noqa: FBT001
+    dry_run: bool,  # noqa: FBT001
+) -> None:
+    """Compose markdown from configuration."""
+    config_path = Path(config_file)
+    if not config_path.exists():
+        click.echo(f"Error: Configuration file not found: {config_file}", err=True)
+        sys.exit(4)
+
+    try:
+        if verbose:
+            click.echo(f"Loading config from {config_file}")
+
+        config = load_config(config_file)
+
+        if output:
+            config["output"] = output
+
+        if dry_run:
+            _show_compose_plan(config_file, config)
+            return
+
+        # Extract config values with type narrowing
+        fragments_val = cast("list[Path | str]", config.get("fragments", []))
+        output_val = cast("Path | str", config["output"])
+        title_val = cast("str | None", config.get("title"))
+        adjust_headers_val = cast("bool", config.get("adjust_headers", False))
+        separator_val = cast("str", config.get("separator", "---"))
+
+        compose(
+            fragments=fragments_val,
+            output=output_val,
+            title=title_val,
+            adjust_headers=adjust_headers_val,
+            separator=separator_val,
+            validate_mode=validate,
+        )
+
+        if verbose:
+            click.echo(f"Successfully composed to {config.get('output')}")
+
+    except (FileNotFoundError, ValueError, TypeError, OSError) as e:
+        _handle_compose_error(e)
@@ -3,68 +3,88 @@
 import json
 import logging
 import re
+from itertools import islice
 from pathlib import Path
 
-from .models import FeedbackItem, SessionInfo
-from .parsing import (
-    extract_content_text,
-    extract_feedback_from_entry,
-    format_title,
-)
-from .paths import get_project_history_dir
+from .jsonl import iter_lines
+from .models import FeedbackRecord, ProjectInfo, SessionInfo
+from .parsing import scan_feedback
+from .paths import decode_project_path, get_project_history_dir, get_projects_dir
+from .session_index import STATUS_MALFORMED, STATUS_OK, scan_history_dir
 
 logger = logging.getLogger(__name__)
 
+_UUID_PATTERN = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.jsonl$"
+)
+
+# Leading lines of a session file searched for the project's cwd
+_CWD_SEARCH_LINES = 20
+
 
 def list_top_level_sessions(project_dir: str) -> list[SessionInfo]:
-    """List sessions sorted by timestamp with extracted titles."""
-    history_dir = get_project_history_dir(project_dir)
-    sessions = []
+    """List sessions sorted by timestamp with extracted titles.
 
-    # UUID regex pattern
-    uuid_pattern = re.compile(
-        r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.jsonl$"
-    )
+    File metadata comes from the persistent session index, so only new or
+    changed session files are opened.
+    """
+    return list_history_sessions(get_project_history_dir(project_dir))
 
-    # List all .jsonl files in the history directory
-    if not history_dir.exists():
-        return []
 
-    for file_path in history_dir.glob("*.jsonl"):
-        # Filter by UUID pattern
-        if not uuid_pattern.match(file_path.name):
-            continue
+def list_history_sessions(history_dir: Path) -> list[SessionInfo]:
+    """List sessions in a history directory, most recent first."""
+    sessions = [
+        SessionInfo(
+            session_id=indexed.path.name.removesuffix(".jsonl"),
+            title=indexed.title,
+            timestamp=indexed.timestamp,
+        )
+        for indexed in scan_history_dir(history_dir)
+        if indexed.status == STATUS_OK and _UUID_PATTERN.match(indexed.path.name)
+    ]
 
-        # Extract session_id from filename
-        session_id = file_path.name.replace(".jsonl", "")
+    # Sort by timestamp descending (most recent first)
+    sessions.sort(key=lambda s: s.timestamp, reverse=True)
 
-        # Read first line and parse JSON
-        try:
-            with file_path.open() as f:
-                first_line = f.readline().strip()
-                if not first_line:
-                    continue
-                data = json.loads(first_line)
-        except (json.JSONDecodeError, OSError):
-            continue
+    return sessions
 
-        # Extract content and format title
-        message = data.get("message", {})
-        content = message.get("content", "")
-        title = extract_content_text(content)
-        title = format_title(title)
 
-        # Extract timestamp
-        timestamp = data.get("timestamp", "")
+def list_projects() -> list[ProjectInfo]:
+    """List every project with a history directory, sorted by project path.
 
-        sessions.append(
-            SessionInfo(session_id=session_id, title=title, timestamp=timestamp)
+    The project path is taken from the "cwd" field of the project's session
+    entries, since the directory name encoding is lossy; directories with no
+    cwd fall back to decode_project_path.
+    """
+    projects_dir = get_projects_dir()
+    if not projects_dir.is_dir():
+        return []
+    projects = [
+        ProjectInfo(
+            project_dir=_read_project_cwd(history_dir)
+            or decode_project_path(history_dir.name),
+            history_dir=history_dir,
         )
+        for history_dir in projects_dir.iterdir()
+        if history_dir.is_dir()
+    ]
+    return sorted(projects, key=lambda p: p.project_dir)
 
-    # Sort by timestamp descending (most recent first)
-    sessions.sort(key=lambda s: s.timestamp, reverse=True)
 
-    return sessions
+def _read_project_cwd(history_dir: Path) -> str | None:
+    """Return the first cwd recorded near the start of any session file."""
+    for indexed in scan_history_dir(history_dir):
+        if indexed.status != STATUS_OK:
+            continue
+        for line in islice(iter_lines(indexed.path), _CWD_SEARCH_LINES):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            cwd = entry.get("cwd") if isinstance(entry, dict) else None
+            if isinstance(cwd, str) and cwd:
+                return cwd
+    return None
 
 
 def find_sub_agent_ids(session_file: Path) -> list[str]:
@@ -82,24 +102,23 @@ def find_sub_agent_ids(session_file: Path) -> list[str]:
     agent_ids = []
     seen: set[str] = set()
 
-    with session_file.open() as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line:
-                continue
+    for raw_line in iter_lines(session_file):
+        line = raw_line.strip()
+        if not line:
+            continue
 
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
 
-            # Check if entry has toolUseResult as a dict (successful completion)
-            tool_result = entry.get("toolUseResult")
-            if isinstance(tool_result, dict) and "agentId" in tool_result:
-                agent_id = tool_result["agentId"]
-                if agent_id not in seen:
-                    agent_ids.append(agent_id)
-                    seen.add(agent_id)
+        # Check if entry has toolUseResult as a dict (successful completion)
+        tool_result = entry.get("toolUseResult")
+        if isinstance(tool_result, dict) and "agentId" in tool_result:
+            agent_id = tool_result["agentId"]
+            if agent_id not in seen:
+                agent_ids.append(agent_id)
+                seen.add(agent_id)
 
     return agent_ids
 
@@ -107,8 +126,9 @@ def find_sub_agent_ids(session_file: Path) -> list[str]:
 def find_related_agent_files(session_id: str, project_dir: str) -> list[Path]:
     """Find all agent files related to a session.
 
-    Scans the project history directory for all agent-*.jsonl files that
-    reference the given session ID. Returns agents regardless of completion status.
+    Looks up agent-*.jsonl files in the session index whose first entry
+    references the given session ID. Returns agents regardless of completion
+    status.
 
     Args:
         session_id: The session ID to search for
@@ -117,27 +137,44 @@ def find_related_agent_files(session_id: str, project_dir: str) -> list[Path]:
     Returns:
         List of Path objects to matching agent files
     """
-    history_dir = get_project_history_dir(project_dir)
-    matching_files = []
+    return AgentGraph(get_project_history_dir(project_dir)).children(session_id)
 
-    for agent_file in sorted(history_dir.glob("agent-*.jsonl")):
-        try:
-            first_line = agent_file.read_text().split("\n")[0].strip()
-            if not first_line:
-                continue
-            entry = json.loads(first_line)
-            if entry.get("sessionId") == session_id:
-                matching_files.append(agent_file)
-        except json.JSONDecodeError:
-            logger.warning("Malformed JSON in %s", agent_file)
-            continue
-        except OSError:
-            continue
 
-    return matching_files
+class AgentGraph:
+    """Parent-to-child map of agent files in one history directory.
 
+    Each agent-*.jsonl file is attached to the sessionId on its first line,
+    which is either a top-level session or the agent that spawned it. The
+    map is built from the session index on first use, so one graph can be
+    shared by every session extracted from the same directory.
+    """
+
+    def __init__(self, history_dir: Path) -> None:
+        """Initialize graph for history_dir without scanning it yet."""
+        self.history_dir = history_dir
+        self._children: dict[str, list[Path]] | None = None
+
+    def children(self, parent_id: str) -> list[Path]:
+        """Return agent files spawned by parent_id, sorted by path."""
+        return self.load().get(parent_id, [])
+
+    def load(self) -> dict[str, list[Path]]:
+        """Build the map now if needed, grouping agent files by parent ID."""
+        if self._children is not None:
+            return self._children
+        children: dict[str, list[Path]] = {}
+        for indexed in scan_history_dir(self.history_dir):
+            if not indexed.path.name.startswith("agent-"):
+                continue
+            if indexed.status == STATUS_MALFORMED:
+                logger.warning("Malformed JSON in %s", indexed.path)
+            elif indexed.session_id is not None:
+                children.setdefault(indexed.session_id, []).append(indexed.path)
+        self._children = children
+        return children
 
-def _process_agent_file(agent_file: Path) -> tuple[list[FeedbackItem], str | None]:
+
+def _process_agent_file(agent_file: Path) -> tuple[list[FeedbackRecord], str | None]:
     """Extract feedback and agent ID from an agent file.
 
     Args:
@@ -146,22 +183,5 @@ def _process_agent_file(agent_file: Path) -> tuple[list[FeedbackItem], str | Non
     Returns:
         Tuple of (feedback items, agent ID)
     """
-    feedback: list[FeedbackItem] = []
-    agent_id: str | None = None
-
-    for line in agent_file.read_text().strip().split("\n"):
-        if not line:
-            continue
-        try:
-            entry = json.loads(line)
-            # Track agent ID from first entry
-            if agent_id is None:
-                agent_id = entry.get("agentId")
-            # Extract feedback from agent file
-            result = extract_feedback_from_entry(entry)
-            if result:
-                feedback.append(result)
-        except json.JSONDecodeError:
-            continue
-
-    return feedback, agent_id
+    scan = scan_feedback(agent_file, find_agent_id=True)
+    return scan.items + scan.tail, scan.agent_id
@@ -51,6 +51,14 @@ class FileReadError(ClaudeUtilsError):
         super().__init__(f"Failed to read {path}: {reason}")
 
 
+class GitRevisionError(ClaudeUtilsError):
+    """Raised when files cannot be read at a git revision."""
+
+    def __init__(self, rev: str, reason: str) -> None:
+        """Initialize with the revision and failure reason."""
+        super().__init__(f"Cannot read files at {rev}: {reason}")
+
+
 class MarkdownProcessingError(ClaudeUtilsError):
     """Raised when markdown processing fails."""
 
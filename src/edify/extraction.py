@@ -1,49 +1,250 @@
 """Recursive feedback extraction from sessions and agents."""
 
-from .discovery import _process_agent_file, find_related_agent_files
-from .models import FeedbackItem
+import multiprocessing
+import os
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .checkpoints import Checkpoint, CheckpointSet, extract_file_incrementally
+from .discovery import AgentGraph, _process_agent_file
+from .models import FeedbackRecord
 from .parsing import _extract_feedback_from_file
 from .paths import get_project_history_dir
 
 
+def _extract_file(
+    path: Path, checkpoints: CheckpointSet | None, *, agent: bool
+) -> tuple[list[FeedbackRecord], str | None]:
+    """Extract one session or agent file, resuming from its checkpoint."""
+    if checkpoints is not None:
+        return extract_file_incrementally(path, checkpoints, find_agent_id=agent)
+    if agent:
+        return _process_agent_file(path)
+    return _extract_feedback_from_file(path), None
+
+
 def extract_feedback_recursively(
-    session_id: str, project_dir: str
-) -> list[FeedbackItem]:
+    session_id: str,
+    project_dir: str,
+    agent_graph: AgentGraph | None = None,
+    checkpoints: CheckpointSet | None = None,
+) -> list[FeedbackRecord]:
     """Extract feedback from a session and all sub-agent sessions.
 
-    Recursively extracts feedback from the given session and all agents
-    spawned from that session, building a complete tree of feedback.
+    Walks the agent graph from the given session, extracting feedback from
+    every agent spawned directly or transitively, building a complete tree
+    of feedback.
 
     Args:
         session_id: The session ID to extract from
         project_dir: The project directory path
+        agent_graph: Shared agent graph for the project's history directory;
+            built on demand when omitted
+        checkpoints: Checkpoints for the history directory; when given,
+            files are parsed only past their checkpoint and new
+            checkpoints are added to checkpoints.updated
 
     Returns:
-        List of FeedbackItem objects sorted by timestamp
+        List of FeedbackRecord objects sorted by timestamp
 
     Raises:
         FileNotFoundError: If the history directory does not exist
     """
-    history_dir = get_project_history_dir(project_dir)
+    return extract_history_feedback(
+        session_id, get_project_history_dir(project_dir), agent_graph, checkpoints
+    )
+
+
+def extract_history_feedback(
+    session_id: str,
+    history_dir: Path,
+    agent_graph: AgentGraph | None = None,
+    checkpoints: CheckpointSet | None = None,
+) -> list[FeedbackRecord]:
+    """Extract feedback for a session given its history directory.
+
+    See extract_feedback_recursively, which resolves history_dir from a
+    project path.
+    """
     if not history_dir.exists():
         msg = f"History directory not found: {history_dir}"
         raise FileNotFoundError(msg)
+    if agent_graph is None:
+        agent_graph = AgentGraph(history_dir)
 
-    feedback: list[FeedbackItem] = []
+    feedback: list[FeedbackRecord] = []
+    visited: set[str] = set()
 
-    # Extract from main session file
-    session_file = history_dir / f"{session_id}.jsonl"
-    if session_file.exists():
-        feedback.extend(_extract_feedback_from_file(session_file))
+    def walk(parent_id: str) -> None:
+        if parent_id in visited:
+            return
+        visited.add(parent_id)
 
-    # Find and recursively process related agent files
-    agent_files = find_related_agent_files(session_id, project_dir)
-    for agent_file in agent_files:
-        agent_feedback, agent_id = _process_agent_file(agent_file)
-        feedback.extend(agent_feedback)
+        # Extract from the session file, if this ID has one
+        session_file = history_dir / f"{parent_id}.jsonl"
+        if session_file.exists():
+            feedback.extend(_extract_file(session_file, checkpoints, agent=False)[0])
 
-        # Recursively process agents spawned by this agent
-        if agent_id:
-            feedback.extend(extract_feedback_recursively(agent_id, project_dir))
+        # Process agents spawned by this session or agent, depth first
+        for agent_file in agent_graph.children(parent_id):
+            agent_feedback, agent_id = _extract_file(
+                agent_file, checkpoints, agent=True
+            )
+            feedback.extend(agent_feedback)
+            if agent_id:
+                walk(agent_id)
 
+    walk(session_id)
     return sorted(feedback, key=lambda x: x.timestamp)
+
+
+# (history_dir, session_id, feedback, error) for one extracted session
+type SessionResult = tuple[Path, str, list[FeedbackRecord], str | None]
+
+
+def extract_history_sessions(
+    sessions: list[tuple[Path, str]],
+    checkpoints: Mapping[Path, CheckpointSet] | None = None,
+) -> Iterator[SessionResult]:
+    """Extract (history_dir, session_id) pairs in-process, in order.
+
+    Sessions from the same history directory share one agent graph.
+    Failures are yielded as error messages rather than raised.
+    """
+    agent_graphs: dict[Path, AgentGraph] = {}
+    for history_dir, session_id in sessions:
+        agent_graph = agent_graphs.setdefault(history_dir, AgentGraph(history_dir))
+        try:
+            feedback = extract_history_feedback(
+                session_id,
+                history_dir,
+                agent_graph,
+                checkpoints.get(history_dir) if checkpoints else None,
+            )
+        except (ValueError, OSError, RuntimeError) as e:
+            yield history_dir, session_id, [], str(e)
+        else:
+            yield history_dir, session_id, feedback, None
+
+
+@dataclass
+class _WorkerState:
+    """Per-process state for pool workers, set once by the pool initializer."""
+
+    agent_graphs: dict[Path, AgentGraph] = field(default_factory=dict)
+    checkpoints: dict[Path, CheckpointSet] = field(default_factory=dict)
+
+
+_worker_state = _WorkerState()
+
+
+def _init_worker(
+    agent_graphs: dict[Path, AgentGraph], checkpoints: dict[Path, CheckpointSet]
+) -> None:
+    """Install the shared agent graphs and loaded checkpoints in a worker."""
+    _worker_state.agent_graphs = agent_graphs
+    _worker_state.checkpoints = checkpoints
+
+
+def _extract_session_worker(
+    task: tuple[str, str],
+) -> tuple[str, list[FeedbackRecord], str | None, dict[str, Checkpoint]]:
+    """Extract one (session_id, history_dir) task in a worker process.
+
+    Captures failures as error messages. Also returns the checkpoints
+    updated by this session, which the parent merges and saves.
+    """
+    session_id, history_dir_str = task
+    history_dir = Path(history_dir_str)
+    loaded = _worker_state.checkpoints.get(history_dir)
+    checkpoints = CheckpointSet(saved=loaded.saved) if loaded is not None else None
+    try:
+        feedback = extract_history_feedback(
+            session_id,
+            history_dir,
+            _worker_state.agent_graphs.get(history_dir),
+            checkpoints,
+        )
+    except (ValueError, OSError, RuntimeError) as e:
+        return session_id, [], str(e), {}
+    return session_id, feedback, None, checkpoints.updated if checkpoints else {}
+
+
+def extract_history_parallel(
+    sessions: list[tuple[Path, str]],
+    jobs: int | None = None,
+    checkpoints: Mapping[Path, CheckpointSet] | None = None,
+    agent_graphs: Mapping[Path, AgentGraph] | None = None,
+) -> Iterator[SessionResult]:
+    """Extract (history_dir, session_id) pairs across a bounded process pool.
+
+    Results are yielded in the order of sessions, so output is identical
+    to serial extraction regardless of completion order. Sessions may come
+    from any number of history directories. Workers are spawned rather than
+    forked to avoid inheriting open SQLite connections. One agent graph per
+    directory is built here and shipped to each worker, so workers never
+    scan history directories themselves. Checkpoints updated by workers are
+    merged into the matching checkpoints.updated.
+
+    Args:
+        sessions: (history directory, session ID) pairs to extract
+        jobs: Worker process count; None uses all available cores
+        checkpoints: Loaded checkpoints per history directory
+        agent_graphs: Prebuilt agent graphs per history directory
+
+    Returns:
+        Iterator of (history_dir, session_id, feedback, error or None)
+    """
+    workers = jobs or os.process_cpu_count() or 1
+    chunksize = max(1, len(sessions) // (workers * 4))
+    graphs = dict(agent_graphs or {})
+    for history_dir, _ in sessions:
+        graphs.setdefault(history_dir, AgentGraph(history_dir)).load()
+    tasks = [(session_id, str(history_dir)) for history_dir, session_id in sessions]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(graphs, dict(checkpoints or {})),
+    ) as pool:
+        results = pool.map(_extract_session_worker, tasks, chunksize=chunksize)
+        for (history_dir, _), result in zip(sessions, results, strict=True):
+            session_id, feedback, error, updated = result
+            if checkpoints and history_dir in checkpoints:
+                checkpoints[history_dir].updated.update(updated)
+            yield history_dir, session_id, feedback, error
+
+
+def extract_sessions_parallel(
+    session_ids: list[str],
+    project_dir: str,
+    jobs: int | None = None,
+    agent_graph: AgentGraph | None = None,
+    checkpoints: CheckpointSet | None = None,
+) -> Iterator[tuple[str, list[FeedbackRecord], str | None]]:
+    """Extract feedback for one project's sessions across a process pool.
+
+    Yields (session_id, feedback, error) in the order of session_ids; see
+    extract_history_parallel.
+
+    Args:
+        session_ids: Session IDs to extract
+        project_dir: The project directory path
+        jobs: Worker process count; None uses all available cores
+        agent_graph: Shared agent graph; built for the project when omitted
+        checkpoints: Loaded checkpoints for incremental extraction
+
+    Returns:
+        Iterator of (session_id, feedback items, error message or None)
+    """
+    history_dir = get_project_history_dir(project_dir)
+    results = extract_history_parallel(
+        [(history_dir, session_id) for session_id in session_ids],
+        jobs,
+        {history_dir: checkpoints} if checkpoints is not None else None,
+        {history_dir: agent_graph} if agent_graph is not None else None,
+    )
+    for _, session_id, feedback, error in results:
+        yield session_id, feedback, error
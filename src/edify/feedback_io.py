@@ -0,0 +1,98 @@
+"""Reading and writing feedback streams in JSON or NDJSON format."""
+
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TextIO
+
+from pydantic import TypeAdapter
+
+from edify.models import FeedbackItem, FeedbackRecord
+
+FEEDBACK_FORMATS = ("json", "ndjson")
+
+# Validate input straight into lightweight records; unknown keys are ignored
+_RECORD = TypeAdapter(FeedbackRecord)
+_RECORDS = TypeAdapter(list[FeedbackRecord])
+
+
+def _to_dict(item: FeedbackItem | FeedbackRecord) -> dict[str, object]:
+    """Return the JSON-ready dict for an item or record."""
+    if isinstance(item, FeedbackRecord):
+        return dict(item.to_dict())
+    return item.model_dump(mode="json")
+
+
+def write_feedback(
+    items: Iterable[FeedbackItem | FeedbackRecord],
+    output: str | None,
+    output_format: str,
+) -> None:
+    """Write feedback items to a file or stdout.
+
+    "json" writes a single array once all items are available. "ndjson"
+    writes one object per line as items arrive, so memory stays flat no
+    matter how many items are produced.
+
+    Args:
+        items: Feedback items or records, possibly produced lazily
+        output: Output file path, or None for stdout
+        output_format: "json" or "ndjson"
+    """
+    if output_format == "json":
+        json_output = json.dumps([_to_dict(item) for item in items])
+        (Path(output).write_text if output else print)(json_output)
+        return
+
+    if output is None:
+        _write_ndjson(items, sys.stdout)
+        return
+    with Path(output).open("w") as f:
+        _write_ndjson(items, f)
+
+
+def _write_ndjson(
+    items: Iterable[FeedbackItem | FeedbackRecord], stream: TextIO
+) -> None:
+    """Write one JSON object per line, flushing as each item is written."""
+    for item in items:
+        line = (
+            _RECORD.dump_json(item).decode()
+            if isinstance(item, FeedbackRecord)
+            else item.model_dump_json()
+        )
+        stream.write(line + "\n")
+        stream.flush()
+
+
+def read_feedback(input_path: str) -> Iterator[FeedbackRecord]:
+    """Lazily read feedback records from a JSON array or NDJSON stream.
+
+    The format is detected from the first non-blank line: a line starting
+    with "[" is a JSON array (read and validated whole), anything else is
+    NDJSON (read line by line).
+
+    Args:
+        input_path: Input file path, or "-" for stdin
+
+    Returns:
+        Iterator of validated FeedbackRecord objects
+    """
+    if input_path == "-":
+        yield from _read_stream(sys.stdin)
+        return
+    with Path(input_path).open() as f:
+        yield from _read_stream(f)
+
+
+def _read_stream(stream: TextIO) -> Iterator[FeedbackRecord]:
+    """Yield feedback records from an open text stream."""
+    for line in stream:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("["):
+            yield from _RECORDS.validate_json(line + stream.read())
+            return
+        yield _RECORD.validate_json(stripped)
@@ -1,50 +1,96 @@
 """Filtering and categorization functions for feedback analysis."""
 
-from edify.models import FeedbackItem
+from collections.abc import Iterable
+
+from edify.models import FeedbackItem, FeedbackRecord
+
+# Case-sensitive markers of command output and system messages
+_NOISE_MARKERS = (
+    "<command-name>",
+    "<bash-stdout>",
+    "<bash-input>",
+    "Caveat:",
+    "Warmup",
+    "<tool_use_error>",
+)
+
+# Lowercase keywords per category, in precedence order
+_CATEGORY_KEYWORDS = (
+    ("code_review", ("review", "refactor", "improve", "clarity")),
+    ("process", ("plan", "next step", "workflow", "before", "after")),
+    ("corrections", ("no", "wrong", "incorrect", "fix", "error")),
+    ("instructions", ("don't", "never", "always", "must", "should")),
+)
+
+# Lowercase prefixes of questions and tool banners, never rule-worthy
+_RULE_EXCLUDED_PREFIXES = ("how ", "claude code:")
+
+
+def _category(content_lower: str) -> str:
+    """Return the first category with a keyword in content_lower."""
+    for category, keywords in _CATEGORY_KEYWORDS:
+        for keyword in keywords:
+            if keyword in content_lower:
+                return category
+    return "instructions"
 
 
 def is_noise(content: str) -> bool:
     """Detect if content is noise (command output, system messages, etc)."""
-    if "<command-name>" in content:
-        return True
-    if "<bash-stdout>" in content or "<bash-input>" in content:
-        return True
-    if "Caveat:" in content or "Warmup" in content or "<tool_use_error>" in content:
-        return True
+    for marker in _NOISE_MARKERS:
+        if marker in content:
+            return True
     return len(content) < 10
 
 
-def filter_feedback(items: list[FeedbackItem]) -> list[FeedbackItem]:
+def classify_content(content: str) -> str | None:
+    """Return the category of content, or None if it is noise.
+
+    Combines is_noise and categorize_feedback so analyze scans each item
+    once and lowercases it at most once.
+    """
+    if is_noise(content):
+        return None
+    return _category(content.lower())
+
+
+def filter_feedback[T: (FeedbackItem, FeedbackRecord)](items: Iterable[T]) -> list[T]:
     """Filter out noise items from a list of feedback."""
     return [item for item in items if not is_noise(item.content)]
 
 
-def categorize_feedback(item: FeedbackItem) -> str:
-    """Categorize feedback into specific categories based on content.
+def filter_rule_items[T: (FeedbackItem, FeedbackRecord)](
+    items: Iterable[T], min_length: int
+) -> list[T]:
+    """Filter and deduplicate feedback items for rules extraction.
 
-    Analyzes the content to determine if feedback is instructions, corrections,
-    process-related, or code review.
+    Each item's content is lowercased once, for both the excluded-prefix
+    check and the deduplication prefix.
     """
-    content_lower = item.content.lower()
-
-    # Check for code_review keywords
-    code_review_keywords = ["review", "refactor", "improve", "clarity"]
-    if any(keyword in content_lower for keyword in code_review_keywords):
-        return "code_review"
+    rule_items: list[tuple[T, str]] = []
+    for item in items:
+        content = item.content
+        if not min_length <= len(content) <= 1000 or is_noise(content):
+            continue
+        content_lower = content.lower()
+        if not content_lower.startswith(_RULE_EXCLUDED_PREFIXES):
+            rule_items.append((item, content_lower[:100]))
 
-    # Check for process keywords
-    process_keywords = ["plan", "next step", "workflow", "before", "after"]
-    if any(keyword in content_lower for keyword in process_keywords):
-        return "process"
+    # Sort and deduplicate
+    rule_items.sort(key=lambda pair: pair[0].timestamp)
+    seen_prefixes: set[str] = set()
+    deduped_items = []
+    for item, prefix in rule_items:
+        if prefix not in seen_prefixes:
+            seen_prefixes.add(prefix)
+            deduped_items.append(item)
+    return deduped_items
 
-    # Check for correction keywords
-    correction_keywords = ["no", "wrong", "incorrect", "fix", "error"]
-    if any(keyword in content_lower for keyword in correction_keywords):
-        return "corrections"
 
-    # Check for instruction keywords
-    instruction_keywords = ["don't", "never", "always", "must", "should"]
-    if any(keyword in content_lower for keyword in instruction_keywords):
-        return "instructions"
+def categorize_feedback(item: FeedbackItem | FeedbackRecord) -> str:
+    """Categorize feedback into specific categories based on content.
 
-    return "instructions"
+    Analyzes the content to determine if feedback is instructions, corrections,
+    process-related, or code review.
+    """
+    return _category(item.content.lower())
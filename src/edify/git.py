@@ -1,6 +1,7 @@
 """Shared git helpers for edify subcommands."""
 
 import subprocess
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Never
 
@@ -46,6 +47,38 @@ def _fail(msg: str, code: int = 1) -> Never:
     raise SystemExit(code)
 
 
+def read_blobs(rev: str, paths: Sequence[str], cwd: Path) -> list[bytes | None]:
+    """Return the contents of repo-relative paths at rev, in one git process.
+
+    Paths are fed to ``git cat-file --batch`` as ``<rev>:<path>`` lines.
+    Each reply is a ``<sha> <type> <size>`` header followed by the content
+    and a newline, or ``<name> missing`` for paths absent at rev. Missing
+    paths and non-blobs such as directories yield None.
+    """
+    request = "".join(f"{rev}:{path}\n" for path in paths)
+    output = subprocess.run(
+        ["git", "cat-file", "--batch"],
+        cwd=cwd,
+        input=request.encode(),
+        capture_output=True,
+        check=True,
+    ).stdout
+    blobs: list[bytes | None] = []
+    pos = 0
+    for _ in paths:
+        end = output.index(b"\n", pos)
+        header = output[pos:end]
+        pos = end + 1
+        if header.endswith((b" missing", b" ambiguous")):
+            blobs.append(None)
+            continue
+        _sha, kind, size = header.rsplit(b" ", 2)
+        content = output[pos : pos + int(size)]
+        pos += int(size) + 1
+        blobs.append(content if kind == b"blob" else None)
+    return blobs
+
+
 def discover_submodules(cwd: Path | None = None) -> list[str]:
     """Return list of submodule paths from `git submodule status`.
 
@@ -0,0 +1,114 @@
+"""Memory-mapped binary reader for session JSONL files.
+
+Lines are sliced straight out of an mmap of the file, so a transcript is
+never decoded into one Python str and only the line being parsed is
+copied. Lines are returned as bytes without their trailing newline;
+json.loads accepts them directly.
+"""
+
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[mmap.mmap | None]:
+    """Map path read-only, yielding None for empty files (which mmap rejects)."""
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def iter_lines(path: Path) -> Iterator[bytes]:
+    """Yield each line of path from the start, including blank lines.
+
+    Blank lines are kept so enumerate() gives true line numbers. A final
+    line without a trailing newline is still yielded.
+
+    Args:
+        path: Path to JSONL file
+
+    Returns:
+        Iterator of raw lines without the newline
+    """
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        size = len(mm)
+        pos = 0
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                end = size
+            yield mm[pos:end]
+            pos = end + 1
+
+
+def iter_lines_with_ends(
+    path: Path, start: int = 0
+) -> Iterator[tuple[bytes, int | None]]:
+    """Yield (line, end) for each line of path from byte offset start.
+
+    end is the offset just past the line's newline, where the next line
+    begins. It is None for a final line with no newline, which may still
+    be in the middle of being written.
+
+    Args:
+        path: Path to JSONL file
+        start: Byte offset of the first line to read
+
+    Returns:
+        Iterator of (raw line without the newline, end offset or None)
+    """
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        size = len(mm)
+        pos = start
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                yield mm[pos:size], None
+                return
+            yield mm[pos:end], end + 1
+            pos = end + 1
+
+
+def iter_lines_reverse(path: Path, window: int | None = None) -> Iterator[bytes]:
+    """Yield lines of path from the last line backwards.
+
+    Args:
+        path: Path to JSONL file
+        window: Only read the last window bytes; the first line yielded from
+            inside the window may then be a fragment of a longer line
+
+    Returns:
+        Iterator of raw lines without the newline, last line first
+    """
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        start = 0 if window is None else max(0, len(mm) - window)
+        end = len(mm)
+        if mm[end - 1 : end] == b"\n":
+            end -= 1
+        while end >= start:
+            newline = mm.rfind(b"\n", start, end)
+            yield mm[newline + 1 if newline != -1 else start : end]
+            if newline == -1:
+                return
+            end = newline
+
+
+def first_line(path: Path) -> bytes:
+    """Return the first line of path without the newline (b"" if empty)."""
+    with _mapped(path) as mm:
+        if mm is None:
+            return b""
+        end = mm.find(b"\n")
+        return mm[: end if end != -1 else len(mm)]
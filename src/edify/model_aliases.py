@@ -0,0 +1,220 @@
+"""Resolution of model aliases such as "sonnet" to full model IDs.
+
+Resolved aliases are memoized per cache directory, in memory and in
+models_cache.json next to the model list they were resolved from, so
+repeated lookups are a dictionary access. The memo expires after
+ALIAS_TTL_HOURS, before the model list it was resolved from does after
+CACHE_TTL_HOURS. An expired memo still answers lookups while a
+background thread refetches the list and re-resolves it; only a missing
+or expired list, or an alias that matches nothing, makes a lookup wait
+for the models API.
+"""
+
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import NewType
+
+from anthropic import Anthropic, APIError
+from pydantic import BaseModel
+
+from edify.exceptions import ModelResolutionError
+
+logger = logging.getLogger(__name__)
+
+ModelId = NewType("ModelId", str)
+CACHE_TTL_HOURS = 24  # Model list age after which lookups wait for a fetch
+ALIAS_TTL_HOURS = 18  # Memo age after which lookups refresh in the background
+_NO_MATCH = ""  # Memoized for aliases matching no model, passed through
+
+
+class ModelInfo(BaseModel):
+    """Model information stored in cache."""
+
+    id: str
+    created_at: datetime
+
+
+class CacheData(BaseModel):
+    """Cache file structure."""
+
+    fetched_at: datetime
+    models: list[ModelInfo]
+    aliases: dict[str, str] = {}  # Lowercased alias to model ID
+
+
+def _latest_match(alias: str, models: list[ModelInfo]) -> str:
+    """ID of the newest model whose ID contains alias, or _NO_MATCH."""
+    matching = [m for m in models if alias in m.id.lower()]
+    if not matching:
+        return _NO_MATCH
+    return max(matching, key=lambda m: m.created_at).id
+
+
+def _fetch_models(client: Anthropic) -> list[ModelInfo]:
+    """List models from the API."""
+    return [ModelInfo(id=m.id, created_at=m.created_at) for m in client.models.list()]
+
+
+@dataclass
+class _AliasTable:
+    """Memoized aliases and model list for one cache directory."""
+
+    cache_file: Path
+    data: CacheData | None = None
+    loaded: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    refresh: threading.Thread | None = None
+
+    def load(self) -> None:
+        """Read the cache file, once per process."""
+        self.loaded = True
+        if not self.cache_file.exists():
+            return
+        try:
+            self.data = CacheData.model_validate_json(self.cache_file.read_text())
+        except ValueError as e:
+            logger.warning(
+                "Corrupted cache file at %s, will refresh from API: %s",
+                self.cache_file,
+                e,
+            )
+
+    def age_hours(self) -> float:
+        """Hours since the model list was fetched; infinite without one."""
+        if self.data is None:
+            return float("inf")
+        age = datetime.now(tz=UTC) - self.data.fetched_at
+        return age.total_seconds() / 3600
+
+    def save(self) -> None:
+        """Write the table to the cache file; failures are only logged."""
+        if self.data is None:
+            return
+        tmp_path: Path | None = None
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file per writer, so concurrent processes never rename
+            # each other's partial writes into place
+            with tempfile.NamedTemporaryFile(
+                "w",
+                dir=self.cache_file.parent,
+                prefix=f"{self.cache_file.stem}.",
+                suffix=".tmp",
+                delete=False,
+            ) as tmp:
+                tmp_path = Path(tmp.name)
+                tmp.write(self.data.model_dump_json())
+            tmp_path.replace(self.cache_file)
+            logger.debug("Cached models list to %s", self.cache_file)
+        except OSError as e:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            logger.warning("Failed to write cache at %s: %s", self.cache_file, e)
+
+    def replace_models(self, models: list[ModelInfo]) -> CacheData:
+        """Install a fetched model list, re-resolving memoized aliases."""
+        known = self.data.aliases if self.data is not None else {}
+        self.data = CacheData(
+            fetched_at=datetime.now(tz=UTC),
+            models=models,
+            aliases={alias: _latest_match(alias, models) for alias in known},
+        )
+        return self.data
+
+    def refresh_in_background(self, client: Anthropic) -> None:
+        """Start refetching the model list unless a refresh is running."""
+        if self.refresh is not None and self.refresh.is_alive():
+            return
+        self.refresh = threading.Thread(
+            target=self._refresh,
+            args=(client,),
+            name="model-alias-refresh",
+            daemon=True,
+        )
+        self.refresh.start()
+
+    def _refresh(self, client: Anthropic) -> None:
+        try:
+            models = _fetch_models(client)
+        except APIError as e:
+            logger.warning("Background model list refresh failed: %s", e)
+            return
+        with self.lock:
+            self.replace_models(models)
+            self.save()
+
+
+_tables: dict[Path, _AliasTable] = {}
+_tables_lock = threading.Lock()
+
+
+def _table_for(cache_dir: Path) -> _AliasTable:
+    with _tables_lock:
+        return _tables.setdefault(
+            cache_dir, _AliasTable(cache_dir / "models_cache.json")
+        )
+
+
+def _lookup_memo(table: _AliasTable, alias: str, client: Anthropic) -> str | None:
+    """Resolve alias from a fresh memo, or None if the API must be asked."""
+    age = table.age_hours()
+    if table.data is None or age >= CACHE_TTL_HOURS:
+        return None
+    aliases = table.data.aliases
+    if alias not in aliases:
+        match = _latest_match(alias, table.data.models)
+        if match == _NO_MATCH:
+            return None  # Possibly a model released since the last fetch
+        aliases[alias] = match
+        table.save()
+    if age >= ALIAS_TTL_HOURS:
+        table.refresh_in_background(client)
+    return aliases[alias]
+
+
+def resolve_model_alias(model: str, client: Anthropic, cache_dir: Path) -> ModelId:
+    """Resolve model alias to full model ID.
+
+    If model starts with "claude-", check if it's a full ID (with date
+    suffix) and return. Otherwise, resolve via the memo or the API. Model
+    alias matching is case-insensitive; unknown aliases are returned
+    unchanged.
+
+    Args:
+        model: Model alias or ID to resolve (case-insensitive)
+        client: Anthropic API client
+        cache_dir: Directory for caching model lists
+
+    Returns:
+        Resolved full model ID
+
+    Raises:
+        ModelResolutionError: If API is unreachable and model alias cannot be resolved
+    """
+    # Check if it's a full model ID with date suffix (last part is 8 digits)
+    if model.startswith("claude-"):
+        parts = model.split("-")
+        if parts[-1].isdigit() and len(parts[-1]) == 8:
+            # Full model ID with date suffix, return as-is
+            return ModelId(model)
+
+    alias = model.lower()
+    table = _table_for(cache_dir)
+    with table.lock:
+        if not table.loaded:
+            table.load()
+        resolved = _lookup_memo(table, alias, client)
+        if resolved is None:
+            # Missing, expired or no match - query API
+            try:
+                models = _fetch_models(client)
+            except APIError as e:
+                raise ModelResolutionError(model) from e
+            data = table.replace_models(models)
+            resolved = data.aliases[alias] = _latest_match(alias, models)
+            table.save()
+    return ModelId(resolved or model)
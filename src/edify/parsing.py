@@ -1,10 +1,41 @@
 """Message parsing and feedback extraction utilities."""
 
 import json
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from .models import FeedbackItem, FeedbackType
+from .jsonl import iter_lines_with_ends
+from .models import FeedbackItem, FeedbackRecord, FeedbackType
+
+# A "type": "user" entry must contain the literal value "user" somewhere on
+# its line, unless the JSON writer escaped it as \uXXXX.
+_USER_VALUE = b'"user"'
+_UNICODE_ESCAPE = b"\\u"
+
+# Version of the feedback extraction rules. Bump it whenever is_trivial,
+# _TRIVIAL_KEYWORDS or extract_record_from_entry change what is extracted,
+# so checkpointed feedback extracted under the old rules is discarded.
+FEEDBACK_RULES_VERSION = 1
+
+# Short affirmations that carry no feedback
+_TRIVIAL_KEYWORDS = frozenset(
+    {
+        "y",
+        "n",
+        "k",
+        "g",
+        "ok",
+        "go",
+        "yes",
+        "no",
+        "continue",
+        "proceed",
+        "sure",
+        "okay",
+        "resume",
+    }
+)
 
 
 def extract_content_text(content: str | list[dict[str, Any]]) -> str:
@@ -61,34 +92,64 @@ def is_trivial(text: str) -> bool:
     if stripped.startswith("/"):
         return True
 
-    # Trivial keywords
-    trivial_keywords = {
-        "y",
-        "n",
-        "k",
-        "g",
-        "ok",
-        "go",
-        "yes",
-        "no",
-        "continue",
-        "proceed",
-        "sure",
-        "okay",
-        "resume",
-    }
+    return stripped.lower() in _TRIVIAL_KEYWORDS
 
-    return stripped.lower() in trivial_keywords
 
+def may_be_user_entry(line: bytes) -> bool:
+    r"""Cheaply check whether a raw JSONL line could be a user entry.
 
-def extract_feedback_from_entry(entry: dict[str, Any]) -> FeedbackItem | None:
+    Returns False only when the line cannot decode to an entry with
+    type "user": it contains neither the literal "user" string nor any
+    \u escape. Anything ambiguous returns True and is parsed in full, so
+    skipping lines never changes the extracted feedback.
+
+    Args:
+        line: Raw bytes of one JSONL line
+
+    Returns:
+        False if the line can be skipped without decoding
+    """
+    return _USER_VALUE in line or _UNICODE_ESCAPE in line
+
+
+def _record(
+    entry: dict[str, Any],
+    feedback_type: FeedbackType,
+    content: object,
+    tool_use_id: object = None,
+) -> FeedbackRecord:
+    """Build a FeedbackRecord, validating only when a field looks wrong.
+
+    Fields from well-formed entries are already strings, so they skip
+    pydantic entirely. Anything else goes through FeedbackItem, which
+    raises the same ValidationError as before.
+    """
+    fields = {
+        "timestamp": entry.get("timestamp", ""),
+        "session_id": entry.get("sessionId", ""),
+        "feedback_type": feedback_type,
+        "content": content,
+        "agent_id": entry.get("agentId"),
+        "slug": entry.get("slug"),
+        "tool_use_id": tool_use_id,
+    }
+    required = (fields["timestamp"], fields["session_id"], content)
+    optional = (fields["agent_id"], fields["slug"], tool_use_id)
+    if not all(isinstance(value, str) for value in required) or not all(
+        value is None or isinstance(value, str) for value in optional
+    ):
+        fields = FeedbackItem.model_validate(fields).model_dump()
+    return FeedbackRecord.from_dict(fields)
+
+
+def extract_record_from_entry(entry: dict[str, Any]) -> FeedbackRecord | None:
     """Extract non-trivial user feedback from a conversation entry.
 
     Args:
         entry: A conversation entry dict from a session JSONL file
 
     Returns:
-        FeedbackItem if feedback is found, None otherwise
+        FeedbackRecord if feedback is found, None otherwise
     """
     # Only process user messages
     if entry.get("type") != "user":
@@ -104,63 +165,100 @@ def extract_feedback_from_entry(entry: dict[str, Any]) -> FeedbackItem | None:
         if isinstance(item, dict) and item.get("is_error") is True:
             error_content = item.get("content", "")
             tool_use_id = item.get("tool_use_id")
-            return FeedbackItem(
-                timestamp=entry.get("timestamp", ""),
-                session_id=entry.get("sessionId", ""),
-                feedback_type=FeedbackType.TOOL_DENIAL,
-                content=error_content,
-                agent_id=entry.get("agentId"),
-                slug=entry.get("slug"),
-                tool_use_id=tool_use_id,
-            )
+            return _record(entry, FeedbackType.TOOL_DENIAL, error_content, tool_use_id)
 
     # Extract text for regular messages
     text = extract_content_text(content)
 
     # Check for request interruption
     if "[Request interrupted" in text:
-        return FeedbackItem(
-            timestamp=entry.get("timestamp", ""),
-            session_id=entry.get("sessionId", ""),
-            feedback_type=FeedbackType.INTERRUPTION,
-            content=text,
-            agent_id=entry.get("agentId"),
-            slug=entry.get("slug"),
-        )
+        return _record(entry, FeedbackType.INTERRUPTION, text)
 
     # Filter trivial messages
     if is_trivial(text):
         return None
 
-    # Create FeedbackItem for substantive messages
-    return FeedbackItem(
-        timestamp=entry.get("timestamp", ""),
-        session_id=entry.get("sessionId", ""),
-        feedback_type=FeedbackType.MESSAGE,
-        content=text,
-        agent_id=entry.get("agentId"),
-        slug=entry.get("slug"),
-    )
+    # Create FeedbackRecord for substantive messages
+    return _record(entry, FeedbackType.MESSAGE, text)
 
 
-def _extract_feedback_from_file(file_path: Path) -> list[FeedbackItem]:
-    """Extract feedback items from a single JSONL file.
+def extract_feedback_from_entry(entry: dict[str, Any]) -> FeedbackItem | None:
+    """Extract non-trivial user feedback from a conversation entry.
+
+    Validated counterpart of extract_record_from_entry.
+
+    Args:
+        entry: A conversation entry dict from a session JSONL file
+
+    Returns:
+        FeedbackItem if feedback is found, None otherwise
+    """
+    record = extract_record_from_entry(entry)
+    return record.to_item() if record is not None else None
+
+
+@dataclass
+class FeedbackScan:
+    """Feedback read from a JSONL file, split at the last complete line."""
+
+    items: list[FeedbackRecord]  # from newline-terminated lines
+    tail: list[FeedbackRecord]  # from a final line with no newline yet
+    agent_id: str | None
+    offset: int  # byte offset just past the last complete line
+
+
+def scan_feedback(
+    file_path: Path,
+    start: int = 0,
+    agent_id: str | None = None,
+    *,
+    find_agent_id: bool = False,
+) -> FeedbackScan:
+    """Extract feedback from a JSONL file starting at a byte offset.
+
+    Lines that cannot be user entries are skipped before decoding. With
+    find_agent_id, every line is decoded until one carries an agentId.
 
     Args:
         file_path: Path to JSONL file
+        start: Byte offset of a line start to resume from
+        agent_id: Agent ID already known from earlier lines
+        find_agent_id: Whether to look for the agentId field
 
     Returns:
-        List of FeedbackItem objects extracted from file
+        FeedbackScan with the items found and the offset reached
     """
-    feedback: list[FeedbackItem] = []
-    for line in file_path.read_text().strip().split("\n"):
-        if not line:
+    scan = FeedbackScan(items=[], tail=[], agent_id=agent_id, offset=start)
+    for line, end in iter_lines_with_ends(file_path, start):
+        if end is not None:
+            scan.offset = end
+        if not line.strip():
+            continue
+        # Decode every line until the agent ID is known; after that
+        # only lines that may be user entries matter
+        searching = find_agent_id and scan.agent_id is None
+        if not searching and not may_be_user_entry(line):
             continue
         try:
             entry = json.loads(line)
-            result = extract_feedback_from_entry(entry)
-            if result:
-                feedback.append(result)
         except json.JSONDecodeError:
             continue
-    return feedback
+        if searching:
+            scan.agent_id = entry.get("agentId")
+        result = extract_record_from_entry(entry)
+        if result:
+            (scan.items if end is not None else scan.tail).append(result)
+    return scan
+
+
+def _extract_feedback_from_file(file_path: Path) -> list[FeedbackRecord]:
+    """Extract feedback records from a single JSONL file.
+
+    Args:
+        file_path: Path to JSONL file
+
+    Returns:
+        List of FeedbackRecord objects extracted from file
+    """
+    scan = scan_feedback(file_path)
+    return scan.items + scan.tail
@@ -0,0 +1,146 @@
+"""Expansion of directory and glob command-line arguments into files."""
+
+import glob
+import os
+import re
+from collections.abc import Iterable, Sequence
+from fnmatch import fnmatch
+from pathlib import Path
+
+from edify.exceptions import FileReadError
+
+DEFAULT_INCLUDE = ("*.md",)
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _matches(relative: Path, patterns: Iterable[str]) -> bool:
+    """Whether a pattern matches the file name or the relative path."""
+    return any(
+        fnmatch(relative.name, pattern) or fnmatch(relative.as_posix(), pattern)
+        for pattern in patterns
+    )
+
+
+def _glob_base(pattern: str) -> Path:
+    """Return the leading components of pattern before any glob character."""
+    parts = []
+    for part in Path(pattern).parts:
+        if not _GLOB_CHARS.isdisjoint(part):
+            break
+        parts.append(part)
+    return Path(*parts)
+
+
+def _excluded(relative: Path, exclude: Sequence[str]) -> bool:
+    """Whether exclude matches relative or one of its directories.
+
+    Mirrors _walk, which prunes excluded directories before their files.
+    """
+    return any(
+        _matches(path, exclude)
+        for path in (relative, *relative.parents)
+        if path != Path()
+    )
+
+
+def _walk(root: Path, include: Sequence[str], exclude: Sequence[str]) -> list[Path]:
+    """Files under root matching include, skipping hidden and excluded dirs."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        base = Path(dirpath)
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if not name.startswith(".")
+            and not _matches((base / name).relative_to(root), exclude)
+        )
+        for name in sorted(filenames):
+            relative = (base / name).relative_to(root)
+            if _matches(relative, include) and not _matches(relative, exclude):
+                found.append(base / name)
+    return found
+
+
+def expansion_root(arg: str) -> Path | None:
+    """Return the directory arg expands under, or None for a plain file.
+
+    That is the directory itself, or a glob's leading part without
+    wildcards. Arguments are classified as expand_paths classifies them.
+    """
+    path = Path(arg)
+    if path.is_dir():
+        return path
+    if _GLOB_CHARS.isdisjoint(arg) or path.exists():
+        return None
+    return _glob_base(arg)
+
+
+def select_listed(
+    arg: str,
+    listed: Iterable[Path],
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> list[Path]:
+    """Select the files expand_paths would yield for arg from a listing.
+
+    listed holds file paths relative to expansion_root(arg), such as the
+    files under it at a git revision, so files that no longer exist can be
+    matched as if they did.
+    """
+    root = expansion_root(arg)
+    if root is None:
+        return []
+    if Path(arg).is_dir():
+        include = include or DEFAULT_INCLUDE
+        selected = (
+            relative
+            for relative in listed
+            if not any(part.startswith(".") for part in relative.parts[:-1])
+            and _matches(relative, include)
+        )
+    else:
+        rest = Path(*Path(arg).parts[len(root.parts) :]).as_posix()
+        pattern = re.compile(glob.translate(rest, recursive=True))
+        selected = (r for r in listed if pattern.match(r.as_posix()))
+    return [root / r for r in sorted(selected) if not _excluded(r, exclude)]
+
+
+def expand_paths(
+    args: Iterable[str],
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> list[Path]:
+    """Expand directories and glob patterns into files, in argument order.
+
+    Directories are walked recursively, skipping hidden directories, for
+    files matching an include pattern (default *.md). Glob patterns expand
+    with ** matching any depth. Exclude patterns filter both the same way,
+    matched against file and directory names and against paths relative
+    to the directory, or to the glob's leading part without wildcards.
+    Other arguments are kept as given, so that reading a missing file
+    reports it. Repeated files are kept once.
+
+    Raises:
+        FileReadError: If a glob pattern matches no files
+    """
+    include = include or DEFAULT_INCLUDE
+    paths: dict[Path, None] = {}
+    for arg in args:
+        path = Path(arg)
+        if path.is_dir():
+            paths.update(dict.fromkeys(_walk(path, include, exclude)))
+        elif _GLOB_CHARS.isdisjoint(arg) or path.exists():
+            paths[path] = None
+        else:
+            # Path.glob cannot take absolute patterns
+            found = map(Path, sorted(glob.glob(arg, recursive=True)))  # noqa: PTH207
+            base = _glob_base(arg)
+            matches = [
+                m
+                for m in found
+                if m.is_file() and not _excluded(m.relative_to(base), exclude)
+            ]
+            if not matches:
+                raise FileReadError(arg, "no files match")
+            paths.update(dict.fromkeys(matches))
+    return list(paths)
@@ -14,6 +14,21 @@ def encode_project_path(project_dir: str) -> str:
     return project_dir.rstrip("/").replace("/", "-")
 
 
+def decode_project_path(encoded: str) -> str:
+    """Best-effort inverse of encode_project_path.
+
+    Lossy: a "-" that was part of a directory name decodes as "/".
+    """
+    if encoded == "-":
+        return "/"
+    return encoded.replace("-", "/")
+
+
+def get_projects_dir() -> Path:
+    """Return Path to ~/.claude/projects/, holding one directory per project."""
+    return Path.home() / ".claude" / "projects"
+
+
 def get_project_history_dir(project_dir: str) -> Path:
     """Return Path to ~/.claude/projects/[ENCODED-PATH]/."""
-    return Path.home() / ".claude" / "projects" / encode_project_path(project_dir)
+    return get_projects_dir() / encode_project_path(project_dir)
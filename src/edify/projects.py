@@ -0,0 +1,84 @@
+"""Feedback collection across every project in ~/.claude/projects."""
+
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .checkpoints import CheckpointSet, load_checkpoints, save_checkpoints
+from .discovery import list_history_sessions
+from .extraction import extract_history_parallel, extract_history_sessions
+from .models import FeedbackRecord, ProjectFeedbackItem, ProjectInfo
+
+
+def tag_feedback(
+    items: Iterable[FeedbackRecord], project: ProjectInfo
+) -> list[ProjectFeedbackItem]:
+    """Validate feedback records into items tagged with their project path."""
+    return [
+        ProjectFeedbackItem.model_validate(
+            {**item.to_dict(), "project": project.project_dir}
+        )
+        for item in items
+    ]
+
+
+def find_session_in_projects(
+    prefix: str, projects: Iterable[ProjectInfo]
+) -> tuple[ProjectInfo, str]:
+    """Find the unique session ID matching prefix in any project.
+
+    Raises:
+        ValueError: If no session or more than one session matches
+    """
+    matches = [
+        (project, session.session_id)
+        for project in projects
+        for session in list_history_sessions(project.history_dir)
+        if session.session_id.startswith(prefix)
+    ]
+    if len(matches) == 0:
+        msg = f"No session found with prefix '{prefix}'"
+        raise ValueError(msg)
+    if len(matches) > 1:
+        msg = f"Multiple sessions match prefix '{prefix}'"
+        raise ValueError(msg)
+    return matches[0]
+
+
+def collect_projects(
+    projects: list[ProjectInfo], jobs: int, *, use_checkpoints: bool = True
+) -> Iterator[tuple[str, list[ProjectFeedbackItem], str | None]]:
+    """Extract every session of every project in one run.
+
+    All projects' sessions go through one worker pool (or run in-process
+    when jobs is 1), and results stream back in project order. Checkpoints
+    are loaded per project up front and saved once every result has been
+    consumed.
+
+    Args:
+        projects: Projects to collect from
+        jobs: Worker process count; 0 uses all cores, 1 runs in-process
+        use_checkpoints: Whether to resume files from saved checkpoints
+
+    Returns:
+        Iterator of (session_id, tagged feedback items, error or None)
+    """
+    by_dir = {project.history_dir: project for project in projects}
+    sessions = [
+        (project.history_dir, session.session_id)
+        for project in projects
+        for session in list_history_sessions(project.history_dir)
+    ]
+    checkpoints: dict[Path, CheckpointSet] | None = (
+        {history_dir: load_checkpoints(history_dir) for history_dir in by_dir}
+        if use_checkpoints
+        else None
+    )
+    results = (
+        extract_history_sessions(sessions, checkpoints)
+        if jobs == 1
+        else extract_history_parallel(sessions, jobs or None, checkpoints)
+    )
+    for history_dir, session_id, feedback, error in results:
+        yield session_id, tag_feedback(feedback, by_dir[history_dir]), error
+    for history_dir, loaded in (checkpoints or {}).items():
+        save_checkpoints(history_dir, loaded)
@@ -1,6 +1,9 @@
 """CLI command for memory index recall analysis."""
 
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import click
@@ -8,12 +11,18 @@ import click
 from edify.discovery import list_top_level_sessions
 from edify.models import SessionInfo
 from edify.paths import get_project_history_dir
+from edify.recall.extraction_cache import (
+    ExtractionSet,
+    SessionExtraction,
+    extract_session,
+    load_extractions,
+    save_extractions,
+)
 from edify.recall.index_parser import IndexEntry, parse_memory_index
 from edify.recall.recall import RecallAnalysis, calculate_recall
-from edify.recall.relevance import RelevanceScore, find_relevant_entries
+from edify.recall.relevance import KeywordIndex, RelevanceScore
 from edify.recall.report import generate_json_report, generate_markdown_report
-from edify.recall.tool_calls import ToolCall, extract_tool_calls_from_session
-from edify.recall.topics import extract_session_topics
+from edify.recall.tool_calls import ToolCall
 
 
 def _validate_inputs(
@@ -47,44 +56,81 @@ def _validate_inputs(
     return index_path, True
 
 
-def _extract_session_data(
+def _extract_sessions(session_files: list[Path], jobs: int) -> list[SessionExtraction]:
+    """Extract tool calls and topics from each session file, in order.
+
+    With more than one job, files are extracted across a process pool of
+    spawned workers.
+    """
+    workers = min(jobs or os.process_cpu_count() or 1, len(session_files))
+    if workers <= 1:
+        return [extract_session(session_file) for session_file in session_files]
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        chunksize = max(1, len(session_files) // (workers * 4))
+        return list(pool.map(extract_session, session_files, chunksize=chunksize))
+
+
+def _extract_session_data(  # noqa: PLR0913, PLR0917
     analyzed_sessions: list[SessionInfo],
     history_dir: Path,
     index_entries: list[IndexEntry],
     threshold: float,
+    jobs: int = 1,
+    cache: ExtractionSet | None = None,
 ) -> tuple[dict[str, list[ToolCall]], dict[str, list[RelevanceScore]]]:
     """Extract tool calls and relevant entries from sessions.
 
+    Sessions whose file is unchanged since it was cached reuse the cached
+    extraction; the rest are read, across worker processes when jobs is
+    more than one, and added to cache.updated. Scoring runs afterwards
+    against entries indexed by keyword once, so a session is only scored
+    against entries sharing a keyword with it, and a different index or
+    threshold needs no session file reads. Results are keyed in session
+    order, so output is identical to serial, uncached analysis.
+
     Args:
         analyzed_sessions: List of session info to process
         history_dir: Path to session history directory
         index_entries: Parsed index entries
         threshold: Relevance threshold
+        jobs: Worker process count; 0 uses all available cores
+        cache: Cached extractions for history_dir, or None to read every file
 
     Returns:
         Tuple of (sessions_data, relevant_entries) dicts
     """
+    session_files = {
+        session_info.session_id: session_file
+        for session_info in analyzed_sessions
+        if (session_file := history_dir / f"{session_info.session_id}.jsonl").exists()
+    }
+    extractions: dict[str, SessionExtraction] = {}
+    pending: list[tuple[str, Path]] = []
+    for session_id, session_file in session_files.items():
+        cached = cache.get(session_file) if cache is not None else None
+        if cached is None:
+            pending.append((session_id, session_file))
+        else:
+            extractions[session_id] = cached
+    fresh = _extract_sessions([session_file for _, session_file in pending], jobs)
+    for (session_id, session_file), extraction in zip(pending, fresh, strict=True):
+        extractions[session_id] = extraction
+        if cache is not None:
+            cache.updated[str(session_file)] = extraction
+
+    keyword_index = KeywordIndex(index_entries)
     sessions_data = {}
     relevant_entries = {}
-
-    for session_info in analyzed_sessions:
-        session_file = history_dir / f"{session_info.session_id}.jsonl"
-        if not session_file.exists():
+    for session_id in session_files:
+        extraction = extractions[session_id]
+        sessions_data[session_id] = extraction.tool_calls
+        if not extraction.topics:
             continue
-
-        # Extract tool calls
-        tool_calls = extract_tool_calls_from_session(session_file)
-        sessions_data[session_info.session_id] = tool_calls
-
-        # Extract topics
-        topics = extract_session_topics(session_file)
-        if topics:
-            # Find relevant entries
-            relevant = find_relevant_entries(
-                session_info.session_id, topics, index_entries, threshold
-            )
-            if relevant:
-                relevant_entries[session_info.session_id] = relevant
+        relevant = keyword_index.find_relevant(session_id, extraction.topics, threshold)
+        if relevant:
+            relevant_entries[session_id] = relevant
 
     return sessions_data, relevant_entries
 
@@ -151,13 +197,27 @@ def _generate_and_output_report(
     type=click.Path(),
     help="Write report to file (default: stdout)",
 )
-def recall(
+@click.option(
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=0),
+    help="Worker processes for session analysis (0 = all cores, default: 1)",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    show_default=True,
+    help="Reuse extractions of session files unchanged since the last run",
+)
+def recall(  # noqa: PLR0913, PLR0917
     index: str,
     sessions: int,
     _baseline_before: str | None,
     threshold: float,
     output_format: str,
     output: str | None,
+    jobs: int,
+    cache: bool,  # noqa: FBT001
 ) -> None:
     """Analyze memory index recall effectiveness.
 
@@ -188,9 +248,12 @@ def recall(
         history_dir = get_project_history_dir(project_dir)
 
         # Extract session data
+        extractions = load_extractions(history_dir) if cache else None
         sessions_data, relevant_entries = _extract_session_data(
-            analyzed_sessions, history_dir, index_entries, threshold
+            analyzed_sessions, history_dir, index_entries, threshold, jobs, extractions
         )
+        if extractions is not None:
+            save_extractions(history_dir, extractions)
 
         if not relevant_entries:
             click.echo("Warning: No relevant entries found in sessions", err=True)
@@ -0,0 +1,217 @@
+"""Persistent cache of per-session recall extraction results.
+
+Recall analysis only needs each session's tool calls, reduced to the
+fields discovery classification reads, and its topic keywords. Both are
+stored per session file, keyed by path and revalidated against size and
+mtime, so re-running recall only parses new or changed sessions. Each
+entry also records the extraction version it was made with, and entries
+from another version are extracted again. Scoring
+against the index happens after extraction, so changing the index or
+--threshold reuses every cached extraction.
+"""
+
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import Integer, String, Text, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Mapped, mapped_column, sessionmaker
+
+from edify.parsing import FEEDBACK_RULES_VERSION
+from edify.recall.scanner import scan_session
+from edify.recall.tool_calls import ToolCall, ToolCallCollector
+from edify.recall.topics import TopicCollector
+from edify.session_index import Base, get_default_engine
+
+logger = logging.getLogger(__name__)
+
+# Version of the session extraction. Bump it whenever ToolCallCollector,
+# TopicCollector or _reduce_tool_call change what is extracted, so cached
+# extractions made the old way are discarded. Topics also depend on
+# is_trivial, so FEEDBACK_RULES_VERSION is stored alongside it.
+EXTRACTION_VERSION = 1
+
+# Tool input keys discovery classification reads a file path from
+_PATH_KEYS = ("file_path", "path")
+# Size and mtime recorded for an unreadable session; they never match a
+# file's stat, so the session is read again on the next run
+_UNREADABLE = -1
+
+
+class ExtractionEntry(Base):
+    """Stored extraction for one session JSONL file, keyed by path."""
+
+    __tablename__ = "recall_extractions"
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    directory: Mapped[str] = mapped_column(String, index=True)
+    size: Mapped[int] = mapped_column(Integer)
+    mtime_ns: Mapped[int] = mapped_column(Integer)
+    tool_calls: Mapped[str] = mapped_column(Text)
+    topics: Mapped[str] = mapped_column(Text)
+    version: Mapped[str] = mapped_column(String)
+
+
+@dataclass
+class SessionExtraction:
+    """Tool calls and topic keywords extracted from one session file.
+
+    size and mtime_ns are the file's stat before it was read, so a file
+    appended to during the scan is parsed again on the next run.
+    """
+
+    size: int
+    mtime_ns: int
+    tool_calls: list[ToolCall] = field(default_factory=list)
+    topics: set[str] = field(default_factory=set)
+
+    def matches(self, path: Path) -> bool:
+        """Return whether path still has the size and mtime extracted from."""
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+
+@dataclass
+class ExtractionSet:
+    """Cached extractions for one history directory during a run.
+
+    New extractions go to updated, so only they need saving afterwards.
+    """
+
+    saved: dict[str, SessionExtraction] = field(default_factory=dict)
+    updated: dict[str, SessionExtraction] = field(default_factory=dict)
+
+    def get(self, path: Path) -> SessionExtraction | None:
+        """Return the extraction for path if the file is unchanged since."""
+        key = str(path)
+        extraction = self.updated.get(key) or self.saved.get(key)
+        if extraction is None or not extraction.matches(path):
+            return None
+        return extraction
+
+
+def _extraction_version() -> str:
+    return f"{EXTRACTION_VERSION}.{FEEDBACK_RULES_VERSION}"
+
+
+def _reduce_tool_call(tool_call: ToolCall) -> ToolCall:
+    """Drop tool input other than the file path discovery matches on."""
+    reduced_input = {
+        key: value
+        for key in _PATH_KEYS
+        if isinstance(value := tool_call.input.get(key), str)
+    }
+    return tool_call.model_copy(update={"input": reduced_input})
+
+
+def extract_session(session_file: Path) -> SessionExtraction:
+    """Extract tool calls and topics from session_file in one pass.
+
+    An unreadable file yields no tool calls and is never reused from the
+    cache; topics collected before a read error are kept.
+
+    Args:
+        session_file: Path to the session JSONL file
+
+    Returns:
+        Reduced tool calls sorted by timestamp and topic keywords
+    """
+    try:
+        st = session_file.stat()
+    except OSError:
+        return SessionExtraction(size=_UNREADABLE, mtime_ns=_UNREADABLE)
+    tool_call_collector = ToolCallCollector()
+    topic_collector = TopicCollector()
+    if not scan_session(session_file, [tool_call_collector, topic_collector]):
+        return SessionExtraction(
+            size=_UNREADABLE,
+            mtime_ns=_UNREADABLE,
+            topics=topic_collector.keywords,
+        )
+    return SessionExtraction(
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        tool_calls=[_reduce_tool_call(tc) for tc in tool_call_collector.sorted_calls()],
+        topics=topic_collector.keywords,
+    )
+
+
+class ExtractionStore:
+    """Extraction storage backed by SQLite via SQLAlchemy."""
+
+    def __init__(self, engine: Engine) -> None:
+        """Initialize store with database engine."""
+        self._session_factory = sessionmaker(bind=engine)
+
+    def load(self, history_dir: Path) -> ExtractionSet:
+        """Load extractions stored for files in history_dir by this version."""
+        with self._session_factory() as session:
+            entries = session.scalars(
+                select(ExtractionEntry).where(
+                    ExtractionEntry.directory == str(history_dir),
+                    ExtractionEntry.version == _extraction_version(),
+                )
+            )
+            saved = {
+                entry.path: SessionExtraction(
+                    size=entry.size,
+                    mtime_ns=entry.mtime_ns,
+                    tool_calls=[
+                        ToolCall.model_validate(item)
+                        for item in json.loads(entry.tool_calls)
+                    ],
+                    topics=set(json.loads(entry.topics)),
+                )
+                for entry in entries
+            }
+        return ExtractionSet(saved=saved)
+
+    def save(
+        self, history_dir: Path, extractions: Mapping[str, SessionExtraction]
+    ) -> None:
+        """Insert or replace extractions in a single transaction."""
+        with self._session_factory() as session:
+            for path, extraction in extractions.items():
+                session.merge(
+                    ExtractionEntry(
+                        path=path,
+                        directory=str(history_dir),
+                        size=extraction.size,
+                        mtime_ns=extraction.mtime_ns,
+                        tool_calls=json.dumps(
+                            [tc.model_dump() for tc in extraction.tool_calls]
+                        ),
+                        topics=json.dumps(sorted(extraction.topics)),
+                        version=_extraction_version(),
+                    )
+                )
+            session.commit()
+
+
+def load_extractions(history_dir: Path) -> ExtractionSet:
+    """Load extractions for history_dir from the default store.
+
+    Starts from an empty cache when the store is unavailable.
+    """
+    try:
+        return ExtractionStore(get_default_engine()).load(history_dir)
+    except SQLAlchemyError, OSError:
+        logger.warning("Recall cache unavailable, extracting from scratch")
+    return ExtractionSet()
+
+
+def save_extractions(history_dir: Path, extractions: ExtractionSet) -> None:
+    """Persist extractions made during this run, if any."""
+    if not extractions.updated:
+        return
+    try:
+        ExtractionStore(get_default_engine()).save(history_dir, extractions.updated)
+    except SQLAlchemyError, OSError:
+        logger.warning("Recall cache unavailable, extractions not saved")
@@ -0,0 +1,118 @@
+"""Per-session index of the files a session's tool calls accessed.
+
+A tool call's path P matches a referenced file T when they are the same
+path, when one is absolute and ends with the components of the other
+(relative) one, or when P has no extension and T lies under it, as a
+directory searched or listed. Each tool path is recorded once under the
+keys those rules compare, with the position of its first call, so
+finding the first call matching a referenced file costs a few
+dictionary lookups per path component instead of a scan of the session.
+"""
+
+from pathlib import Path
+from typing import Any
+
+from edify.recall.tool_calls import ToolCall
+
+_SEARCH_TOOLS = ("Grep", "Glob")
+
+
+def _extract_file_from_input(tool_input: dict[str, Any]) -> str | None:
+    """Extract file path from tool input dict.
+
+    Handles different tool types:
+    - Read: file_path
+    - Grep: path
+    - Glob: path
+    - Write: file_path
+    - Bash: command (no file target)
+
+    Args:
+        tool_input: Tool input dictionary
+
+    Returns:
+        File path if found, None otherwise
+    """
+    # Try common file path keys
+    for key in ["file_path", "path"]:
+        if key in tool_input:
+            path_value = tool_input[key]
+            if isinstance(path_value, str):
+                return path_value
+
+    return None
+
+
+class _FirstPositions:
+    """First position at which each path was accessed, keyed for matching."""
+
+    def __init__(self) -> None:
+        """Initialize with no paths."""
+        self.exact: dict[tuple[str, ...], int] = {}
+        # Components after the root of absolute paths, e.g. ("b", "c.md")
+        # and ("c.md",) for "/b/c.md"; these match relative targets
+        self.absolute_suffixes: dict[tuple[str, ...], int] = {}
+        # Relative paths, which match absolute targets ending with them
+        self.relative: dict[tuple[str, ...], int] = {}
+        # Paths without an extension, which match targets under them
+        self.directories: dict[tuple[str, ...], int] = {}
+
+    def add(self, tool_file: str, position: int) -> None:
+        """Record an access to tool_file at position, keeping the first."""
+        path = Path(tool_file)
+        parts = path.parts
+        self.exact.setdefault(parts, position)
+        if path.is_absolute():
+            for start in range(1, len(parts)):
+                self.absolute_suffixes.setdefault(parts[start:], position)
+        else:
+            self.relative.setdefault(parts, position)
+        if not path.suffix:
+            self.directories.setdefault(parts, position)
+
+    def first(self, target_file: str) -> int | None:
+        """Position of the first access matching target_file, if any."""
+        path = Path(target_file)
+        parts = path.parts
+        hits = [self.exact.get(parts)]
+        if path.is_absolute():
+            hits.extend(self.relative.get(parts[i:]) for i in range(1, len(parts)))
+            # A relative directory can't contain an absolute path
+            prefixes = range(1, len(parts) + 1)
+        else:
+            hits.append(self.absolute_suffixes.get(parts))
+            prefixes = range(len(parts) + 1)
+        hits.extend(self.directories.get(parts[:end]) for end in prefixes)
+        return min((hit for hit in hits if hit is not None), default=None)
+
+
+class FileAccessIndex:
+    """First Read and first Grep/Glob position of each path in a session.
+
+    Built in one pass over the session's tool calls, then queried once
+    per relevant index entry.
+    """
+
+    def __init__(self, tool_calls: list[ToolCall]) -> None:
+        """Index the paths read and searched by tool_calls.
+
+        Args:
+            tool_calls: Tool calls from the session, in order
+        """
+        self._reads = _FirstPositions()
+        self._searches = _FirstPositions()
+        for position, tc in enumerate(tool_calls):
+            if tc.tool_name == "Read":
+                self._reads.add(_extract_file_from_input(tc.input) or "", position)
+            elif tc.tool_name in _SEARCH_TOOLS:
+                tool_file = _extract_file_from_input(tc.input)
+                if tool_file:
+                    self._searches.add(tool_file, position)
+
+    def first_read(self, referenced_file: str) -> int | None:
+        """Position of the first Read of the file or its directory."""
+        return self._reads.first(referenced_file)
+
+    def first_search(self, referenced_file: str) -> int | None:
+        """Position of the first Grep/Glob of the file or its directory."""
+        return self._searches.first(referenced_file)
@@ -2,11 +2,11 @@
 
 import logging
 from enum import StrEnum
-from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
 
+from edify.recall.file_access import FileAccessIndex
 from edify.recall.index_parser import IndexEntry
 from edify.recall.relevance import RelevanceScore
 from edify.recall.tool_calls import ToolCall
@@ -48,102 +48,12 @@ class RecallAnalysis(BaseModel):
     pattern_summary: dict[str, int]  # Aggregate pattern counts
 
 
-def _extract_file_from_input(tool_input: dict[str, Any]) -> str | None:
-    """Extract file path from tool input dict.
-
-    Handles different tool types:
-    - Read: file_path
-    - Grep: path
-    - Glob: path
-    - Write: file_path
-    - Bash: command (no file target)
-
-    Args:
-        tool_input: Tool input dictionary
-
-    Returns:
-        File path if found, None otherwise
-    """
-    # Try common file path keys
-    for key in ["file_path", "path"]:
-        if key in tool_input:
-            path_value = tool_input[key]
-            if isinstance(path_value, str):
-                return path_value
-
-    return None
-
-
-def _matches_file_or_parent(target_file: str, tool_file: str) -> bool:
-    """Check if tool file matches target file or its parent directory.
-
-    Args:
-        target_file: Referenced file from index entry (may be relative)
-        tool_file: File from tool input (may be absolute)
-
-    Returns:
-        True if tool targets the file or its parent directory
-    """
-    target_path = Path(target_file)
-    tool_path = Path(tool_file)
-
-    # Exact match (both absolute or both relative with same path)
-    if target_path == tool_path:
-        return True
-
-    # Normalize: compare via suffix match when paths differ in absoluteness
-    # e.g., "/Users/.../agents/decisions/testing.md" matches
-    # "agents/decisions/testing.md"
-    if _paths_match_by_suffix(target_path, tool_path):
-        return True
-
-    # Tool targets parent directory of target file
-    # e.g., tool_file="src/", target_file="src/file.md"
-    try:
-        target_path.relative_to(tool_path)
-        # Only match if tool_path is a directory (no file extension)
-        return bool(not tool_path.suffix)
-    except ValueError:
-        return False
-
-
-def _paths_match_by_suffix(target_path: Path, tool_path: Path) -> bool:
-    """Check if absolute and relative paths match by suffix comparison.
-
-    Args:
-        target_path: Target path (may be relative)
-        tool_path: Tool path (may be absolute)
-
-    Returns:
-        True if paths match by suffix
-    """
-    if tool_path.is_absolute() and not target_path.is_absolute():
-        return _suffix_matches(tool_path, target_path)
-    if target_path.is_absolute() and not tool_path.is_absolute():
-        return _suffix_matches(target_path, tool_path)
-    return False
-
-
-def _suffix_matches(abs_path: Path, rel_path: Path) -> bool:
-    """Check if absolute path ends with relative path components.
-
-    Args:
-        abs_path: Absolute path
-        rel_path: Relative path
-
-    Returns:
-        True if abs_path ends with rel_path
-    """
-    if len(rel_path.parts) > len(abs_path.parts):
-        return False
-    return abs_path.parts[-len(rel_path.parts) :] == rel_path.parts
-
-
 def classify_discovery_pattern(
     _relevant_entry: RelevanceScore,
     tool_calls: list[ToolCall],
     referenced_file: str,
     _session_id: str,
+    access: FileAccessIndex | None = None,
 ) -> DiscoveryPattern:
     """Classify how agent discovered a referenced file.
 
@@ -158,32 +68,24 @@ def classify_discovery_pattern(
         tool_calls: Tool calls from the session
         referenced_file: File referenced by index entry
         session_id: Session identifier for logging
+        access: Index of tool_calls, built once per session when
+            classifying several entries; built here when omitted
 
     Returns:
         DiscoveryPattern classification
     """
-    # Find Read calls to the referenced file
-    read_calls = [
-        tc
-        for tc in tool_calls
-        if tc.tool_name == "Read"
-        and _matches_file_or_parent(
-            referenced_file, _extract_file_from_input(tc.input) or ""
-        )
-    ]
+    if access is None:
+        access = FileAccessIndex(tool_calls)
 
-    if not read_calls:
+    # Find the first Read of the referenced file
+    first_read = access.first_read(referenced_file)
+    if first_read is None:
         return DiscoveryPattern.NOT_FOUND
 
-    first_read_index = tool_calls.index(read_calls[0])
-
-    # Check for preceding Grep or Glob calls to same file/directory
-    for i in range(first_read_index):
-        tc = tool_calls[i]
-        if tc.tool_name in ("Grep", "Glob"):
-            tool_file = _extract_file_from_input(tc.input)
-            if tool_file and _matches_file_or_parent(referenced_file, tool_file):
-                return DiscoveryPattern.SEARCH_THEN_READ
+    # Check for a preceding Grep or Glob of the same file/directory
+    first_search = access.first_search(referenced_file)
+    if first_search is not None and first_search < first_read:
+        return DiscoveryPattern.SEARCH_THEN_READ
 
     # Default to direct if no preceding search
     return DiscoveryPattern.DIRECT
@@ -212,6 +114,7 @@ def calculate_recall(
 
     for session_id, relevant_list in relevant_entries.items():
         tool_calls = sessions_data.get(session_id, [])
+        access = FileAccessIndex(tool_calls)
 
         for rel_score in relevant_list:
             entry_key = rel_score.entry_key
@@ -239,7 +142,7 @@ def calculate_recall(
             entry = entry_map.get(entry_key)
             if entry:
                 pattern = classify_discovery_pattern(
-                    rel_score, tool_calls, entry.referenced_file, session_id
+                    rel_score, tool_calls, entry.referenced_file, session_id, access
                 )
 
                 entry_metrics[entry_key]["patterns"][pattern.value] += 1
@@ -1,5 +1,8 @@
 """Score relevance between session topics and index entries."""
 
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
 from pydantic import BaseModel
 
 from edify.recall.index_parser import IndexEntry
@@ -55,6 +58,68 @@ def score_relevance(
     )
 
 
+class KeywordIndex:
+    """Inverted index from keyword to the index entries containing it.
+
+    Built once per memory index, so each session is scored only against
+    entries sharing at least one of its keywords instead of every entry.
+    """
+
+    def __init__(self, entries: list[IndexEntry]) -> None:
+        """Index entries by keyword.
+
+        Args:
+            entries: Index entries, in the order results are ranked on ties
+        """
+        self.entries = entries
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        for position, entry in enumerate(entries):
+            for keyword in entry.keywords:
+                self.postings[keyword].append(position)
+
+    def find_relevant(
+        self, session_id: str, session_keywords: set[str], threshold: float = 0.3
+    ) -> list[RelevanceScore]:
+        """Find all relevant entries for a session.
+
+        Args:
+            session_id: Session identifier
+            session_keywords: Keywords extracted from session
+            threshold: Relevance threshold (default 0.3)
+
+        Returns:
+            List of RelevanceScore objects for relevant entries, by score
+            descending and then index order
+        """
+        if threshold <= 0:
+            # Entries sharing no keyword score 0, which is still relevant
+            candidates: Iterable[int] = range(len(self.entries))
+        else:
+            overlap = Counter(
+                position
+                for keyword in session_keywords
+                for position in self.postings.get(keyword, ())
+            )
+            candidates = sorted(
+                position
+                for position, count in overlap.items()
+                if count / len(self.entries[position].keywords) >= threshold
+            )
+
+        relevant = []
+        for position in candidates:
+            score_result = score_relevance(
+                session_id, session_keywords, self.entries[position], threshold
+            )
+            if score_result.is_relevant:
+                relevant.append(score_result)
+
+        # Sort by score descending
+        relevant.sort(key=lambda r: r.score, reverse=True)
+
+        return relevant
+
+
 def find_relevant_entries(
     session_id: str,
     session_keywords: set[str],
@@ -63,6 +128,9 @@ def find_relevant_entries(
 ) -> list[RelevanceScore]:
     """Find all relevant entries for a session.
 
+    Builds a KeywordIndex for one lookup; when scoring many sessions build
+    the index once and call KeywordIndex.find_relevant instead.
+
     Args:
         session_id: Session identifier
         session_keywords: Keywords extracted from session
@@ -72,14 +140,4 @@ def find_relevant_entries(
     Returns:
         List of RelevanceScore objects for relevant entries (score >= threshold)
     """
-    relevant = []
-
-    for entry in entries:
-        score_result = score_relevance(session_id, session_keywords, entry, threshold)
-        if score_result.is_relevant:
-            relevant.append(score_result)
-
-    # Sort by score descending
-    relevant.sort(key=lambda r: r.score, reverse=True)
-
-    return relevant
+    return KeywordIndex(entries).find_relevant(session_id, session_keywords, threshold)
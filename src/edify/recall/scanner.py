@@ -0,0 +1,62 @@
+"""Single-pass scanning of session JSONL files.
+
+Each line of a session is decoded once and handed to every collector, so
+extracting tool calls, topics and anything added later costs one read
+and one json.loads per line however many collectors run.
+"""
+
+import json
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Protocol
+
+from edify.jsonl import iter_lines
+
+logger = logging.getLogger(__name__)
+
+
+class EntryCollector(Protocol):
+    """Protocol for collectors fed the entries of a session."""
+
+    def collect(self, entry: dict[str, Any], line_num: int, file_name: str) -> None:
+        """Process one decoded JSONL entry."""
+        ...
+
+
+def scan_session(session_file: Path, collectors: Sequence[EntryCollector]) -> bool:
+    """Decode each entry of session_file once and pass it to every collector.
+
+    Blank lines and lines that are not JSON objects are skipped, with a
+    warning for malformed JSON.
+
+    Args:
+        session_file: Path to session JSONL file
+        collectors: Collectors to feed, in order, with each entry
+
+    Returns:
+        False if the file could not be read; collectors keep the entries
+        seen before the failure
+    """
+    try:
+        for line_num, current_line in enumerate(iter_lines(session_file), 1):
+            stripped_line = current_line.strip()
+            if not stripped_line:
+                continue
+
+            try:
+                entry = json.loads(stripped_line)
+            except json.JSONDecodeError as e:
+                logger.warning(
+                    "Malformed JSON in %s line %d: %s", session_file.name, line_num, e
+                )
+                continue
+            if not isinstance(entry, dict):
+                continue
+
+            for collector in collectors:
+                collector.collect(entry, line_num, session_file.name)
+    except OSError as e:
+        logger.warning("Failed to read %s: %s", session_file, e)
+        return False
+    return True
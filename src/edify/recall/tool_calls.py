@@ -1,12 +1,13 @@
 """Extract tool calls from session JSONL files."""
 
-import json
 import logging
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
 
+from edify.recall.scanner import scan_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,30 +21,6 @@ class ToolCall(BaseModel):
     session_id: str
 
 
-def _parse_json_line(
-    line_text: str, line_num: int, session_file_name: str
-) -> dict[str, Any] | None:
-    """Parse a JSON line with error handling.
-
-    Args:
-        line_text: Text content of the line
-        line_num: Line number for error messages
-        session_file_name: Session file name for logging
-
-    Returns:
-        Parsed JSON dict or None if parsing fails
-    """
-    try:
-        result: dict[str, Any] = json.loads(line_text)
-    except json.JSONDecodeError as e:
-        logger.warning(
-            "Malformed JSON in %s line %d: %s", session_file_name, line_num, e
-        )
-        return None
-    else:
-        return result
-
-
 def _extract_tool_call_from_block(
     content_block: dict[str, Any],
     timestamp: str,
@@ -94,6 +71,44 @@ def _extract_tool_call_from_block(
         return None
 
 
+class ToolCallCollector:
+    """Collects tool calls from assistant entries during a session scan."""
+
+    def __init__(self) -> None:
+        """Initialize with no tool calls."""
+        self.tool_calls: list[ToolCall] = []
+
+    def collect(self, entry: dict[str, Any], line_num: int, file_name: str) -> None:
+        """Collect the tool_use content blocks of an assistant entry."""
+        # Only process assistant entries
+        if entry.get("type") != "assistant":
+            return
+
+        # Extract timestamp and session_id
+        timestamp = entry.get("timestamp", "")
+        session_id = entry.get("sessionId", "")
+
+        # Process content array looking for tool_use blocks
+        message = entry.get("message", {})
+        content = message.get("content", [])
+        if not isinstance(content, list):
+            return
+
+        for content_block in content:
+            if not isinstance(content_block, dict):
+                continue
+
+            tool_call = _extract_tool_call_from_block(
+                content_block, timestamp, session_id, line_num, file_name
+            )
+            if tool_call:
+                self.tool_calls.append(tool_call)
+
+    def sorted_calls(self) -> list[ToolCall]:
+        """Return the collected tool calls sorted by timestamp."""
+        return sorted(self.tool_calls, key=lambda tc: tc.timestamp)
+
+
 def extract_tool_calls_from_session(session_file: Path) -> list[ToolCall]:
     """Extract all tool calls from a session JSONL file.
 
@@ -106,52 +121,7 @@ def extract_tool_calls_from_session(session_file: Path) -> list[ToolCall]:
     Returns:
         List of ToolCall objects sorted by timestamp
     """
-    tool_calls: list[ToolCall] = []
-
-    try:
-        with session_file.open() as f:
-            for line_num, current_line in enumerate(f, 1):
-                stripped_line = current_line.strip()
-                if not stripped_line:
-                    continue
-
-                entry = _parse_json_line(stripped_line, line_num, session_file.name)
-                if entry is None:
-                    continue
-
-                # Only process assistant entries
-                if entry.get("type") != "assistant":
-                    continue
-
-                # Extract timestamp and session_id
-                timestamp = entry.get("timestamp", "")
-                session_id = entry.get("sessionId", "")
-
-                # Process content array looking for tool_use blocks
-                message = entry.get("message", {})
-                content = message.get("content", [])
-                if not isinstance(content, list):
-                    continue
-
-                for content_block in content:
-                    if not isinstance(content_block, dict):
-                        continue
-
-                    tool_call = _extract_tool_call_from_block(
-                        content_block,
-                        timestamp,
-                        session_id,
-                        line_num,
-                        session_file.name,
-                    )
-                    if tool_call:
-                        tool_calls.append(tool_call)
-
-    except OSError as e:
-        logger.warning("Failed to read %s: %s", session_file, e)
+    collector = ToolCallCollector()
+    if not scan_session(session_file, [collector]):
         return []
-
-    # Sort by timestamp
-    tool_calls.sort(key=lambda tc: tc.timestamp)
-
-    return tool_calls
+    return collector.sorted_calls()
@@ -1,13 +1,11 @@
 """Extract topic keywords from session user prompts."""
 
-import json
-import logging
 import re
 from pathlib import Path
+from typing import Any
 
 from edify.parsing import extract_content_text, is_trivial
-
-logger = logging.getLogger(__name__)
+from edify.recall.scanner import scan_session
 
 # Additional noise words specific to Claude sessions
 SESSION_NOISE_WORDS = {
@@ -72,6 +70,47 @@ STOPWORDS = {
 }
 
 
+class TopicCollector:
+    """Collects topic keywords from user prompts during a session scan."""
+
+    def __init__(self) -> None:
+        """Initialize with no keywords."""
+        self.keywords: set[str] = set()
+
+    def collect(
+        self,
+        entry: dict[str, Any],
+        line_num: int,  # noqa: ARG002
+        file_name: str,  # noqa: ARG002
+    ) -> None:
+        """Add the keywords of a non-trivial user entry."""
+        # Only process user entries
+        if entry.get("type") != "user":
+            return
+
+        # Extract text from message
+        message = entry.get("message", {})
+        content = message.get("content", "")
+
+        # Handle both string and array content formats
+        text = extract_content_text(content)
+
+        # Filter empty and trivial messages
+        if not text or is_trivial(text):
+            return
+
+        # Tokenize and extract keywords
+        tokens = re.split(r"[\s\-_.,;:()[\]{}\"'`]+", text.lower())
+
+        self.keywords.update(
+            token
+            for token in tokens
+            if len(token) > 1
+            and token not in STOPWORDS
+            and token not in SESSION_NOISE_WORDS
+        )
+
+
 def extract_session_topics(session_file: Path) -> set[str]:
     """Extract topic keywords from user prompts.
 
@@ -84,57 +123,6 @@ def extract_session_topics(session_file: Path) -> set[str]:
     Returns:
         Set of topic keywords
     """
-    keywords: set[str] = set()
-
-    try:
-        with session_file.open() as f:
-            for line_num, current_line in enumerate(f, 1):
-                stripped_line = current_line.strip()
-                if not stripped_line:
-                    continue
-
-                try:
-                    entry = json.loads(stripped_line)
-                except json.JSONDecodeError as e:
-                    logger.debug(
-                        "Malformed JSON in %s line %d: %s",
-                        session_file.name,
-                        line_num,
-                        e,
-                    )
-                    continue
-
-                # Only process user entries
-                if entry.get("type") != "user":
-                    continue
-
-                # Extract text from message
-                message = entry.get("message", {})
-                content = message.get("content", "")
-
-                # Handle both string and array content formats
-                text = extract_content_text(content)
-
-                if not text:
-                    continue
-
-                # Filter trivial messages
-                if is_trivial(text):
-                    continue
-
-                # Tokenize and extract keywords
-                tokens = re.split(r"[\s\-_.,;:()[\]{}\"'`]+", text.lower())
-
-                for token in tokens:
-                    if (
-                        token
-                        and len(token) > 1
-                        and token not in STOPWORDS
-                        and token not in SESSION_NOISE_WORDS
-                    ):
-                        keywords.add(token)
-
-    except OSError as e:
-        logger.warning("Failed to read %s: %s", session_file, e)
-
-    return keywords
+    collector = TopicCollector()
+    scan_session(session_file, [collector])
+    return collector.keywords
@@ -0,0 +1,141 @@
+"""Concurrency-limited, rate-paced scheduling of Anthropic API requests.
+
+A semaphore caps requests in flight and a token bucket spaces them out
+to a requests-per-minute budget. A RateLimitError pauses the whole
+bucket, not just the failing request, so queued requests back off
+together instead of each tripping the limit again. Transient failures,
+server errors (including 529 overloaded) and connection errors, back off
+only the failing request, as the SDK's own retries did.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from anthropic import APIConnectionError, APIStatusError, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MINUTE = 1000
+MAX_RATE_LIMIT_RETRIES = 5
+# Status codes from this up are server errors worth retrying
+_SERVER_ERROR_STATUS = 500
+_BACKOFF_MAX_SECONDS = 60.0
+
+
+class TokenBucket:
+    """Paces acquisitions to a steady rate, allowing bursts up to capacity."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket refilling at rate tokens per second."""
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket and stop refilling it for seconds."""
+        self._tokens = 0.0
+        self._updated = max(self._updated, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it, first come first served."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now >= self._updated:
+                    elapsed = now - self._updated
+                    self._tokens = min(
+                        self._capacity, self._tokens + elapsed * self._rate
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    await asyncio.sleep((1 - self._tokens) / self._rate)
+                else:
+                    await asyncio.sleep(self._updated - now)
+
+
+def _is_retryable(error: APIStatusError | APIConnectionError) -> bool:
+    """Return whether error is a rate limit or a transient failure."""
+    if isinstance(error, APIConnectionError):
+        return True
+    return (
+        isinstance(error, RateLimitError) or error.status_code >= _SERVER_ERROR_STATUS
+    )
+
+
+def _retry_delay(
+    error: APIStatusError | APIConnectionError, attempt: int, backoff_base: float
+) -> float:
+    """Seconds to wait before retrying, honouring a retry-after header."""
+    delay: float = backoff_base * 2**attempt
+    if isinstance(error, APIStatusError):
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after is not None:
+            with contextlib.suppress(ValueError):
+                delay = float(retry_after)
+    return min(delay, _BACKOFF_MAX_SECONDS)
+
+
+class RequestScheduler:
+    """Run API requests under a concurrency limit and a rate budget."""
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        max_retries: int = MAX_RATE_LIMIT_RETRIES,
+        backoff_base: float = 1.0,
+    ) -> None:
+        """Initialize limits; must be created inside the running event loop.
+
+        Args:
+            concurrency: Maximum requests in flight at once
+            requests_per_minute: Sustained request rate; bursts of up to
+                concurrency requests are allowed
+            max_retries: Retries per request after a rate limit, server
+                or connection error
+            backoff_base: First retry delay in seconds when the response has
+                no retry-after header; doubles on every further retry
+        """
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(requests_per_minute / 60, concurrency)
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+
+    async def run[T](self, request: Callable[[], Awaitable[T]]) -> T:
+        """Await request() once a slot and a rate token are free.
+
+        Raises:
+            APIStatusError: If the request fails with a client error, or
+                still fails with a rate limit or server error after
+                max_retries retries
+            APIConnectionError: If the request still cannot connect after
+                max_retries retries
+        """
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._bucket.acquire()
+                try:
+                    return await request()
+                except (APIStatusError, APIConnectionError) as e:
+                    if attempt >= self._max_retries or not _is_retryable(e):
+                        raise
+                    delay = _retry_delay(e, attempt, self._backoff_base)
+                    rate_limited = isinstance(e, RateLimitError)
+                    if rate_limited:
+                        logger.info("Rate limited, retrying in %.1fs", delay)
+                        self._bucket.pause(delay)
+                    else:
+                        logger.info("%s, retrying in %.1fs", e, delay)
+            # Back off outside the semaphore so other requests keep running
+            if not rate_limited:
+                await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,214 @@
+"""Persistent index of session and agent JSONL files using SQLAlchemy."""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import platformdirs
+from pydantic import BaseModel
+from sqlalchemy import Integer, String, delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+
+from edify.jsonl import first_line
+from edify.parsing import extract_content_text, format_title
+from edify.sqlite_engine import create_sqlite_engine
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_EMPTY = "empty"
+STATUS_MALFORMED = "malformed"
+
+
+class Base(DeclarativeBase):
+    """SQLAlchemy declarative base."""
+
+
+class SessionFileEntry(Base):
+    """Indexed first-line metadata for one JSONL file, keyed by path."""
+
+    __tablename__ = "session_files"
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    directory: Mapped[str] = mapped_column(String, index=True)
+    size: Mapped[int] = mapped_column(Integer)
+    mtime_ns: Mapped[int] = mapped_column(Integer)
+    status: Mapped[str] = mapped_column(String)
+    session_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    agent_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    title: Mapped[str] = mapped_column(String, default="")
+    timestamp: Mapped[str] = mapped_column(String, default="")
+
+
+class IndexedFile(BaseModel):
+    """Metadata for a JSONL file in a history directory."""
+
+    path: Path
+    status: str
+    session_id: str | None = None
+    agent_id: str | None = None
+    title: str = ""
+    timestamp: str = ""
+
+
+def _read_metadata(path: Path) -> IndexedFile:
+    """Read file metadata from the first JSONL line."""
+    line = first_line(path).strip()
+    if not line:
+        return IndexedFile(path=path, status=STATUS_EMPTY)
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        return IndexedFile(path=path, status=STATUS_MALFORMED)
+
+    message = data.get("message", {})
+    content = message.get("content", "") if isinstance(message, dict) else ""
+    return IndexedFile(
+        path=path,
+        status=STATUS_OK,
+        session_id=data.get("sessionId"),
+        agent_id=data.get("agentId"),
+        title=format_title(extract_content_text(content)),
+        timestamp=data.get("timestamp", ""),
+    )
+
+
+def _to_indexed_file(entry: SessionFileEntry) -> IndexedFile:
+    """Convert a stored entry to its IndexedFile model."""
+    return IndexedFile(
+        path=Path(entry.path),
+        status=entry.status,
+        session_id=entry.session_id,
+        agent_id=entry.agent_id,
+        title=entry.title,
+        timestamp=entry.timestamp,
+    )
+
+
+class SessionIndex:
+    """Session file index backed by SQLite via SQLAlchemy.
+
+    Entries are keyed by path and revalidated against size and mtime, so
+    only new or changed files are reopened on each scan.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """Initialize index with database engine."""
+        self._session_factory = sessionmaker(bind=engine)
+
+    def scan(self, history_dir: Path) -> list[IndexedFile]:
+        """Return metadata for every *.jsonl file in history_dir.
+
+        Reads the first line of new or changed files, drops entries for
+        deleted files and commits once. Results are sorted by path.
+        """
+        if not history_dir.is_dir():
+            return []
+
+        stats: dict[str, os.stat_result] = {}
+        with os.scandir(history_dir) as it:
+            for dir_entry in it:
+                if dir_entry.name.endswith(".jsonl") and dir_entry.is_file():
+                    stats[dir_entry.path] = dir_entry.stat()
+
+        directory = str(history_dir)
+        results: list[IndexedFile] = []
+        with self._session_factory() as session:
+            existing = {
+                entry.path: entry
+                for entry in session.scalars(
+                    select(SessionFileEntry).where(
+                        SessionFileEntry.directory == directory
+                    )
+                )
+            }
+            for path_str in sorted(stats):
+                st = stats[path_str]
+                entry = existing.pop(path_str, None)
+                if (
+                    entry is not None
+                    and entry.size == st.st_size
+                    and entry.mtime_ns == st.st_mtime_ns
+                ):
+                    results.append(_to_indexed_file(entry))
+                    continue
+                try:
+                    metadata = _read_metadata(Path(path_str))
+                except OSError:
+                    continue
+                if entry is None:
+                    entry = SessionFileEntry(path=path_str, directory=directory)
+                    session.add(entry)
+                entry.size = st.st_size
+                entry.mtime_ns = st.st_mtime_ns
+                entry.status = metadata.status
+                entry.session_id = metadata.session_id
+                entry.agent_id = metadata.agent_id
+                entry.title = metadata.title
+                entry.timestamp = metadata.timestamp
+                results.append(metadata)
+            if existing:
+                session.execute(
+                    delete(SessionFileEntry).where(
+                        SessionFileEntry.path.in_(list(existing))
+                    )
+                )
+            session.commit()
+        return results
+
+
+def create_index_engine(db_path: str) -> Engine:
+    """Create database engine and initialize tables.
+
+    Pass ":memory:" for in-memory. File databases are safe to share
+    between concurrent processes.
+    """
+    return create_sqlite_engine(db_path, Base.metadata)
+
+
+# Default engine per database path, with the table count it was created
+# for; modules imported later (checkpoints, recall) add their own tables
+_default_engines: dict[str, tuple[int, Engine]] = {}
+# A forked child must not reuse the parent's pooled connections
+os.register_at_fork(after_in_child=_default_engines.clear)
+
+
+def get_default_engine() -> Engine:
+    """Return the engine for the index database at the platform cache location.
+
+    The engine is created once per process and reused, unless tables were
+    registered since, in which case a new engine creates them.
+    """
+    cache_dir = Path(platformdirs.user_cache_dir("edify"))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    db_path = str(cache_dir / "session_index.db")
+    tables = len(Base.metadata.tables)
+    cached = _default_engines.get(db_path)
+    if cached is not None and cached[0] == tables:
+        return cached[1]
+    engine = create_index_engine(db_path)
+    _default_engines[db_path] = (tables, engine)
+    return engine
+
+
+def get_default_index() -> SessionIndex:
+    """Create SessionIndex at the default platform cache location."""
+    return SessionIndex(get_default_engine())
+
+
+def scan_history_dir(history_dir: Path) -> list[IndexedFile]:
+    """Scan history_dir through the default index.
+
+    Falls back to a throwaway in-memory index when the on-disk index is
+    unavailable.
+    """
+    try:
+        return get_default_index().scan(history_dir)
+    except SQLAlchemyError, OSError:
+        logger.warning("Session index unavailable, scanning without cache")
+    return SessionIndex(create_index_engine(":memory:")).scan(history_dir)
@@ -0,0 +1,57 @@
+"""SQLite engines shared safely by concurrent edify processes.
+
+Parallel agents in separate worktrees run edify at the same time against
+the same cache files. File databases therefore use WAL journaling, so
+readers never block on the single writer, and wait on each other's locks
+instead of failing with "database is locked".
+"""
+
+from sqlalchemy import MetaData, create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import DBAPIConnection
+
+# How long a connection waits on another process's lock before failing
+BUSY_TIMEOUT_SECONDS = 30.0
+
+
+def _configure_connection(dbapi_connection: DBAPIConnection, _record: object) -> None:
+    """Apply per-connection pragmas for concurrent multi-process use."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Sync only at checkpoints; a crash can lose the last commits, which
+    # is acceptable for caches that can be rebuilt
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _create_tables(engine: Engine, metadata: MetaData) -> None:
+    """Create missing tables under a write lock.
+
+    Concurrent first runs would otherwise all see the tables missing and
+    all but one fail on CREATE TABLE.
+    """
+    with engine.connect() as conn:
+        if set(inspect(conn).get_table_names()) >= metadata.tables.keys():
+            return
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        metadata.create_all(conn)
+        conn.commit()
+
+
+def create_sqlite_engine(db_path: str, metadata: MetaData) -> Engine:
+    """Create an engine for db_path and create metadata's tables.
+
+    Pass ":memory:" for a private in-memory database.
+    """
+    if db_path == ":memory:":
+        engine = create_engine("sqlite:///:memory:")
+        metadata.create_all(engine)
+        return engine
+    # The default QueuePool keeps a process on one configured connection;
+    # processes coordinate only through SQLite's file locks
+    engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"timeout": BUSY_TIMEOUT_SECONDS}
+    )
+    event.listen(engine, "connect", _configure_connection)
+    _create_tables(engine, metadata)
+    return engine
@@ -5,6 +5,7 @@ import os
 import subprocess
 from pathlib import Path
 
+from edify.jsonl import iter_lines_reverse
 from edify.statusline.models import (
     GitStatus,
     PythonEnv,
@@ -100,19 +101,10 @@ def parse_transcript_context(transcript_path: str) -> int:
         assistant message found, or 0 if none found.
     """
     try:
+        # Parse lines of the last _TRANSCRIPT_READ_SIZE bytes in reverse to
+        # find first assistant message with tokens
         path = Path(transcript_path)
-        file_size = path.stat().st_size
-        # Read last _TRANSCRIPT_READ_SIZE bytes (or entire file if smaller)
-        read_size = min(_TRANSCRIPT_READ_SIZE, file_size)
-        start_pos = max(0, file_size - read_size)
-
-        with path.open() as f:
-            f.seek(start_pos)
-            content = f.read()
-
-        # Parse lines in reverse to find first assistant message with tokens
-        lines = content.strip().split("\n")
-        for line in reversed(lines):
+        for line in iter_lines_reverse(path, window=_TRANSCRIPT_READ_SIZE):
             if not line.strip():
                 continue
 
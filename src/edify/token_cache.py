@@ -1,21 +1,42 @@
-"""Token cache database management using SQLAlchemy."""
+"""Token cache database management using SQLAlchemy.
+
+Counts are keyed by content hash. A second table maps each file's stat
+identity (real path, size, mtime, inode) to its last content hash, so
+unchanged files are answered without reading or hashing them.
+"""
 
 import hashlib
 import logging
+import os
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 
 import platformdirs
 from anthropic import Anthropic
-from sqlalchemy import Integer, String, create_engine
+from sqlalchemy import Float, Integer, String, select, update
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    mapped_column,
+    sessionmaker,
+)
 
 from edify.exceptions import FileReadError
-from edify.tokens import ModelId, _count_tokens_for_content
+from edify.sqlite_engine import create_sqlite_engine
+from edify.tokens import ModelId, _count_tokens_for_content, _read_file
 
 logger = logging.getLogger(__name__)
 
+# Rows per statement; upserts bind up to five parameters per row, which
+# keeps every statement under SQLite's historical 999-parameter limit
+_MAX_BATCH = 150
+
 
 class Base(DeclarativeBase):
     """SQLAlchemy declarative base."""
@@ -32,55 +53,267 @@ class TokenCacheEntry(Base):
     last_used: Mapped[datetime] = mapped_column()
 
 
+class CacheCounterEntry(Base):
+    """Running total of a cache statistic, such as lookup hits."""
+
+    __tablename__ = "token_cache_counters"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer)
+
+
+class EstimatorCalibrationEntry(Base):
+    """Offline estimator fit against a model's exact cached counts."""
+
+    __tablename__ = "token_estimators"
+
+    model_id: Mapped[str] = mapped_column(String, primary_key=True)
+    scale: Mapped[float] = mapped_column(Float)
+    offset: Mapped[float] = mapped_column(Float)
+    error: Mapped[float] = mapped_column(Float)
+    samples: Mapped[int] = mapped_column(Integer)
+    fitted_at: Mapped[datetime] = mapped_column()
+
+
+class FileHashEntry(Base):
+    """Content hash of a file as of its last recorded stat."""
+
+    __tablename__ = "file_hashes"
+
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    size: Mapped[int] = mapped_column(Integer)
+    mtime_ns: Mapped[int] = mapped_column(Integer)
+    inode: Mapped[int] = mapped_column(Integer)
+    md5_hex: Mapped[str] = mapped_column(String)
+
+
+@dataclass(frozen=True)
+class FileStat:
+    """Stat identity of a file; a change to any field means re-hashing."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+def stat_file(path: Path) -> FileStat:
+    """Stat path through symlinks, raising FileReadError on failure."""
+    try:
+        real = os.path.realpath(path)
+        result = Path(real).stat()
+    except OSError as e:
+        raise FileReadError(str(path), str(e)) from e
+    return FileStat(real, result.st_size, result.st_mtime_ns, result.st_ino)
+
+
 class TokenCache:
-    """Token count cache backed by SQLite via SQLAlchemy."""
+    """Token count cache backed by SQLite via SQLAlchemy.
+
+    Lookups record hits and hit/miss counts in memory; they are written at
+    once by the next put_many() or flush(), so a run commits a constant
+    number of times however many files it counts.
+    """
 
     def __init__(self, engine: Engine) -> None:
         """Initialize cache with database engine."""
+        self.engine = engine
         self._session_factory = sessionmaker(bind=engine)
+        self._touched: dict[str, set[str]] = {}
+        self._counters: Counter[str] = Counter()
 
     def get(self, md5_hex: str, model_id: str) -> int | None:
         """Look up cached token count.
 
         Returns None on miss. Updates last_used on hit.
         """
-        with self._session_factory() as session:
-            entry = session.get(TokenCacheEntry, (md5_hex, model_id))
-            if entry is None:
-                return None
-            entry.last_used = datetime.now(UTC)
-            session.commit()
-            return entry.token_count
+        count = self.get_many([md5_hex], model_id).get(md5_hex)
+        self.flush()
+        return count
 
     def put(self, md5_hex: str, model_id: str, token_count: int) -> None:
         """Store or update token count."""
+        self.put_many(model_id, {md5_hex: token_count})
+
+    def get_many(self, md5_hexes: Iterable[str], model_id: str) -> dict[str, int]:
+        """Look up cached counts for many contents in one query per chunk.
+
+        Returns a dict holding only the hits. Their last_used update is
+        deferred to the next put_many() or flush().
+        """
+        keys = list(dict.fromkeys(md5_hexes))
+        found: dict[str, int] = {}
+        with self._session_factory() as session:
+            for chunk in _chunks(keys):
+                rows = session.execute(
+                    select(TokenCacheEntry.md5_hex, TokenCacheEntry.token_count).where(
+                        TokenCacheEntry.model_id == model_id,
+                        TokenCacheEntry.md5_hex.in_(chunk),
+                    )
+                )
+                found.update((md5_hex, count) for md5_hex, count in rows)
+        self._touched.setdefault(model_id, set()).update(found)
+        self._counters["hits"] += len(found)
+        self._counters["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, model_id: str, counts: Mapping[str, int]) -> None:
+        """Upsert counts and write pending last_used updates in one transaction."""
+        now = datetime.now(UTC)
+        with self._session_factory() as session:
+            for chunk in _chunks(list(counts.items())):
+                insert_stmt = insert(TokenCacheEntry).values(
+                    [
+                        {
+                            "md5_hex": md5_hex,
+                            "model_id": model_id,
+                            "token_count": token_count,
+                            "last_used": now,
+                        }
+                        for md5_hex, token_count in chunk
+                    ]
+                )
+                session.execute(
+                    insert_stmt.on_conflict_do_update(
+                        index_elements=["md5_hex", "model_id"],
+                        set_={
+                            "token_count": insert_stmt.excluded.token_count,
+                            "last_used": insert_stmt.excluded.last_used,
+                        },
+                    )
+                )
+            self._write_pending(session, now)
+            session.commit()
+
+    def get_file_hashes(self, stats: Iterable[FileStat]) -> dict[str, str]:
+        """Return content hashes of files whose stat is unchanged, by path."""
+        wanted = {stat.path: stat for stat in stats}
+        found: dict[str, str] = {}
         with self._session_factory() as session:
-            entry = session.get(TokenCacheEntry, (md5_hex, model_id))
-            now = datetime.now(UTC)
-            if entry is None:
-                entry = TokenCacheEntry(
-                    md5_hex=md5_hex,
-                    model_id=model_id,
-                    token_count=token_count,
-                    last_used=now,
+            for chunk in _chunks(list(wanted)):
+                entries = session.scalars(
+                    select(FileHashEntry).where(FileHashEntry.path.in_(chunk))
                 )
-                session.add(entry)
-            else:
-                entry.token_count = token_count
-                entry.last_used = now
+                for entry in entries:
+                    stat = FileStat(entry.path, entry.size, entry.mtime_ns, entry.inode)
+                    if stat == wanted[entry.path]:
+                        found[entry.path] = entry.md5_hex
+        return found
+
+    def put_file_hashes(self, hashes: Mapping[FileStat, str]) -> None:
+        """Record the content hash seen for each file stat."""
+        if not hashes:
+            return
+        with self._session_factory() as session:
+            for chunk in _chunks(list(hashes.items())):
+                insert_stmt = insert(FileHashEntry).values(
+                    [
+                        {
+                            "path": stat.path,
+                            "size": stat.size,
+                            "mtime_ns": stat.mtime_ns,
+                            "inode": stat.inode,
+                            "md5_hex": md5_hex,
+                        }
+                        for stat, md5_hex in chunk
+                    ]
+                )
+                session.execute(
+                    insert_stmt.on_conflict_do_update(
+                        index_elements=["path"],
+                        set_={
+                            column: insert_stmt.excluded[column]
+                            for column in ("size", "mtime_ns", "inode", "md5_hex")
+                        },
+                    )
+                )
+            session.commit()
+
+    def flush(self) -> None:
+        """Write pending last_used updates and counters from get_many()."""
+        if not self._touched and not self._counters:
+            return
+        with self._session_factory() as session:
+            self._write_pending(session, datetime.now(UTC))
             session.commit()
 
+    def _write_pending(self, session: Session, now: datetime) -> None:
+        for model_id, md5_hexes in self._touched.items():
+            for chunk in _chunks(sorted(md5_hexes)):
+                session.execute(
+                    update(TokenCacheEntry)
+                    .where(
+                        TokenCacheEntry.model_id == model_id,
+                        TokenCacheEntry.md5_hex.in_(chunk),
+                    )
+                    .values(last_used=now)
+                )
+        self._touched.clear()
+        if self._counters:
+            insert_stmt = insert(CacheCounterEntry).values(
+                [
+                    {"name": name, "value": value}
+                    for name, value in self._counters.items()
+                ]
+            )
+            session.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=["name"],
+                    set_={
+                        "value": CacheCounterEntry.value + insert_stmt.excluded.value
+                    },
+                )
+            )
+            self._counters.clear()
+
+
+def _chunks[T](items: list[T]) -> Iterator[list[T]]:
+    """Split items to stay under SQLite's bound-parameter limit."""
+    for start in range(0, len(items), _MAX_BATCH):
+        yield items[start : start + _MAX_BATCH]
+
 
 def create_cache_engine(db_path: str) -> Engine:
     """Create database engine and initialize tables.
 
-    Pass ":memory:" for in-memory.
+    Pass ":memory:" for in-memory. File databases are safe to share
+    between concurrent processes.
     """
-    engine = create_engine(
-        f"sqlite:///{db_path}" if db_path != ":memory:" else "sqlite:///:memory:"
-    )
-    Base.metadata.create_all(engine)
-    return engine
+    return create_sqlite_engine(db_path, Base.metadata)
+
+
+def lookup_file_hashes(cache: TokenCache, stats: Iterable[FileStat]) -> dict[str, str]:
+    """Look up hashes of unchanged files, treating cache errors as misses."""
+    try:
+        return cache.get_file_hashes(stats)
+    except Exception:  # noqa: BLE001
+        logger.warning("Cache read failed, re-reading files")
+        return {}
+
+
+def lookup_cached_counts(
+    cache: TokenCache, md5_hexes: Iterable[str], model: ModelId
+) -> dict[str, int]:
+    """Look up many cached counts, treating cache errors as all misses."""
+    try:
+        return cache.get_many(md5_hexes, model)
+    except Exception:  # noqa: BLE001
+        logger.warning("Cache read failed, falling back to API")
+        return {}
+
+
+def store_cached_counts(
+    cache: TokenCache,
+    model: ModelId,
+    counts: Mapping[str, int],
+    file_hashes: Mapping[FileStat, str] | None = None,
+) -> None:
+    """Store new counts and file hashes, logging on cache errors."""
+    try:
+        cache.put_many(model, counts)
+        cache.put_file_hashes(file_hashes or {})
+    except Exception:  # noqa: BLE001
+        logger.warning("Cache write failed, results not cached")
 
 
 def cached_count_tokens_for_file(
@@ -89,12 +322,18 @@ def cached_count_tokens_for_file(
     client: Anthropic,
     cache: TokenCache,
 ) -> int:
-    """Count tokens via cache; falls back to API on miss and stores result."""
-    try:
-        content = path.read_text()
-    except (PermissionError, OSError, UnicodeDecodeError) as e:
-        raise FileReadError(str(path), str(e)) from e
-    md5_hex = hashlib.md5(content.encode()).hexdigest()  # noqa: S324
+    """Count tokens via cache; falls back to API on miss and stores result.
+
+    A file whose stat matches the recorded one is not read at all when
+    its count is cached.
+    """
+    stat = stat_file(path)
+    md5_hex = lookup_file_hashes(cache, [stat]).get(stat.path)
+    content = None
+    if md5_hex is None:
+        content = _read_file(path)
+        md5_hex = hashlib.md5(content.encode()).hexdigest()  # noqa: S324
+        store_cached_counts(cache, model, {}, {stat: md5_hex})
 
     try:
         cached = cache.get(md5_hex, model)
@@ -105,6 +344,8 @@ def cached_count_tokens_for_file(
     if cached is not None:
         return cached
 
+    if content is None:
+        content = _read_file(path)
     count = _count_tokens_for_content(content, model, client)
     try:
         cache.put(md5_hex, model, count)
@@ -113,10 +354,13 @@ def cached_count_tokens_for_file(
     return count
 
 
-def get_default_cache() -> TokenCache:
-    """Create TokenCache at the default platform cache location."""
+def get_default_cache_engine() -> Engine:
+    """Create the engine for token_cache.db at the default platform location."""
     cache_dir = Path(platformdirs.user_cache_dir("edify"))
     cache_dir.mkdir(parents=True, exist_ok=True)
-    db_path = str(cache_dir / "token_cache.db")
-    engine = create_cache_engine(db_path)
-    return TokenCache(engine)
+    return create_cache_engine(str(cache_dir / "token_cache.db"))
+
+
+def get_default_cache() -> TokenCache:
+    """Create TokenCache at the default platform cache location."""
+    return TokenCache(get_default_cache_engine())
@@ -0,0 +1,208 @@
+"""Eviction, size limits and statistics for the token cache database.
+
+Entries are evicted least recently used first: those unused for longer
+than max_age_days, then the oldest beyond max_rows, then enough of the
+oldest to bring the database under max_bytes. File hashes whose content
+no longer has any cached count are dropped with them. Limits come from
+the [tokens.cache] table of the user config file.
+"""
+
+import logging
+from datetime import UTC, datetime, timedelta
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Integer, column, delete, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from edify.token_cache import CacheCounterEntry, FileHashEntry, TokenCacheEntry
+from edify.user_config import get_token_cache_config
+
+logger = logging.getLogger(__name__)
+
+
+class CacheLimits(BaseModel):
+    """Eviction limits; None disables a limit."""
+
+    max_age_days: float | None = 90
+    max_rows: int | None = 100_000
+    max_bytes: int | None = None
+
+
+class CacheStats(BaseModel):
+    """Size and effectiveness of the token cache."""
+
+    rows: int
+    models: int
+    file_hashes: int
+    size_bytes: int
+    hits: int
+    misses: int
+    oldest_use: datetime | None
+    newest_use: datetime | None
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Fraction of lookups answered from the cache, if any were made."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+class PruneResult(BaseModel):
+    """Outcome of a prune or clear."""
+
+    removed_rows: int
+    size_before: int
+    size_after: int
+
+
+def load_cache_limits() -> CacheLimits:
+    """Read limits from user config, falling back to defaults if invalid."""
+    try:
+        return CacheLimits.model_validate(get_token_cache_config())
+    except ValidationError as e:
+        logger.warning("Invalid [tokens.cache] config, using defaults: %s", e)
+        return CacheLimits()
+
+
+def _pragma(session: Session, statement: str) -> int:
+    return int(session.connection().exec_driver_sql(statement).scalar_one())
+
+
+def _size_bytes(session: Session, *, used_only: bool = False) -> int:
+    """Database size in bytes, optionally excluding free pages."""
+    pages = _pragma(session, "PRAGMA page_count")
+    if used_only:
+        pages -= _pragma(session, "PRAGMA freelist_count")
+    return pages * _pragma(session, "PRAGMA page_size")
+
+
+def _row_count(session: Session) -> int:
+    return session.scalar(select(func.count()).select_from(TokenCacheEntry)) or 0
+
+
+def _keep_newest(session: Session, rows: int) -> None:
+    """Delete every entry except the rows most recently used ones."""
+    # rowid IN (...) materializes the subquery once; a (md5_hex, model_id)
+    # NOT IN would rescan it for every row
+    rowid = column("rowid", Integer)
+    oldest = (
+        select(rowid)
+        .select_from(TokenCacheEntry)
+        .order_by(TokenCacheEntry.last_used.desc())
+        .offset(rows)
+    )
+    session.execute(delete(TokenCacheEntry).where(rowid.in_(oldest)))
+
+
+def _vacuum(engine: Engine) -> None:
+    """Rebuild the database file to return free pages to the filesystem."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM")
+
+
+def prune_cache(
+    engine: Engine, limits: CacheLimits, *, vacuum: bool = True
+) -> PruneResult:
+    """Evict least recently used entries until every limit holds.
+
+    The byte limit is approximate: rows are removed in proportion to the
+    space they use, and the file only shrinks once vacuumed.
+
+    Args:
+        engine: Token cache database engine
+        limits: Limits to enforce
+        vacuum: Whether to VACUUM afterwards
+
+    Returns:
+        Rows removed and database size before and after
+    """
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        size_before = _size_bytes(session)
+        rows_before = rows = _row_count(session)
+        if limits.max_age_days is not None:
+            cutoff = datetime.now(UTC) - timedelta(days=limits.max_age_days)
+            session.execute(
+                delete(TokenCacheEntry).where(TokenCacheEntry.last_used < cutoff)
+            )
+            rows = _row_count(session)
+        if limits.max_rows is not None and rows > limits.max_rows:
+            _keep_newest(session, limits.max_rows)
+        session.commit()
+        if limits.max_bytes is not None:
+            used = _size_bytes(session, used_only=True)
+            rows = _row_count(session)
+            if used > limits.max_bytes and rows:
+                _keep_newest(session, rows * limits.max_bytes // used)
+        session.execute(
+            delete(FileHashEntry).where(
+                FileHashEntry.md5_hex.not_in(select(TokenCacheEntry.md5_hex))
+            )
+        )
+        session.commit()
+        removed = rows_before - _row_count(session)
+    if vacuum:
+        _vacuum(engine)
+    with session_factory() as session:
+        size_after = _size_bytes(session)
+    return PruneResult(
+        removed_rows=removed, size_before=size_before, size_after=size_after
+    )
+
+
+def enforce_cache_limits(engine: Engine) -> None:
+    """Prune to the configured limits without vacuuming, logging failures.
+
+    Run after every counting run; freed pages are reused by later writes.
+    """
+    try:
+        prune_cache(engine, load_cache_limits(), vacuum=False)
+    except Exception:  # noqa: BLE001
+        logger.warning("Token cache eviction failed")
+
+
+def clear_cache(engine: Engine) -> PruneResult:
+    """Delete every entry, file hash and counter, then VACUUM."""
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        size_before = _size_bytes(session)
+        removed = _row_count(session)
+        for table in (TokenCacheEntry, FileHashEntry, CacheCounterEntry):
+            session.execute(delete(table))
+        session.commit()
+    _vacuum(engine)
+    with session_factory() as session:
+        size_after = _size_bytes(session)
+    return PruneResult(
+        removed_rows=removed, size_before=size_before, size_after=size_after
+    )
+
+
+def cache_stats(engine: Engine) -> CacheStats:
+    """Report row counts, database size and lifetime hit rate."""
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        models, oldest, newest = session.execute(
+            select(
+                func.count(func.distinct(TokenCacheEntry.model_id)),
+                func.min(TokenCacheEntry.last_used),
+                func.max(TokenCacheEntry.last_used),
+            )
+        ).one()
+        counters = dict(
+            session.execute(
+                select(CacheCounterEntry.name, CacheCounterEntry.value)
+            ).all()
+        )
+        return CacheStats(
+            rows=_row_count(session),
+            models=models,
+            file_hashes=session.scalar(select(func.count()).select_from(FileHashEntry))
+            or 0,
+            size_bytes=_size_bytes(session),
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            oldest_use=oldest,
+            newest_use=newest,
+        )
@@ -0,0 +1,212 @@
+"""Token count deltas between a git revision and the working tree.
+
+Files are read at the revision with a single ``git cat-file --batch``
+process and counted through the same content-hash cache as the working
+tree copies. The working tree is counted first, so a blob unchanged
+since the revision is already cached when the revision side is counted,
+and only changed blobs reach the API.
+
+Files deleted since the revision are found by listing each directory or
+glob argument's files at the revision with ``git ls-tree`` and selecting
+them as the argument would select working tree files.
+"""
+
+import hashlib
+import io
+import subprocess
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from anthropic import AsyncAnthropic
+from pydantic import BaseModel
+
+from edify.exceptions import FileReadError, GitRevisionError
+from edify.git import _git, read_blobs
+from edify.path_expansion import expansion_root, select_listed
+from edify.request_scheduler import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    RequestScheduler,
+)
+from edify.tokens import (
+    ModelId,
+    _count_contents_async,
+    _count_tokens_for_files_async,
+    run_counting,
+)
+
+if TYPE_CHECKING:
+    from edify.token_cache import TokenCache
+
+
+class TokenDelta(BaseModel):
+    """Token counts of one file at a revision and in the working tree."""
+
+    path: str
+    before: int | None  # None if the file did not exist at the revision
+    after: int | None  # None if the file was deleted since the revision
+
+    @property
+    def delta(self) -> int:
+        """Change in tokens since the revision."""
+        return (self.after or 0) - (self.before or 0)
+
+
+def _md5(content: str) -> str:
+    return hashlib.md5(content.encode()).hexdigest()  # noqa: S324
+
+
+def _decode_blob(blob: bytes) -> str:
+    """Decode blob as Path.read_text decodes the working tree copy.
+
+    Newlines are translated the same way, so a CRLF file unchanged since
+    the revision hashes equal on both sides and is counted once.
+    """
+    return io.TextIOWrapper(io.BytesIO(blob)).read()
+
+
+def _resolve_commit(rev: str, where: Path) -> tuple[Path, str]:
+    """Return the top of the repository containing where, and rev's commit."""
+    try:
+        top = Path(_git("rev-parse", "--show-toplevel", cwd=where))
+        commit = _git(
+            "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}", cwd=where
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise GitRevisionError(rev, "not a commit in this repository") from e
+    return top, commit
+
+
+def read_at_revision(rev: str, paths: Sequence[Path]) -> list[str | None]:
+    """Read paths as they were at rev; None for files absent there.
+
+    The repository is the one containing the first path.
+
+    Raises:
+        GitRevisionError: If rev is not a commit or paths are outside the repo
+        FileReadError: If a file at rev is not valid text
+    """
+    where = paths[0].resolve().parent if paths else Path.cwd()
+    top, commit = _resolve_commit(rev, where)
+    try:
+        relative = [path.resolve().relative_to(top).as_posix() for path in paths]
+    except ValueError as e:
+        raise GitRevisionError(rev, f"not all files are inside {top}") from e
+
+    texts: list[str | None] = []
+    for path, blob in zip(relative, read_blobs(commit, relative, top), strict=True):
+        try:
+            texts.append(None if blob is None else _decode_blob(blob))
+        except UnicodeDecodeError as e:
+            raise FileReadError(f"{rev}:{path}", str(e)) from e
+    return texts
+
+
+def _list_at_revision(rev: str, commit: str, top: Path, root: Path) -> list[Path]:
+    """List files under root at commit, relative to root."""
+    try:
+        prefix = root.resolve().relative_to(top)
+    except ValueError as e:
+        raise GitRevisionError(rev, f"{root} is not inside {top}") from e
+    output = subprocess.run(
+        ["git", "ls-tree", "-r", "-z", "--name-only", commit, "--", prefix.as_posix()],
+        cwd=top,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return [Path(name).relative_to(prefix) for name in output.split("\0") if name]
+
+
+def deleted_since(
+    rev: str,
+    args: Iterable[str],
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> list[Path]:
+    """Return files that directory and glob args select at rev but are gone.
+
+    Each argument's files at rev are selected with the same include and
+    exclude patterns expand_paths applies to the working tree. The
+    repository is the one containing the first such argument.
+
+    Raises:
+        GitRevisionError: If rev is not a commit or args are outside the repo
+    """
+    roots = {arg: root for arg in args if (root := expansion_root(arg)) is not None}
+    if not roots:
+        return []
+    top, commit = _resolve_commit(rev, next(iter(roots.values())).resolve())
+    deleted: dict[Path, None] = {}
+    for arg, root in roots.items():
+        listed = _list_at_revision(rev, commit, top, root)
+        selected = select_listed(arg, listed, include, exclude)
+        deleted.update(dict.fromkeys(p for p in selected if not p.exists()))
+    return list(deleted)
+
+
+async def _count_deltas_async(  # noqa: PLR0913, PLR0917
+    paths: list[Path],
+    old_texts: list[str | None],
+    model: ModelId,
+    client: AsyncAnthropic,
+    cache: TokenCache | None,
+    scheduler: RequestScheduler,
+) -> list[TokenDelta]:
+    """Count the working tree, then the revision's changed blobs.
+
+    A file missing from the working tree but present at the revision was
+    deleted; any other missing file is read, so that the error reports it.
+    """
+    deleted = [
+        text is not None and not path.exists()
+        for path, text in zip(paths, old_texts, strict=True)
+    ]
+    current = [path for path, gone in zip(paths, deleted, strict=True) if not gone]
+    after = iter(
+        await _count_tokens_for_files_async(current, model, client, cache, scheduler)
+    )
+    old = {_md5(text): text for text in old_texts if text is not None}
+    before = await _count_contents_async(old, model, client, cache, scheduler)
+    return [
+        TokenDelta(
+            path=str(path),
+            before=None if text is None else before[_md5(text)],
+            after=None if gone else next(after).count,
+        )
+        for path, text, gone in zip(paths, old_texts, deleted, strict=True)
+    ]
+
+
+def count_token_deltas(
+    paths: list[Path],
+    rev: str,
+    model: ModelId,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+) -> list[TokenDelta]:
+    """Count tokens in files now and at a git revision.
+
+    Args:
+        paths: Working tree files to compare, and files deleted since rev
+        rev: Git revision to compare against
+        model: Model to use for token counting
+        concurrency: Maximum API requests in flight at once
+        requests_per_minute: Sustained API request rate
+
+    Returns:
+        Per-file deltas, in input order
+
+    Raises:
+        GitRevisionError: If the files cannot be read at rev
+    """
+    old_texts = read_at_revision(rev, paths)
+    return run_counting(
+        lambda client, cache, scheduler: _count_deltas_async(
+            paths, old_texts, model, client, cache, scheduler
+        ),
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+    )
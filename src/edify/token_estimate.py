@@ -0,0 +1,189 @@
+"""Offline token estimation calibrated against cached exact counts.
+
+raw_estimate() approximates byte-pair tokenization by splitting text
+into the pieces a BPE vocabulary tends to keep whole: letter runs, short
+digit groups, symbol runs and line breaks. A per-model linear fit
+against exact counts already in token_cache.db corrects its bias, and
+the spread of that fit is reported as the error band. Nothing here
+touches the network.
+"""
+
+import logging
+import math
+import re
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from edify.exceptions import FileReadError
+from edify.token_cache import (
+    EstimatorCalibrationEntry,
+    FileHashEntry,
+    FileStat,
+    TokenCacheEntry,
+    stat_file,
+)
+from edify.tokens import _read_file
+
+logger = logging.getLogger(__name__)
+
+# Relative error of the uncalibrated heuristic on English prose and
+# Markdown; a rough default, replaced by the measured band once fitted
+DEFAULT_ERROR = 0.3
+MIN_CALIBRATION_SAMPLES = 5
+# Fraction of calibration samples the reported error band covers
+ERROR_QUANTILE = 0.9
+
+_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|\s+|[^\sA-Za-z\d]+")
+# Letters per extra token in long words and identifiers
+_WORD_CHARS_PER_TOKEN = 8
+# ASCII symbols merge in pairs ("**", "##", "->"); others are one each
+_SYMBOLS_PER_TOKEN = 2
+
+
+def raw_estimate(text: str) -> int:
+    """Approximate token count of text before calibration."""
+    total = 0
+    for piece in _PIECES.findall(text):
+        head = piece[0]
+        if head.isascii() and head.isalpha():
+            total += 1 + len(piece) // _WORD_CHARS_PER_TOKEN
+        elif head.isspace():
+            # A single space is absorbed by the following word
+            total += piece != " "
+        elif head.isdigit():
+            total += 1
+        else:
+            ascii_symbols = sum(char.isascii() for char in piece)
+            total += -(-ascii_symbols // _SYMBOLS_PER_TOKEN)
+            total += len(piece) - ascii_symbols
+    return total
+
+
+class Calibration(BaseModel):
+    """Linear correction of raw_estimate() for one model, with its error."""
+
+    model_id: str
+    scale: float = 1.0
+    offset: float = 0.0
+    error: float = DEFAULT_ERROR
+    samples: int = 0
+
+    def estimate(self, text: str) -> int:
+        """Estimated token count of text; 0 for empty text, like the API."""
+        if not text:
+            return 0
+        return max(round(self.scale * raw_estimate(text) + self.offset), 1)
+
+
+def fit_calibration(
+    model_id: str, samples: Iterable[tuple[int, int]]
+) -> Calibration | None:
+    """Fit exact ≈ scale * raw + offset by least squares.
+
+    Args:
+        model_id: Model the exact counts were made with
+        samples: (raw_estimate, exact count) pairs
+
+    Returns:
+        The calibration, or None with fewer than MIN_CALIBRATION_SAMPLES
+        usable samples
+    """
+    usable = [(raw, exact) for raw, exact in samples if raw > 0 and exact > 0]
+    if len(usable) < MIN_CALIBRATION_SAMPLES:
+        return None
+    n = len(usable)
+    mean_raw = sum(raw for raw, _ in usable) / n
+    mean_exact = sum(exact for _, exact in usable) / n
+    spread = sum((raw - mean_raw) ** 2 for raw, _ in usable)
+    covariance = sum((raw - mean_raw) * (exact - mean_exact) for raw, exact in usable)
+    scale = covariance / spread if spread else 0.0
+    offset = mean_exact - scale * mean_raw
+    if scale <= 0 or offset < 0:
+        # Too few or too similar files for an intercept; fit a ratio
+        scale = mean_exact / mean_raw
+        offset = 0.0
+    errors = sorted(abs((scale * raw + offset) / exact - 1) for raw, exact in usable)
+    error = errors[math.ceil(ERROR_QUANTILE * n) - 1]
+    return Calibration(
+        model_id=model_id, scale=scale, offset=offset, error=error, samples=n
+    )
+
+
+def _collect_samples(engine: Engine, model_id: str) -> list[tuple[int, int]]:
+    """Pair exact counts with raw estimates of files still unchanged on disk."""
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        rows = session.execute(
+            select(FileHashEntry, TokenCacheEntry.token_count)
+            .join(TokenCacheEntry, TokenCacheEntry.md5_hex == FileHashEntry.md5_hex)
+            .where(TokenCacheEntry.model_id == model_id)
+        ).all()
+    samples = []
+    for entry, count in rows:
+        recorded = FileStat(entry.path, entry.size, entry.mtime_ns, entry.inode)
+        try:
+            if stat_file(Path(entry.path)) == recorded:
+                samples.append((raw_estimate(_read_file(Path(entry.path))), count))
+        except FileReadError:
+            continue
+    return samples
+
+
+def calibrate_estimators(engine: Engine) -> list[Calibration]:
+    """Refit and store a calibration for every model with cached counts.
+
+    Models with too few unchanged files on disk keep their previous fit.
+    """
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        model_ids = session.scalars(select(TokenCacheEntry.model_id).distinct()).all()
+    fitted = []
+    for model_id in model_ids:
+        calibration = fit_calibration(model_id, _collect_samples(engine, model_id))
+        if calibration is None:
+            logger.info("Too few unchanged files to calibrate %s", model_id)
+        else:
+            fitted.append(calibration)
+    if fitted:
+        now = datetime.now(UTC)
+        statement = insert(EstimatorCalibrationEntry).values(
+            [{**c.model_dump(), "fitted_at": now} for c in fitted]
+        )
+        with session_factory() as session:
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[EstimatorCalibrationEntry.model_id],
+                    set_={
+                        name: statement.excluded[name]
+                        for name in ("scale", "offset", "error", "samples", "fitted_at")
+                    },
+                )
+            )
+            session.commit()
+    return fitted
+
+
+def load_calibration(engine: Engine, model: str) -> Calibration:
+    """Return the stored calibration for a model ID or alias.
+
+    An alias matches model IDs containing it, case-insensitively, and the
+    most recently fitted one wins. Falls back to the uncalibrated default.
+    """
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        entries = session.scalars(
+            select(EstimatorCalibrationEntry).order_by(
+                EstimatorCalibrationEntry.fitted_at.desc()
+            )
+        ).all()
+    for entry in entries:
+        if model.lower() in entry.model_id.lower():
+            return Calibration.model_validate(entry, from_attributes=True)
+    return Calibration(model_id=model)
@@ -0,0 +1,202 @@
+"""Per-section token counting for large Markdown files.
+
+Files are split at ATX headings outside fenced code blocks, and every
+section is counted and cached under its own content hash, so editing
+one section of a large file costs a single API request on the next
+count. Every count_tokens request also counts a fixed message framing
+overhead; it is measured once per model and subtracted from each
+section, so a file's sections add up to its count.
+"""
+
+import hashlib
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from anthropic import AsyncAnthropic
+from pydantic import BaseModel
+
+from edify.request_scheduler import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    RequestScheduler,
+)
+from edify.tokens import (
+    ModelId,
+    TokenCount,
+    _count_contents_async,
+    _read_file,
+    run_counting,
+)
+
+if TYPE_CHECKING:
+    from edify.token_cache import TokenCache
+
+_HEADING = re.compile(r" {0,3}#{1,6}(?:[ \t]|$)")
+_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})")
+# Single-token content; its count minus one is the framing overhead
+_PROBE = "x"
+
+
+@dataclass(frozen=True)
+class Section:
+    """A heading and the lines up to the next heading."""
+
+    heading: str  # Without the leading #s; "" before the first heading
+    line: int
+    content: str
+
+
+class SectionCount(BaseModel):
+    """Token count of one section, excluding request framing."""
+
+    heading: str
+    line: int
+    count: int
+
+
+class SectionedTokenCount(TokenCount):
+    """Token count for a file with its per-section breakdown."""
+
+    sections: list[SectionCount]
+
+
+def split_sections(text: str) -> list[Section]:
+    """Split Markdown at headings; the sections' contents concatenate to text.
+
+    Blank lines before the first heading belong to its section, since the
+    API rejects whitespace-only content.
+    """
+    sections: list[Section] = []
+    heading, start = "", 1
+    lines: list[str] = []
+    fence = ""
+    for number, line in enumerate(text.splitlines(keepends=True), start=1):
+        if match := _FENCE.match(line):
+            marker = match.group(1)
+            if not fence:
+                fence = marker
+            elif (
+                marker[0] == fence[0]
+                and len(marker) >= len(fence)
+                and not line[match.end() :].strip()
+            ):
+                fence = ""
+        elif not fence and _HEADING.match(line):
+            content = "".join(lines)
+            if content.strip():
+                sections.append(Section(heading, start, content))
+                lines = []
+            heading, start = line.strip().lstrip("#").strip(), number
+        lines.append(line)
+    if lines:
+        sections.append(Section(heading, start, "".join(lines)))
+    return sections
+
+
+def _md5(content: str) -> str:
+    return hashlib.md5(content.encode()).hexdigest()  # noqa: S324
+
+
+def _file_count(
+    path: Path, sections: list[Section], counts: Mapping[str, int]
+) -> SectionedTokenCount:
+    """Build a file's result once its sections and the probe are counted."""
+    overhead = max(counts[_md5(_PROBE)] - 1, 0)
+    section_counts = [
+        SectionCount(
+            heading=s.heading,
+            line=s.line,
+            count=max(counts[_md5(s.content)] - overhead, 0),
+        )
+        for s in sections
+    ]
+    total = sum(c.count for c in section_counts)
+    return SectionedTokenCount(
+        path=str(path),
+        count=total + overhead if sections else 0,
+        sections=section_counts,
+    )
+
+
+async def _count_sections_async(  # noqa: PLR0913
+    paths: list[Path],
+    model: ModelId,
+    client: AsyncAnthropic,
+    cache: TokenCache | None,
+    scheduler: RequestScheduler,
+    *,
+    on_result: Callable[[TokenCount], None] | None = None,
+) -> list[SectionedTokenCount]:
+    """Count every distinct section of paths once, concurrently.
+
+    on_result is called for each file as soon as all its sections and the
+    framing probe are counted.
+    """
+    split = [split_sections(_read_file(path)) for path in paths]
+    # A blank file is a single whitespace-only section; drop it so the
+    # file counts 0 without a request
+    split = [[s for s in sections if s.content.strip()] for sections in split]
+    contents = {_md5(s.content): s.content for sections in split for s in sections}
+    contents.setdefault(_md5(_PROBE), _PROBE)
+
+    known: dict[str, int] = {}
+    pending = [
+        {_md5(s.content) for s in sections} | {_md5(_PROBE)} for sections in split
+    ]
+    waiting: dict[str, list[int]] = {}
+    for index, hashes in enumerate(pending):
+        for md5_hex in hashes:
+            waiting.setdefault(md5_hex, []).append(index)
+
+    def emit(md5_hex: str, count: int) -> None:
+        known[md5_hex] = count
+        for index in waiting.pop(md5_hex, []):
+            pending[index].discard(md5_hex)
+            if not pending[index] and on_result is not None:
+                on_result(_file_count(paths[index], split[index], known))
+
+    counts = await _count_contents_async(
+        contents,
+        model,
+        client,
+        cache,
+        scheduler,
+        on_count=emit if on_result is not None else None,
+    )
+    return [
+        _file_count(path, sections, counts)
+        for path, sections in zip(paths, split, strict=True)
+    ]
+
+
+def count_sections_for_files(
+    paths: list[Path],
+    model: ModelId,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    on_result: Callable[[TokenCount], None] | None = None,
+) -> list[SectionedTokenCount]:
+    """Count tokens in files section by section, with caching.
+
+    Args:
+        paths: Markdown files to count
+        model: Model to use for token counting
+        concurrency: Maximum API requests in flight at once
+        requests_per_minute: Sustained API request rate
+        on_result: Called with each file's sectioned count as soon as it
+            is known, in completion order
+
+    Returns:
+        Per-file counts with sections in document order, in input order
+    """
+    return run_counting(
+        lambda client, cache, scheduler: _count_sections_async(
+            paths, model, client, cache, scheduler, on_result=on_result
+        ),
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+    )
@@ -1,11 +1,19 @@
 """Token counting functionality using Anthropic API."""
 
+import asyncio
+import hashlib
 import logging
-from datetime import UTC, datetime
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from pathlib import Path
-from typing import NewType
-
-from anthropic import Anthropic, APIError, AuthenticationError, RateLimitError
+from typing import TYPE_CHECKING
+
+from anthropic import (
+    Anthropic,
+    APIError,
+    AsyncAnthropic,
+    AuthenticationError,
+    RateLimitError,
+)
 from pydantic import BaseModel
 
 from edify.exceptions import (
@@ -13,28 +21,25 @@ from edify.exceptions import (
     ApiError,
     ApiRateLimitError,
     FileReadError,
-    ModelResolutionError,
+)
+from edify.model_aliases import (
+    CACHE_TTL_HOURS,
+    CacheData,
+    ModelId,
+    ModelInfo,
+    resolve_model_alias,
+)
+from edify.request_scheduler import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    RequestScheduler,
 )
 from edify.user_config import get_api_key
 
-logger = logging.getLogger(__name__)
-
-ModelId = NewType("ModelId", str)
-CACHE_TTL_HOURS = 24
-
-
-class ModelInfo(BaseModel):
-    """Model information stored in cache."""
-
-    id: str
-    created_at: datetime
-
-
-class CacheData(BaseModel):
-    """Cache file structure."""
+if TYPE_CHECKING:
+    from edify.token_cache import FileStat, TokenCache
 
-    fetched_at: datetime
-    models: list[ModelInfo]
+logger = logging.getLogger(__name__)
 
 
 class TokenCount(BaseModel):
@@ -44,93 +49,6 @@ class TokenCount(BaseModel):
     count: int
 
 
-def resolve_model_alias(model: str, client: Anthropic, cache_dir: Path) -> ModelId:
-    """Resolve model alias to full model ID.
-
-    If model starts with "claude-", check if it's a full ID (with date
-    suffix) and return. Otherwise, resolve via API or cache. Model alias
-    matching is case-insensitive.
-
-    Args:
-        model: Model alias or ID to resolve (case-insensitive)
-        client: Anthropic API client
-        cache_dir: Directory for caching model lists
-
-    Returns:
-        Resolved full model ID
-
-    Raises:
-        ModelResolutionError: If API is unreachable and model alias cannot be resolved
-    """
-    # Check if it's a full model ID with date suffix (last part is 8 digits)
-    if model.startswith("claude-"):
-        parts = model.split("-")
-        if parts[-1].isdigit() and len(parts[-1]) == 8:
-            # Full model ID with date suffix, return as-is
-            return ModelId(model)
-
-    # Try to load from cache if it's fresh (< 24 hours old)
-    cache_file = cache_dir / "models_cache.json"
-    if cache_file.exists():
-        try:
-            cache_data = CacheData.model_validate_json(cache_file.read_text())
-
-            # Check if cache is still fresh based on fetched_at timestamp
-            fetched_at = cache_data.fetched_at
-            age_seconds = datetime.now(tz=UTC).timestamp() - fetched_at.timestamp()
-
-            # Cache is valid if fetched_at is fresh (ignore file mtime)
-            if age_seconds < CACHE_TTL_HOURS * 3600:
-                models = cache_data.models
-
-                # Filter models containing the alias (case-insensitive)
-                matching_models = [m for m in models if model.lower() in m.id.lower()]
-
-                if matching_models:
-                    # Sort by created_at descending and return latest
-                    matching_models.sort(key=lambda m: m.created_at, reverse=True)
-                    return ModelId(matching_models[0].id)
-        except ValueError as e:
-            logger.warning(
-                "Corrupted cache file at %s, will refresh from API: %s",
-                cache_file,
-                e,
-            )
-
-    # Cache miss or expired - query API
-    try:
-        models_response = client.models.list()
-    except APIError as e:
-        raise ModelResolutionError(model) from e
-
-    # Convert API response to dict format
-    models_list = [
-        ModelInfo(
-            id=model_obj.id,
-            created_at=model_obj.created_at,
-        )
-        for model_obj in models_response
-    ]
-
-    # Write cache
-    try:
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_to_write = CacheData(fetched_at=datetime.now(tz=UTC), models=models_list)
-        cache_file.write_text(cache_to_write.model_dump_json())
-        logger.debug("Cached models list to %s", cache_file)
-    except OSError as e:
-        logger.warning("Failed to write cache at %s: %s", cache_file, e)
-
-    # Filter for matching models
-    matching_models = [m for m in models_list if model.lower() in m.id.lower()]
-
-    if matching_models:
-        matching_models.sort(key=lambda m: m.created_at, reverse=True)
-        return ModelId(matching_models[0].id)
-
-    return ModelId(model)
-
-
 def _count_tokens_for_content(content: str, model: ModelId, client: Anthropic) -> int:
     """Count tokens for already-read content via Anthropic API.
 
@@ -154,6 +72,14 @@ def _count_tokens_for_content(content: str, model: ModelId, client: Anthropic) -
     return response.input_tokens
 
 
+def _read_file(path: Path) -> str:
+    """Read path as text, raising FileReadError on failure."""
+    try:
+        return path.read_text()
+    except (PermissionError, OSError, UnicodeDecodeError) as e:
+        raise FileReadError(str(path), str(e)) from e
+
+
 def count_tokens_for_file(path: Path, model: ModelId, client: Anthropic) -> int:
     """Count tokens in a file using Anthropic API.
 
@@ -170,28 +96,177 @@ def count_tokens_for_file(path: Path, model: ModelId, client: Anthropic) -> int:
         ApiAuthenticationError: If API authentication fails
         ApiRateLimitError: If API rate limit is exceeded
     """
+    return _count_tokens_for_content(_read_file(path), model, client)
+
+
+async def _count_tokens_for_content_async(
+    content: str, model: ModelId, client: AsyncAnthropic, scheduler: RequestScheduler
+) -> int:
+    """Count tokens for already-read content through the request scheduler.
+
+    Returns 0 for empty content. Rate limits are retried by the scheduler
+    and only raise once its retries are exhausted.
+    """
+    if not content:
+        return 0
+
     try:
-        content = path.read_text()
-    except (PermissionError, OSError, UnicodeDecodeError) as e:
-        raise FileReadError(str(path), str(e)) from e
+        response = await scheduler.run(
+            lambda: client.messages.count_tokens(
+                model=model,
+                messages=[{"role": "user", "content": content}],
+            )
+        )
+    except AuthenticationError as e:
+        raise ApiAuthenticationError from e
+    except RateLimitError as e:
+        raise ApiRateLimitError from e
+    except APIError as e:
+        raise ApiError(str(e)) from e
 
-    return _count_tokens_for_content(content, model, client)
+    return response.input_tokens
 
 
-def count_tokens_for_files(paths: list[Path], model: ModelId) -> list[TokenCount]:
-    """Count tokens in multiple files using Anthropic API with caching.
+async def _count_contents_async(  # noqa: PLR0913
+    contents: Mapping[str, str],
+    model: ModelId,
+    client: AsyncAnthropic,
+    cache: TokenCache | None,
+    scheduler: RequestScheduler,
+    *,
+    file_hashes: Mapping[FileStat, str] | None = None,
+    on_count: Callable[[str, int], None] | None = None,
+) -> dict[str, int]:
+    """Count contents keyed by MD5 concurrently, answering cache hits directly.
+
+    Each content is sent to the API at most once, and on_count(md5, count)
+    is called for each as soon as its count is known. The first failure
+    cancels the requests still running. New counts and file_hashes are
+    stored in one transaction at the end, including counts that finished
+    before a failure.
+    """
+    from edify.token_cache import (  # noqa: PLC0415
+        lookup_cached_counts,
+        store_cached_counts,
+    )
+
+    counts = lookup_cached_counts(cache, contents, model) if cache is not None else {}
+    if on_count is not None:
+        for md5_hex, count in counts.items():
+            on_count(md5_hex, count)
+    tasks: dict[asyncio.Future[int], str] = {
+        asyncio.create_task(
+            _count_tokens_for_content_async(content, model, client, scheduler)
+        ): md5_hex
+        for md5_hex, content in contents.items()
+        if md5_hex not in counts
+    }
+    try:
+        async for task in asyncio.as_completed(tasks):
+            count = task.result()
+            if on_count is not None:
+                on_count(tasks[task], count)
+    finally:
+        # On failure, stop the remaining requests and retrieve every
+        # task's outcome so none is left with an unretrieved exception
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        new_counts = {
+            md5_hex: task.result()
+            for task, md5_hex in tasks.items()
+            if task.done() and not task.cancelled() and task.exception() is None
+        }
+        if cache is not None:
+            store_cached_counts(cache, model, new_counts, file_hashes)
+    return counts | new_counts
+
+
+async def _count_tokens_for_files_async(  # noqa: PLR0913
+    paths: list[Path],
+    model: ModelId,
+    client: AsyncAnthropic,
+    cache: TokenCache | None,
+    scheduler: RequestScheduler,
+    *,
+    on_result: Callable[[TokenCount], None] | None = None,
+) -> list[TokenCount]:
+    """Count tokens for paths concurrently, answering cache hits directly.
+
+    Files are stat'ed and looked up in the cache before any request is
+    queued, and only read and hashed if their stat or count is unknown.
+    on_result is called for each file as soon as its count is known.
+    """
+    from edify.token_cache import (  # noqa: PLC0415
+        lookup_cached_counts,
+        lookup_file_hashes,
+        stat_file,
+    )
+
+    stats = [stat_file(path) for path in paths]
+    known = lookup_file_hashes(cache, stats) if cache is not None else {}
+    counts = (
+        lookup_cached_counts(cache, known.values(), model) if cache is not None else {}
+    )
+
+    keys: list[str] = []
+    contents: dict[str, str] = {}
+    rehashed: dict[FileStat, str] = {}
+    waiting: dict[str, list[Path]] = {}
+    for path, stat in zip(paths, stats, strict=True):
+        md5_hex = known.get(stat.path)
+        if md5_hex is None or md5_hex not in counts:
+            content = _read_file(path)
+            md5_hex = hashlib.md5(content.encode()).hexdigest()  # noqa: S324
+            contents.setdefault(md5_hex, content)
+            if known.get(stat.path) != md5_hex:
+                rehashed[stat] = md5_hex
+            waiting.setdefault(md5_hex, []).append(path)
+        elif on_result is not None:
+            on_result(TokenCount(path=str(path), count=counts[md5_hex]))
+        keys.append(md5_hex)
+
+    def emit(md5_hex: str, count: int) -> None:
+        if on_result is not None:
+            for path in waiting.pop(md5_hex, []):
+                on_result(TokenCount(path=str(path), count=count))
+
+    counts |= await _count_contents_async(
+        contents,
+        model,
+        client,
+        cache,
+        scheduler,
+        file_hashes=rehashed,
+        on_count=emit,
+    )
+    return [
+        TokenCount(path=str(path), count=counts[key])
+        for path, key in zip(paths, keys, strict=True)
+    ]
 
-    Args:
-        paths: List of paths to count tokens for
-        model: Model to use for token counting
 
-    Returns:
-        List of TokenCount objects with per-file counts
+def run_counting[T](
+    count: Callable[
+        [AsyncAnthropic, TokenCache | None, RequestScheduler], Awaitable[T]
+    ],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+) -> T:
+    """Run an async counting job with an API client, cache and scheduler.
+
+    The cache is optional: if it cannot be opened, counting proceeds
+    uncached. Afterwards it is pruned to its configured limits.
+
+    Args:
+        count: Coroutine function taking the client, cache and scheduler
+        concurrency: Maximum API requests in flight at once
+        requests_per_minute: Sustained API request rate
     """
     api_key = get_api_key()
-    client = Anthropic(api_key=api_key) if api_key else Anthropic()
 
-    from edify.token_cache import cached_count_tokens_for_file, get_default_cache  # noqa: PLC0415, I001
+    from edify.token_cache import get_default_cache  # noqa: PLC0415
 
     cache = None
     try:
@@ -199,17 +274,58 @@ def count_tokens_for_files(paths: list[Path], model: ModelId) -> list[TokenCount
     except Exception:  # noqa: BLE001
         logger.warning("Token cache unavailable, falling back to uncached counting")
 
-    results = []
-    for path in paths:
-        if cache is not None:
-            count = cached_count_tokens_for_file(path, model, client, cache)
-        else:
-            count = count_tokens_for_file(path, model, client)
-        results.append(TokenCount(path=str(path), count=count))
-    return results
+    async def run() -> T:
+        # Retries are left to the scheduler, which paces every request
+        client = AsyncAnthropic(api_key=api_key, max_retries=0)
+        scheduler = RequestScheduler(concurrency, requests_per_minute)
+        async with client:
+            return await count(client, cache, scheduler)
+
+    result = asyncio.run(run())
+    if cache is not None:
+        from edify.token_cache_maintenance import (  # noqa: PLC0415
+            enforce_cache_limits,
+        )
+
+        enforce_cache_limits(cache.engine)
+    return result
+
+
+def count_tokens_for_files(
+    paths: list[Path],
+    model: ModelId,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    on_result: Callable[[TokenCount], None] | None = None,
+) -> list[TokenCount]:
+    """Count tokens in multiple files using Anthropic API with caching.
 
+    Cache misses are counted concurrently, up to concurrency requests in
+    flight and paced to requests_per_minute; rate-limited requests back
+    off and retry. The cache is then pruned to its configured limits.
 
-def calculate_total(results: list[TokenCount]) -> int:
+    Args:
+        paths: List of paths to count tokens for
+        model: Model to use for token counting
+        concurrency: Maximum API requests in flight at once
+        requests_per_minute: Sustained API request rate
+        on_result: Called with each file's count as soon as it is known,
+            in completion order
+
+    Returns:
+        List of TokenCount objects with per-file counts, in input order
+    """
+    return run_counting(
+        lambda client, cache, scheduler: _count_tokens_for_files_async(
+            paths, model, client, cache, scheduler, on_result=on_result
+        ),
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+    )
+
+
+def calculate_total(results: Sequence[TokenCount]) -> int:
     """Calculate total tokens across multiple file results.
 
     Args:
@@ -219,3 +335,18 @@ def calculate_total(results: list[TokenCount]) -> int:
         Sum of all token counts
     """
     return sum(result.count for result in results)
+
+
+# Re-export for backward compatibility
+__all__ = [
+    "CACHE_TTL_HOURS",
+    "CacheData",
+    "ModelId",
+    "ModelInfo",
+    "TokenCount",
+    "calculate_total",
+    "count_tokens_for_file",
+    "count_tokens_for_files",
+    "resolve_model_alias",
+    "run_counting",
+]
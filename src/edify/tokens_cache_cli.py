@@ -0,0 +1,117 @@
+"""CLI handlers for the tokens cache subcommands."""
+
+import json
+from typing import TYPE_CHECKING
+
+import click
+
+if TYPE_CHECKING:
+    from edify.token_cache_maintenance import PruneResult
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}" if unit != "B" else f"{size} B"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def _print_prune_result(result: PruneResult) -> None:
+    print(
+        f"Removed {result.removed_rows} entries; "
+        f"{_format_bytes(result.size_before)} -> {_format_bytes(result.size_after)}"
+    )
+
+
+@click.group("cache", help="Inspect and maintain the token count cache")
+def cache() -> None:
+    """Inspect and maintain the token count cache."""
+
+
+@cache.command("stats", help="Show cache size, row counts and hit rate")
+@click.option(
+    "--json", "json_output", is_flag=True, help="Output JSON format instead of text"
+)
+def cache_stats_command(*, json_output: bool) -> None:
+    """Print token cache statistics."""
+    from edify.token_cache import get_default_cache_engine  # noqa: PLC0415
+    from edify.token_cache_maintenance import cache_stats  # noqa: PLC0415
+
+    stats = cache_stats(get_default_cache_engine())
+    if json_output:
+        print(json.dumps({**stats.model_dump(mode="json"), "hit_rate": stats.hit_rate}))
+        return
+    hit_rate = "n/a" if stats.hit_rate is None else f"{stats.hit_rate:.1%}"
+    print(f"Entries: {stats.rows} ({stats.models} models)")
+    print(f"File hashes: {stats.file_hashes}")
+    print(f"Size: {_format_bytes(stats.size_bytes)}")
+    print(f"Hit rate: {hit_rate} ({stats.hits} hits, {stats.misses} misses)")
+    if stats.oldest_use is not None and stats.newest_use is not None:
+        print(f"Last used: {stats.oldest_use:%Y-%m-%d} to {stats.newest_use:%Y-%m-%d}")
+
+
+@cache.command("prune", help="Evict old and least recently used entries, then VACUUM")
+@click.option(
+    "--max-age-days",
+    type=click.FloatRange(min=0),
+    help="Evict entries unused for longer than this [default: from config, 90]",
+)
+@click.option(
+    "--max-rows",
+    type=click.IntRange(min=0),
+    help="Keep at most this many entries [default: from config, 100000]",
+)
+@click.option(
+    "--max-bytes",
+    type=click.IntRange(min=0),
+    help="Approximate database size limit [default: from config, none]",
+)
+@click.option("--no-vacuum", is_flag=True, help="Skip compacting the database file")
+def cache_prune_command(
+    max_age_days: float | None,
+    max_rows: int | None,
+    max_bytes: int | None,
+    *,
+    no_vacuum: bool,
+) -> None:
+    """Prune the token cache to the given or configured limits."""
+    from edify.token_cache import get_default_cache_engine  # noqa: PLC0415
+    from edify.token_cache_maintenance import (  # noqa: PLC0415
+        load_cache_limits,
+        prune_cache,
+    )
+
+    overrides = {
+        "max_age_days": max_age_days,
+        "max_rows": max_rows,
+        "max_bytes": max_bytes,
+    }
+    limits = load_cache_limits().model_copy(
+        update={k: v for k, v in overrides.items() if v is not None}
+    )
+    result = prune_cache(get_default_cache_engine(), limits, vacuum=not no_vacuum)
+    _print_prune_result(result)
+
+
+@cache.command("clear", help="Delete every cache entry and compact the database")
+def cache_clear_command() -> None:
+    """Empty the token cache."""
+    from edify.token_cache import get_default_cache_engine  # noqa: PLC0415
+    from edify.token_cache_maintenance import clear_cache  # noqa: PLC0415
+
+    _print_prune_result(clear_cache(get_default_cache_engine()))
+
+
+@cache.command("calibrate", help="Fit the --estimate heuristic to cached exact counts")
+def cache_calibrate_command() -> None:
+    """Refit offline estimators from files whose exact counts are cached."""
+    from edify.token_cache import get_default_cache_engine  # noqa: PLC0415
+    from edify.token_estimate import calibrate_estimators  # noqa: PLC0415
+
+    calibrations = calibrate_estimators(get_default_cache_engine())
+    if not calibrations:
+        print("Not enough unchanged files with cached counts to calibrate")
+    for c in calibrations:
+        print(f"{c.model_id}: ±{c.error:.0%} from {c.samples} files")
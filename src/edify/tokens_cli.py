@@ -3,8 +3,11 @@
 import json
 import os
 import sys
+from collections.abc import Sequence
+from functools import partial
 from pathlib import Path
 
+import click
 import platformdirs
 from anthropic import Anthropic, AuthenticationError
 
@@ -13,13 +16,26 @@ from edify.exceptions import (
     ApiRateLimitError,
     ClaudeUtilsError,
 )
+from edify.path_expansion import expand_paths
+from edify.request_scheduler import DEFAULT_CONCURRENCY, DEFAULT_REQUESTS_PER_MINUTE
+from edify.token_sections import (
+    SectionCount,
+    SectionedTokenCount,
+    count_sections_for_files,
+)
 from edify.tokens import (
+    TokenCount,
+    _read_file,
     calculate_total,
     count_tokens_for_files,
     resolve_model_alias,
 )
+from edify.tokens_cache_cli import cache
 from edify.user_config import get_api_key
 
+# Largest sections or files listed in text output; --json lists all
+_TOP_LISTED = 10
+
 
 def _resolve_api_key() -> str:
     """Resolve API key from env var or config file.
@@ -34,13 +50,143 @@ def _resolve_api_key() -> str:
     return api_key
 
 
-def handle_tokens(model: str, files: list[str], *, json_output: bool = False) -> None:
+def handle_estimate(model: str, files: list[str], *, json_output: bool = False) -> None:
+    """Estimate token counts offline, with the calibration's error band.
+
+    Args:
+        model: Model alias or ID whose calibration to use
+        files: File paths to estimate tokens for
+        json_output: Whether to output JSON format
+    """
+    from edify.token_cache import get_default_cache_engine  # noqa: PLC0415
+    from edify.token_estimate import Calibration, load_calibration  # noqa: PLC0415
+
+    try:
+        calibration = load_calibration(get_default_cache_engine(), model)
+    except Exception:  # noqa: BLE001
+        calibration = Calibration(model_id=model)
+    try:
+        counts = [calibration.estimate(_read_file(Path(f))) for f in files]
+    except ClaudeUtilsError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    total = sum(counts)
+    if json_output:
+        output = {
+            "model": calibration.model_id,
+            "estimated": True,
+            "error": calibration.error,
+            "calibration_samples": calibration.samples,
+            "files": [
+                {"path": f, "count": c, **_band(c, calibration.error)}
+                for f, c in zip(files, counts, strict=True)
+            ],
+            "total": total,
+        }
+        print(json.dumps(output))
+        return
+    fitted = (
+        f"fitted on {calibration.samples} files"
+        if calibration.samples
+        else "uncalibrated, see 'edify tokens cache calibrate'"
+    )
+    print(f"Estimated for {calibration.model_id}: ±{calibration.error:.0%} ({fitted})")
+    for f, c in zip(files, counts, strict=True):
+        print(f"{f}: ~{c} tokens")
+    if len(counts) > 1:
+        print(f"Total: ~{total} tokens")
+
+
+def _band(count: int, error: float) -> dict[str, int]:
+    return {"low": round(count * (1 - error)), "high": round(count * (1 + error))}
+
+
+def _by_size(result: SectionedTokenCount) -> list[SectionCount]:
+    return sorted(result.sections, key=lambda s: s.count, reverse=True)
+
+
+def _largest(results: Sequence[TokenCount]) -> list[TokenCount]:
+    return sorted(results, key=lambda r: r.count, reverse=True)[:_TOP_LISTED]
+
+
+def _file_json(result: TokenCount, *, sections: bool = True) -> dict[str, object]:
+    output: dict[str, object] = {"path": result.path, "count": result.count}
+    if sections and isinstance(result, SectionedTokenCount):
+        output["sections"] = [s.model_dump() for s in _by_size(result)]
+    return output
+
+
+def _print_top_sections(result: SectionedTokenCount) -> None:
+    ranked = _by_size(result)
+    for section in ranked[:_TOP_LISTED]:
+        heading = section.heading or "(before first heading)"
+        print(f"  {section.count:>8}  {heading} (line {section.line})")
+    if len(ranked) > _TOP_LISTED:
+        print(f"  ... {len(ranked) - _TOP_LISTED} smaller sections")
+
+
+def _print_result(result: TokenCount, *, ndjson: bool) -> None:
+    """Print one file's count as soon as it is known."""
+    if ndjson:
+        print(json.dumps(_file_json(result)), flush=True)
+        return
+    print(f"{result.path}: {result.count} tokens", flush=True)
+    if isinstance(result, SectionedTokenCount):
+        _print_top_sections(result)
+
+
+def _print_summary(
+    model: str, results: Sequence[TokenCount], *, json_output: bool, ndjson: bool
+) -> None:
+    """Print all results as JSON, or the largest files and the total."""
+    total = calculate_total(results)
+    if json_output:
+        output = {
+            "model": model,
+            "files": [_file_json(r) for r in results],
+            "total": total,
+        }
+        print(json.dumps(output))
+    elif ndjson:
+        summary = {
+            "model": model,
+            "files": len(results),
+            "total": total,
+            "largest": [_file_json(r, sections=False) for r in _largest(results)],
+        }
+        print(json.dumps(summary))
+    elif len(results) > 1:
+        print("Largest:")
+        for result in _largest(results):
+            print(f"  {result.count:>8}  {result.path}")
+        print(f"Total: {total} tokens")
+
+
+def handle_tokens(  # noqa: PLR0913
+    model: str,
+    files: list[str],
+    *,
+    json_output: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    sections: bool = False,
+    ndjson: bool = False,
+    since: str | None = None,
+) -> None:
     """Handle the tokens subcommand.
 
+    Text and NDJSON results are printed as each file finishes, followed by
+    a summary of the largest files; JSON is printed once all are counted.
+
     Args:
         model: Model to use for token counting
         files: File paths to count tokens for
         json_output: Whether to output JSON format
+        concurrency: Maximum API requests in flight at once
+        requests_per_minute: Sustained API request rate
+        sections: Whether to count and report Markdown sections separately
+        ndjson: Whether to stream one JSON object per file, then a summary
+        since: Git revision to report per-file and total deltas against
     """
     try:
         api_key = _resolve_api_key()
@@ -55,28 +201,49 @@ def handle_tokens(model: str, files: list[str], *, json_output: bool = False) ->
         cache_dir = Path(platformdirs.user_cache_dir("edify"))
         resolved_model = resolve_model_alias(model, client, cache_dir)
 
-        results = count_tokens_for_files([Path(f) for f in file_paths], resolved_model)
+        paths = [Path(f) for f in file_paths]
+        stream = None if json_output else partial(_print_result, ndjson=ndjson)
+        if not json_output and not ndjson:
+            print(f"Using model: {resolved_model}", flush=True)
+        results: Sequence[TokenCount]
+        if since is not None:
+            from edify.token_diff import count_token_deltas  # noqa: PLC0415
+            from edify.tokens_diff_cli import print_deltas  # noqa: PLC0415
 
-        if json_output:
-            total = calculate_total(results)
-            output = {
-                "model": resolved_model,
-                "files": [{"path": r.path, "count": r.count} for r in results],
-                "total": total,
-            }
-            print(json.dumps(output))
+            deltas = count_token_deltas(
+                paths,
+                since,
+                resolved_model,
+                concurrency=concurrency,
+                requests_per_minute=requests_per_minute,
+            )
+            print_deltas(
+                resolved_model, since, deltas, json_output=json_output, ndjson=ndjson
+            )
+            return
+        if sections:
+            results = count_sections_for_files(
+                paths,
+                resolved_model,
+                concurrency=concurrency,
+                requests_per_minute=requests_per_minute,
+                on_result=stream,
+            )
         else:
-            print(f"Using model: {resolved_model}")
-            for i, result in enumerate(results):
-                print(f"{file_paths[i]}: {result.count} tokens")
-            if len(results) > 1:
-                total = calculate_total(results)
-                print(f"Total: {total} tokens")
+            results = count_tokens_for_files(
+                paths,
+                resolved_model,
+                concurrency=concurrency,
+                requests_per_minute=requests_per_minute,
+                on_result=stream,
+            )
+
+        _print_summary(resolved_model, results, json_output=json_output, ndjson=ndjson)
     except (AuthenticationError, ApiAuthenticationError) as e:
         print(f"Error: Authentication failed. {e}", file=sys.stderr)
         print(
             "Set ANTHROPIC_API_KEY or add [anthropic] api_key "
-            "to ~/.config/edify/config.toml",
+            "to ~/.config/edify/config.toml, or use --estimate to count offline",
             file=sys.stderr,
         )
         sys.exit(1)
@@ -86,3 +253,147 @@ def handle_tokens(model: str, files: list[str], *, json_output: bool = False) ->
     except ClaudeUtilsError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+
+
+class _TokensGroup(click.Group):
+    """Command group that runs count unless a subcommand is named first."""
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        """Route arguments to count unless they start with a subcommand or help.
+
+        A path named like a subcommand is counted after "--", which count
+        then reads as the end of its options.
+        """
+        if (
+            args
+            and args[0] not in self.commands
+            and args[0] not in ctx.help_option_names
+        ):
+            args = ["count", *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(
+    cls=_TokensGroup,
+    help="Count tokens in files (the default), or manage the token cache",
+)
+def tokens() -> None:
+    """Count tokens in files or manage the token cache."""
+
+
+@tokens.command(
+    "count",
+    help="Count tokens in files, directories or glob patterns using Anthropic API",
+    epilog=(
+        "Paths after '--' are never read as subcommands, so a file named "
+        "'count' or 'cache' is counted with 'edify tokens -- cache'. "
+        "Manage the token cache with 'edify tokens cache --help'."
+    ),
+)
+@click.option(
+    "--model",
+    default="sonnet",
+    show_default=True,
+    metavar="{haiku,sonnet,opus}",
+    help="Model to use for token counting",
+)
+@click.argument("files", nargs=-1, required=True, metavar="PATH...")
+@click.option(
+    "--include",
+    multiple=True,
+    metavar="PATTERN",
+    help="Files to count in directories (repeatable)  [default: *.md]",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    metavar="PATTERN",
+    help="Files or directories to skip in directories and globs (repeatable)",
+)
+@click.option(
+    "--json", "json_output", is_flag=True, help="Output JSON format instead of text"
+)
+@click.option(
+    "--ndjson",
+    is_flag=True,
+    help="Stream one JSON object per file as it finishes, then a summary",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Maximum API requests in flight at once",
+)
+@click.option(
+    "--requests-per-minute",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_REQUESTS_PER_MINUTE,
+    show_default=True,
+    help="Sustained API request rate; rate-limited requests back off and retry",
+)
+@click.option(
+    "--estimate",
+    is_flag=True,
+    help="Estimate locally without network access, reporting an error band",
+)
+@click.option(
+    "--sections",
+    is_flag=True,
+    help="Count Markdown sections separately, caching each; report the largest",
+)
+@click.option(
+    "--since",
+    metavar="REV",
+    help="Report per-file and total changes since a git revision",
+)
+def count(  # noqa: PLR0913
+    model: str,
+    files: tuple[str, ...],
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    *,
+    json_output: bool,
+    ndjson: bool,
+    concurrency: int,
+    requests_per_minute: float,
+    estimate: bool,
+    sections: bool,
+    since: str | None,
+) -> None:
+    """Count tokens in files via Anthropic API."""
+    if estimate and (sections or since or ndjson):
+        msg = "--sections, --since and --ndjson cannot be combined with --estimate"
+        raise click.UsageError(msg)
+    if sections and since:
+        msg = "--sections cannot be combined with --since"
+        raise click.UsageError(msg)
+    if json_output and ndjson:
+        msg = "--json cannot be combined with --ndjson"
+        raise click.UsageError(msg)
+    try:
+        expanded = expand_paths(files, include, exclude)
+        if since is not None:
+            from edify.token_diff import deleted_since  # noqa: PLC0415
+
+            expanded += deleted_since(since, files, include, exclude)
+        paths = [str(path) for path in expanded]
+    except ClaudeUtilsError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if estimate:
+        handle_estimate(model, paths, json_output=json_output)
+        return
+    handle_tokens(
+        model,
+        paths,
+        json_output=json_output,
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+        sections=sections,
+        ndjson=ndjson,
+        since=since,
+    )
+
+
+tokens.add_command(cache)
@@ -0,0 +1,68 @@
+"""Output of `edify tokens --since` token count deltas."""
+
+import json
+from collections.abc import Sequence
+
+from edify.token_diff import TokenDelta
+
+
+def _signed(delta: int) -> str:
+    return f"{delta:+d}"
+
+
+def _delta_json(delta: TokenDelta) -> dict[str, object]:
+    return {
+        "path": delta.path,
+        "before": delta.before,
+        "after": delta.after,
+        "delta": delta.delta,
+    }
+
+
+def print_deltas(
+    model: str,
+    rev: str,
+    deltas: Sequence[TokenDelta],
+    *,
+    json_output: bool = False,
+    ndjson: bool = False,
+) -> None:
+    """Print per-file and total token deltas since rev.
+
+    Text output lists changed files by the size of their change, largest
+    first, and leaves out unchanged ones; JSON and NDJSON list every file.
+
+    Args:
+        model: Resolved model the counts are for
+        rev: Revision the working tree was compared with
+        deltas: Per-file deltas, in input order
+        json_output: Whether to output one JSON document
+        ndjson: Whether to output one JSON object per file, then a summary
+    """
+    before = sum(d.before or 0 for d in deltas)
+    after = sum(d.after or 0 for d in deltas)
+    total = {"before": before, "after": after, "delta": after - before}
+    if json_output:
+        files = [_delta_json(d) for d in deltas]
+        print(json.dumps({"model": model, "since": rev, "files": files, **total}))
+        return
+    if ndjson:
+        for delta in deltas:
+            print(json.dumps(_delta_json(delta)))
+        summary = {"model": model, "since": rev, "files": len(deltas), **total}
+        print(json.dumps(summary))
+        return
+
+    changed = sorted(
+        (d for d in deltas if d.delta or None in {d.before, d.after}),
+        key=lambda d: abs(d.delta),
+        reverse=True,
+    )
+    print(f"Compared with {rev}:")
+    for delta in changed:
+        was = "new" if delta.before is None else delta.before
+        now = "deleted" if delta.after is None else delta.after
+        print(f"{delta.path}: {was} -> {now} ({_signed(delta.delta)})")
+    if unchanged := len(deltas) - len(changed):
+        print(f"{unchanged} unchanged files")
+    print(f"Total: {before} -> {after} tokens ({_signed(after - before)})")
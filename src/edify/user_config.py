@@ -6,6 +6,7 @@ Reads config from ~/.config/edify/config.toml (or platform equivalent).
 import logging
 import tomllib
 from pathlib import Path
+from typing import Any
 
 import platformdirs
 
@@ -15,20 +16,29 @@ CONFIG_DIR = Path(platformdirs.user_config_dir("edify"))
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 
 
+def _load_config() -> dict[str, Any]:
+    """Parse config.toml, returning {} if it is missing or unreadable."""
+    if not CONFIG_FILE.exists():
+        return {}
+
+    try:
+        return tomllib.loads(CONFIG_FILE.read_text())
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        logger.warning("Failed to read config %s: %s", CONFIG_FILE, e)
+        return {}
+
+
 def get_api_key() -> str | None:
     """Read Anthropic API key from user config file.
 
     Reads [anthropic] api_key from config.toml. Returns None if file doesn't
     exist, section is missing, or key is empty.
     """
-    if not CONFIG_FILE.exists():
-        return None
+    key = _load_config().get("anthropic", {}).get("api_key", "")
+    return key if key.strip() else None
 
-    try:
-        data = tomllib.loads(CONFIG_FILE.read_text())
-    except (OSError, tomllib.TOMLDecodeError) as e:
-        logger.warning("Failed to read config %s: %s", CONFIG_FILE, e)
-        return None
 
-    key = data.get("anthropic", {}).get("api_key", "")
-    return key if key.strip() else None
+def get_token_cache_config() -> dict[str, Any]:
+    """Read the [tokens.cache] table from the user config file."""
+    section = _load_config().get("tokens", {}).get("cache", {})
+    return section if isinstance(section, dict) else {}
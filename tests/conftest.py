@@ -3,10 +3,10 @@
 from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 from pytest_mock import MockerFixture
 
 from edify.token_cache import TokenCache, create_cache_engine
@@ -34,6 +34,21 @@ def clear_api_key(
     monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
 
 
+# Cache Isolation
+@pytest.fixture(autouse=True)
+def isolate_user_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Redirect the platform cache directory into tmp_path.
+
+    Keeps the persistent session index and other on-disk caches from touching
+    the real user cache during tests.
+    """
+    cache_dir = tmp_path / "user-cache"
+    monkeypatch.setattr(
+        "platformdirs.user_cache_dir", lambda *_args, **_kwargs: str(cache_dir)
+    )
+    return cache_dir
+
+
 # Project Directory Fixture
 @pytest.fixture
 def temp_project_dir(
@@ -99,7 +114,8 @@ def mock_anthropic_client(mocker: MockerFixture) -> Callable[..., Mock]:
 
     Returns function accepting token_count (int, default 5) or side_effect
     parameters. Creates mock with spec=Anthropic, patches
-    edify.tokens.Anthropic.
+    edify.tokens.Anthropic, and patches edify.tokens.AsyncAnthropic with
+    an async client whose count_tokens awaits the same mock.
     """
 
     def factory(
@@ -119,6 +135,12 @@ def mock_anthropic_client(mocker: MockerFixture) -> Callable[..., Mock]:
         mocker.patch(
             "edify.tokens.Anthropic", return_value=mock_client, autospec=True
         )
+        async_client = MagicMock(spec=AsyncAnthropic)
+        async_client.__aenter__.return_value = async_client
+        async_client.messages.count_tokens = AsyncMock(
+            side_effect=mock_client.messages.count_tokens
+        )
+        mocker.patch("edify.tokens.AsyncAnthropic", return_value=async_client)
         return mock_client
 
     return factory
@@ -189,7 +211,8 @@ def mock_token_counting(
     """Create factory fixture for mocking token counting in CLI tests.
 
     Accepts model_id (str) and counts (int or list). Patches resolve_model_alias
-    and count_tokens_for_file, and sets a fake API key for authentication.
+    and the async per-content counter, and sets a fake API key for
+    authentication.
     """
 
     def factory(
@@ -216,12 +239,12 @@ def mock_token_counting(
         # Handle both single count and list of counts
         if isinstance(counts, list):
             mocker.patch(
-                "edify.token_cache._count_tokens_for_content",
+                "edify.tokens._count_tokens_for_content_async",
                 side_effect=counts,
             )
         else:
             mocker.patch(
-                "edify.token_cache._count_tokens_for_content",
+                "edify.tokens._count_tokens_for_content_async",
                 return_value=counts,
             )
 
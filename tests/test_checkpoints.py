@@ -0,0 +1,150 @@
+"""Tests for incremental extraction with per-file byte-offset checkpoints."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from edify import checkpoints as checkpoints_module
+from edify.checkpoints import (
+    CheckpointSet,
+    CheckpointStore,
+    extract_file_incrementally,
+)
+from edify.cli import cli
+from edify.models import FeedbackRecord
+from edify.parsing import FEEDBACK_RULES_VERSION
+from edify.session_index import create_index_engine, get_default_engine
+
+SESSION_ID = "a1b2c3d4-1234-5678-9abc-def012345678"
+
+
+def _line(content: str, second: int) -> str:
+    return (
+        f'{{"type":"user","message":{{"content":"{content}"}},'
+        f'"timestamp":"2025-12-16T08:00:{second:02d}.000Z",'
+        f'"sessionId":"{SESSION_ID}","agentId":"agent-1"}}\n'
+    )
+
+
+def _contents(items: list[FeedbackRecord]) -> list[str]:
+    return [item.content for item in items]
+
+
+def _contents_json(output: str) -> list[str]:
+    return [item["content"] for item in json.loads(output)]
+
+
+def test_rerun_parses_only_appended_lines(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Second run resumes at the saved offset and keeps earlier items."""
+    path = tmp_path / "session.jsonl"
+    path.write_text(_line("First piece of feedback", 1))
+    checkpoints = CheckpointSet()
+    extract_file_incrementally(path, checkpoints, find_agent_id=True)
+    first_offset = path.stat().st_size
+
+    with path.open("a") as f:
+        f.write(_line("Second piece of feedback", 2))
+    spy = mocker.spy(checkpoints_module, "scan_feedback")
+    items, agent_id = extract_file_incrementally(path, checkpoints, find_agent_id=True)
+
+    assert spy.call_args.args[1] == first_offset
+    assert _contents(items) == ["First piece of feedback", "Second piece of feedback"]
+    assert agent_id == "agent-1"
+    assert checkpoints.updated[str(path)].offset == path.stat().st_size
+
+
+def test_partial_last_line_is_not_checkpointed(tmp_path: Path) -> None:
+    """A line without its newline is returned but parsed again next run."""
+    path = tmp_path / "session.jsonl"
+    complete = _line("Complete line of feedback", 1)
+    path.write_text(complete + _line("Line still being written", 2).rstrip("\n"))
+    checkpoints = CheckpointSet()
+
+    items, _ = extract_file_incrementally(path, checkpoints)
+    with path.open("a") as f:
+        f.write("\n")
+    rerun, _ = extract_file_incrementally(path, checkpoints)
+
+    assert _contents(items) == ["Complete line of feedback", "Line still being written"]
+    assert rerun == items
+
+
+def test_replaced_file_is_parsed_from_start(tmp_path: Path) -> None:
+    """A file rewritten with different content invalidates its checkpoint."""
+    path = tmp_path / "session.jsonl"
+    path.write_text(_line("Original feedback content", 1))
+    checkpoints = CheckpointSet()
+    extract_file_incrementally(path, checkpoints)
+
+    path.write_text(_line("Rewritten feedback content", 1) + _line("And more", 2))
+    items, _ = extract_file_incrementally(path, checkpoints)
+
+    assert _contents(items) == ["Rewritten feedback content", "And more"]
+
+
+def test_changed_rules_version_reextracts_from_start(
+    tmp_path: Path, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Checkpoints taken under other extraction rules are discarded."""
+    path = tmp_path / "session.jsonl"
+    path.write_text(_line("Feedback under the old rules", 1))
+    checkpoints = CheckpointSet()
+    extract_file_incrementally(path, checkpoints)
+
+    monkeypatch.setattr(
+        "edify.checkpoints.FEEDBACK_RULES_VERSION", FEEDBACK_RULES_VERSION + 1
+    )
+    spy = mocker.spy(checkpoints_module, "scan_feedback")
+    items, _ = extract_file_incrementally(path, checkpoints)
+
+    assert spy.call_args.args[1] == 0
+    assert _contents(items) == ["Feedback under the old rules"]
+
+
+def test_store_round_trip(tmp_path: Path) -> None:
+    """Saved checkpoints load back for the same history directory only."""
+    path = tmp_path / "history" / "session.jsonl"
+    path.parent.mkdir()
+    path.write_text(_line("Feedback worth keeping", 1))
+    checkpoints = CheckpointSet()
+    extract_file_incrementally(path, checkpoints)
+    store = CheckpointStore(create_index_engine(str(tmp_path / "index.db")))
+
+    store.save(path.parent, checkpoints.updated)
+
+    assert store.load(path.parent).saved == checkpoints.updated
+    assert store.load(tmp_path).saved == {}
+
+
+@pytest.fixture
+def history(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Session history for /work/proj under a temporary HOME."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    history_dir = tmp_path / ".claude" / "projects" / "-work-proj"
+    history_dir.mkdir(parents=True)
+    (history_dir / f"{SESSION_ID}.jsonl").write_text(_line("Keep tests fast", 1))
+    return history_dir
+
+
+def test_collect_uses_checkpoints_across_runs(history: Path) -> None:
+    """Collect output after an append matches a run without checkpoints."""
+    runner = CliRunner()
+    runner.invoke(cli, ["collect", "--project", "/work/proj"])
+    with (history / f"{SESSION_ID}.jsonl").open("a") as f:
+        f.write(_line("Prefer small commits", 2))
+
+    resumed = runner.invoke(cli, ["collect", "--project", "/work/proj"])
+    fresh = runner.invoke(
+        cli, ["collect", "--project", "/work/proj", "--no-checkpoints"]
+    )
+
+    assert resumed.exit_code == 0
+    assert resumed.output == fresh.output
+    assert _contents_json(resumed.output) == ["Keep tests fast", "Prefer small commits"]
+    saved = CheckpointStore(get_default_engine()).load(history).saved
+    assert list(saved) == [str(history / f"{SESSION_ID}.jsonl")]
@@ -0,0 +1,92 @@
+"""Tests for --all-projects across list, collect and extract."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from edify.cli import cli
+from edify.discovery import list_projects
+
+SESSION_ALPHA = "a1b2c3d4-1234-5678-9abc-def012345678"
+SESSION_APP = "e12d203f-ca65-44f0-9976-cb10b74514c1"
+SESSION_OLD = "0f0f0f0f-1111-2222-3333-444455556666"
+
+
+def _line(content: str, session_id: str, cwd: str | None) -> str:
+    cwd_field = f',"cwd":"{cwd}"' if cwd else ""
+    return (
+        f'{{"type":"user","message":{{"content":"{content}"}},'
+        f'"timestamp":"2025-12-16T08:00:00.000Z","sessionId":"{session_id}"'
+        f"{cwd_field}}}\n"
+    )
+
+
+@pytest.fixture
+def projects(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Three projects; one has no cwd and one has a dash in its path."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    root = tmp_path / ".claude" / "projects"
+    for encoded, session_id, cwd, content in [
+        ("-work-alpha", SESSION_ALPHA, "/work/alpha", "Alpha needs more tests"),
+        ("-work-my-app", SESSION_APP, "/work/my-app", "App should log errors"),
+        ("-work-old", SESSION_OLD, None, "Old project feedback"),
+    ]:
+        (root / encoded).mkdir(parents=True)
+        (root / encoded / f"{session_id}.jsonl").write_text(
+            _line(content, session_id, cwd)
+        )
+    return root
+
+
+def test_list_projects_decodes_from_cwd(projects: Path) -> None:
+    """Project paths come from cwd, falling back to naive decoding."""
+    assert [p.project_dir for p in list_projects()] == [
+        "/work/alpha",
+        "/work/my-app",
+        "/work/old",
+    ]
+
+
+def test_list_all_projects(projects: Path) -> None:
+    """Each session line is prefixed with its project path."""
+    result = CliRunner().invoke(cli, ["list", "--all-projects"])
+
+    assert result.output.splitlines() == [
+        "/work/alpha [a1b2c3d4] Alpha needs more tests",
+        "/work/my-app [e12d203f] App should log errors",
+        "/work/old [0f0f0f0f] Old project feedback",
+    ]
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_collect_all_projects_tags_items(projects: Path, jobs: str) -> None:
+    """Collect streams every project's feedback tagged with its project."""
+    result = CliRunner().invoke(
+        cli, ["collect", "--all-projects", "--jobs", jobs, "--format", "ndjson"]
+    )
+
+    items = [json.loads(line) for line in result.output.splitlines()]
+    assert [(item["project"], item["content"]) for item in items] == [
+        ("/work/alpha", "Alpha needs more tests"),
+        ("/work/my-app", "App should log errors"),
+        ("/work/old", "Old project feedback"),
+    ]
+
+
+def test_extract_all_projects_finds_session_anywhere(projects: Path) -> None:
+    """Extract resolves a prefix across projects and tags the output."""
+    result = CliRunner().invoke(cli, ["extract", "e12d", "--all-projects"])
+
+    assert [
+        (item["project"], item["content"]) for item in json.loads(result.output)
+    ] == [("/work/my-app", "App should log errors")]
+
+
+def test_extract_all_projects_unknown_prefix(projects: Path) -> None:
+    """Unknown prefixes fail the same way as single-project extract."""
+    result = CliRunner().invoke(cli, ["extract", "ffff", "--all-projects"])
+
+    assert result.exit_code == 1
+    assert "No session found with prefix 'ffff'" in result.output
@@ -30,7 +30,12 @@ def test_collect_single_session_with_feedback(
             )
         ]
 
-    def mock_extract(session_id: str, project_dir: str) -> list[FeedbackItem]:
+    def mock_extract(
+        session_id: str,
+        project_dir: str,
+        agent_graph: object = None,
+        checkpoints: object = None,
+    ) -> list[FeedbackItem]:
         return [feedback_item]
 
     monkeypatch.setattr("edify.cli.list_top_level_sessions", mock_list)
@@ -93,7 +98,12 @@ def test_collect_multiple_sessions(
         "session3": [feedback_3],
     }
 
-    def mock_extract(session_id: str, project_dir: str) -> list[FeedbackItem]:
+    def mock_extract(
+        session_id: str,
+        project_dir: str,
+        agent_graph: object = None,
+        checkpoints: object = None,
+    ) -> list[FeedbackItem]:
         return feedback_by_session.get(session_id, [])
 
     monkeypatch.setattr("edify.cli.list_top_level_sessions", mock_list)
@@ -152,7 +162,12 @@ def test_collect_with_subagents(
             )
         ]
 
-    def mock_extract(session_id: str, project_dir: str) -> list[FeedbackItem]:
+    def mock_extract(
+        session_id: str,
+        project_dir: str,
+        agent_graph: object = None,
+        checkpoints: object = None,
+    ) -> list[FeedbackItem]:
         # extract_feedback_recursively returns main + subagent feedback
         return [main_1, main_2, sub_1, sub_2]
 
@@ -196,7 +211,12 @@ def test_collect_skips_malformed_session(
             ),
         ]
 
-    def mock_extract(session_id: str, project_dir: str) -> list[FeedbackItem]:
+    def mock_extract(
+        session_id: str,
+        project_dir: str,
+        agent_graph: object = None,
+        checkpoints: object = None,
+    ) -> list[FeedbackItem]:
         if session_id == "session1":
             return [valid_feedback]
         # Simulate extraction error for malformed session
@@ -251,7 +271,12 @@ def test_collect_output_to_file(
             )
         ]
 
-    def mock_extract(session_id: str, project_dir: str) -> list[FeedbackItem]:
+    def mock_extract(
+        session_id: str,
+        project_dir: str,
+        agent_graph: object = None,
+        checkpoints: object = None,
+    ) -> list[FeedbackItem]:
         return [feedback_item]
 
     monkeypatch.setattr("edify.cli.list_top_level_sessions", mock_list)
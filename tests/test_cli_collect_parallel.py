@@ -0,0 +1,78 @@
+"""Tests for parallel collect across worker processes."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from edify.cli import cli
+from edify.extraction import _extract_session_worker
+
+SESSION_A = "a1b2c3d4-1234-5678-9abc-def012345678"
+SESSION_B = "e12d203f-ca65-44f0-9976-cb10b74514c1"
+
+
+def _user_line(content: str, timestamp: str, session_id: str, agent: str = "") -> str:
+    agent_field = f',"agentId":"{agent}"' if agent else ""
+    return (
+        f'{{"type":"user","message":{{"content":"{content}"}},'
+        f'"timestamp":"{timestamp}","sessionId":"{session_id}"{agent_field}}}\n'
+    )
+
+
+@pytest.fixture
+def real_history(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Create session history under a temporary HOME visible to workers."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    project = "/work/proj"
+    history = tmp_path / ".claude" / "projects" / "-work-proj"
+    history.mkdir(parents=True)
+    (history / f"{SESSION_A}.jsonl").write_text(
+        _user_line("Older session feedback", "2025-12-16T08:00:00.000Z", SESSION_A)
+    )
+    (history / f"{SESSION_B}.jsonl").write_text(
+        _user_line("Newer session feedback", "2025-12-16T10:00:00.000Z", SESSION_B)
+        + _user_line("Second newer feedback", "2025-12-16T10:30:00.000Z", SESSION_B)
+    )
+    (history / "agent-x1.jsonl").write_text(
+        _user_line("Agent feedback here", "2025-12-16T10:10:00.000Z", SESSION_B, "x1")
+    )
+    return project
+
+
+def test_collect_jobs_matches_serial_output(real_history: str) -> None:
+    """Parallel collect yields the same items in the same order as serial."""
+    runner = CliRunner()
+    serial = runner.invoke(cli, ["collect", "--project", real_history])
+    parallel = runner.invoke(cli, ["collect", "--project", real_history, "--jobs", "2"])
+
+    assert parallel.exit_code == 0
+    assert parallel.output == serial.output
+    contents = [item["content"] for item in json.loads(parallel.output)]
+    assert contents == [
+        "Newer session feedback",
+        "Agent feedback here",
+        "Second newer feedback",
+        "Older session feedback",
+    ]
+
+
+def test_collect_rejects_negative_jobs() -> None:
+    """--jobs must be zero (all cores) or a positive worker count."""
+    result = CliRunner().invoke(cli, ["collect", "--jobs", "-1"])
+    assert result.exit_code != 0
+
+
+def test_worker_captures_extraction_error() -> None:
+    """Worker returns the failure message instead of raising."""
+    session_id, feedback, error, checkpoints = _extract_session_worker(
+        ("main-123", "/nonexistent/path")
+    )
+
+    assert session_id == "main-123"
+    assert feedback == []
+    assert error is not None
+    assert "History directory not found" in error
+    assert checkpoints == {}
@@ -0,0 +1,137 @@
+"""Tests for NDJSON streaming between collect, extract, analyze and rules."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from edify.cli import cli
+from edify.feedback_io import read_feedback
+from edify.models import FeedbackItem, FeedbackType, SessionInfo
+
+
+def _item(content: str, second: int, session_id: str = "session1") -> FeedbackItem:
+    return FeedbackItem(
+        timestamp=f"2025-12-16T08:39:{second:02d}.000Z",
+        session_id=session_id,
+        feedback_type=FeedbackType.MESSAGE,
+        content=content,
+    )
+
+
+ITEMS = [
+    _item("Don't use global state in the parser module", 1),
+    _item("<command-name>/clear</command-name>", 2),
+    _item("Before you commit, run the full test suite", 3, "session2"),
+]
+
+
+@pytest.fixture
+def mock_sessions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Mock two sessions splitting ITEMS between them."""
+
+    def mock_list(project_dir: str) -> list[SessionInfo]:
+        return [
+            SessionInfo(session_id=sid, title=sid, timestamp="")
+            for sid in ("session1", "session2")
+        ]
+
+    def mock_extract(
+        session_id: str,
+        project_dir: str,
+        agent_graph: object = None,
+        checkpoints: object = None,
+    ) -> list[FeedbackItem]:
+        return [item for item in ITEMS if item.session_id == session_id]
+
+    monkeypatch.setattr("edify.cli.list_top_level_sessions", mock_list)
+    monkeypatch.setattr("edify.cli.extract_feedback_recursively", mock_extract)
+
+
+def test_collect_ndjson_writes_one_item_per_line(mock_sessions: None) -> None:
+    """--format ndjson emits one JSON object per line."""
+    result = CliRunner().invoke(cli, ["collect", "--format", "ndjson"])
+
+    lines = result.output.splitlines()
+    assert [json.loads(line)["content"] for line in lines] == [
+        item.content for item in ITEMS
+    ]
+
+
+def test_collect_ndjson_to_output_file(mock_sessions: None, tmp_path: Path) -> None:
+    """NDJSON output is streamed into the --output file."""
+    output_file = tmp_path / "feedback.ndjson"
+
+    result = CliRunner().invoke(
+        cli, ["collect", "--format", "ndjson", "--output", str(output_file)]
+    )
+
+    assert result.output == ""
+    assert len(output_file.read_text().splitlines()) == len(ITEMS)
+
+
+def test_extract_ndjson(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Extract supports the same ndjson format."""
+    monkeypatch.setattr(
+        "edify.cli.find_session_by_prefix", lambda prefix, project: "session1"
+    )
+    monkeypatch.setattr(
+        "edify.cli.extract_feedback_recursively", lambda sid, proj: ITEMS[:1]
+    )
+
+    result = CliRunner().invoke(cli, ["extract", "sess", "--format", "ndjson"])
+
+    assert json.loads(result.output)["content"] == ITEMS[0].content
+
+
+def test_analyze_accepts_ndjson_stream(mock_sessions: None) -> None:
+    """NDJSON from collect analyzes the same as JSON array input."""
+    runner = CliRunner()
+    json_input = runner.invoke(cli, ["collect"]).output
+    ndjson_input = runner.invoke(cli, ["collect", "--format", "ndjson"]).output
+
+    from_json = runner.invoke(
+        cli, ["analyze", "--input", "-", "--format", "json"], input=json_input
+    )
+    from_ndjson = runner.invoke(
+        cli, ["analyze", "--input", "-", "--format", "json"], input=ndjson_input
+    )
+
+    assert json.loads(from_ndjson.output) == json.loads(from_json.output)
+    assert json.loads(from_ndjson.output)["total"] == 3
+    assert json.loads(from_ndjson.output)["filtered"] == 2
+
+
+def test_rules_accepts_ndjson_file(tmp_path: Path) -> None:
+    """Rules reads NDJSON input files."""
+    input_file = tmp_path / "feedback.ndjson"
+    input_file.write_text("".join(item.model_dump_json() + "\n" for item in ITEMS))
+
+    result = CliRunner().invoke(cli, ["rules", "--input", str(input_file)])
+
+    assert result.output.splitlines() == [
+        f"1. {ITEMS[0].content}",
+        f"2. {ITEMS[2].content}",
+    ]
+
+
+def test_read_feedback_is_lazy(tmp_path: Path) -> None:
+    """NDJSON records are yielded before later lines are parsed."""
+    input_file = tmp_path / "feedback.ndjson"
+    input_file.write_text(ITEMS[0].model_dump_json() + "\n{not json\n")
+
+    items = read_feedback(str(input_file))
+
+    assert next(items).to_item() == ITEMS[0]
+    with pytest.raises(ValueError, match="Invalid JSON"):
+        next(items)
+
+
+def test_read_feedback_ignores_extra_keys(tmp_path: Path) -> None:
+    """Collect output with a project key reads back as plain records."""
+    input_file = tmp_path / "feedback.ndjson"
+    tagged = {**ITEMS[0].model_dump(mode="json"), "project": "/work/proj"}
+    input_file.write_text(json.dumps(tagged) + "\n")
+
+    assert [item.to_item() for item in read_feedback(str(input_file))] == ITEMS[:1]
@@ -24,7 +24,7 @@ def test_cli_model_is_optional(tmp_path: Path) -> None:
     test_file.write_text("Hello world")
 
     runner = CliRunner()
-    result = runner.invoke(cli, ["tokens", "--help"])
+    result = runner.invoke(cli, ["tokens", "count", "--help"])
 
     # Model should appear as an option with a default, not a required argument
     assert "--model" in result.output
@@ -192,9 +192,7 @@ def test_cli_auth_error_shows_helpful_message(
     test_file.write_text("Hello world")
 
     # Mock Anthropic() to raise AuthenticationError
-    mock_anthropic_class = mocker.patch(
-        "edify.tokens_cli.Anthropic", autospec=True
-    )
+    mock_anthropic_class = mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
     mock_anthropic_class.side_effect = AuthenticationError(
         "Invalid API key", response=Mock(), body={}
     )
@@ -230,16 +228,14 @@ def test_cli_rate_limit_error_shows_message(
     mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
 
     # Setup mocks with resolve returning model and count_tokens raising error
-    mock_resolve = mocker.patch(
-        "edify.tokens_cli.resolve_model_alias", autospec=True
-    )
+    mock_resolve = mocker.patch("edify.tokens_cli.resolve_model_alias", autospec=True)
     mock_resolve.return_value = "claude-sonnet-4-5-20250929"
     mocker.patch(
         "edify.token_cache.get_default_cache",
         return_value=TokenCache(create_cache_engine(":memory:")),
     )
     mock_count = mocker.patch(
-        "edify.token_cache._count_tokens_for_content", autospec=True
+        "edify.tokens._count_tokens_for_content_async", autospec=True
     )
     mock_count.side_effect = ApiRateLimitError()
     with pytest.raises(SystemExit) as exc_info:
@@ -330,9 +326,7 @@ def test_cli_detects_empty_api_key_before_sdk(
     mocker.patch("edify.tokens_cli.get_api_key", return_value=None)
     # Mock SDK components - should NOT be called
     mock_anthropic = mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
-    mock_resolve = mocker.patch(
-        "edify.tokens_cli.resolve_model_alias", autospec=True
-    )
+    mock_resolve = mocker.patch("edify.tokens_cli.resolve_model_alias", autospec=True)
 
     with pytest.raises(SystemExit) as exc_info:
         handle_tokens("sonnet", [str(test_file)])
@@ -368,9 +362,7 @@ def test_cli_detects_missing_api_key_before_sdk(
     mocker.patch("edify.tokens_cli.get_api_key", return_value=None)
     # Mock SDK components - should NOT be called
     mock_anthropic = mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
-    mock_resolve = mocker.patch(
-        "edify.tokens_cli.resolve_model_alias", autospec=True
-    )
+    mock_resolve = mocker.patch("edify.tokens_cli.resolve_model_alias", autospec=True)
 
     with pytest.raises(SystemExit) as exc_info:
         handle_tokens("haiku", [str(test_file)])
@@ -0,0 +1,45 @@
+"""Tests for routing tokens arguments between count and subcommands."""
+
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from edify.cli import cli
+
+
+def test_group_help_lists_subcommands() -> None:
+    """Tokens --help shows the group's subcommands, not count's help."""
+    result = CliRunner().invoke(cli, ["tokens", "--help"])
+
+    assert result.exit_code == 0
+    assert "cache" in result.output
+    assert "count" in result.output
+    assert "--model" not in result.output
+
+
+def test_paths_default_to_count(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Arguments not starting with a subcommand are counted."""
+    (tmp_path / "notes.md").write_text("Hello world")
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(cli, ["tokens", "notes.md", "--estimate"])
+
+    assert result.exit_code == 0, result.output
+    assert "notes.md" in result.output
+
+
+@pytest.mark.parametrize("name", ["count", "cache"])
+def test_counts_file_named_like_subcommand(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str
+) -> None:
+    """Paths after -- are counted even when named like a subcommand."""
+    (tmp_path / name).write_text("Hello world")
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(cli, ["tokens", "--estimate", "--", name])
+
+    assert result.exit_code == 0, result.output
+    assert name in result.output
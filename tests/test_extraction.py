@@ -3,7 +3,10 @@
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
+from edify import discovery
+from edify.discovery import AgentGraph
 from edify.extraction import extract_feedback_recursively
 
 # temp_history_dir fixture is provided by conftest.py
@@ -131,3 +134,44 @@ def test_extract_recursive_nested_agents(
     assert result[0].content == "Main message"
     assert result[1].content == "Agent 1 message"
     assert result[2].content == "Agent 2 message"
+
+
+def test_extract_recursive_shares_agent_graph(
+    temp_history_dir: tuple[Path, Path], mocker: MockerFixture
+) -> None:
+    """A shared agent graph scans the history directory once for all sessions."""
+    project, history_dir = temp_history_dir
+    for session_id, agent_id in (("main-1", "a1"), ("main-2", "a2")):
+        (history_dir / f"{session_id}.jsonl").write_text(
+            f'{{"type":"user","message":{{"content":"Main {session_id}"}},'
+            f'"timestamp":"2025-12-16T10:00:00.000Z","sessionId":"{session_id}"}}\n'
+        )
+        (history_dir / f"agent-{agent_id}.jsonl").write_text(
+            f'{{"type":"user","sessionId":"{session_id}","agentId":"{agent_id}",'
+            f'"message":{{"content":"Agent {agent_id}"}},'
+            '"timestamp":"2025-12-16T10:05:00.000Z"}\n'
+        )
+    scan = mocker.spy(discovery, "scan_history_dir")
+    graph = AgentGraph(history_dir)
+
+    first = extract_feedback_recursively("main-1", str(project), graph)
+    second = extract_feedback_recursively("main-2", str(project), graph)
+
+    assert [item.content for item in first] == ["Main main-1", "Agent a1"]
+    assert [item.content for item in second] == ["Main main-2", "Agent a2"]
+    assert scan.call_count == 1
+
+
+def test_extract_recursive_tolerates_agent_cycle(
+    temp_history_dir: tuple[Path, Path],
+) -> None:
+    """An agent listed as its own parent is extracted once."""
+    project, history_dir = temp_history_dir
+    (history_dir / "agent-a1.jsonl").write_text(
+        '{"type":"user","sessionId":"a1","agentId":"a1",'
+        '"message":{"content":"Self-referencing agent"},'
+        '"timestamp":"2025-12-16T10:05:00.000Z"}\n'
+    )
+
+    result = extract_feedback_recursively("a1", str(project))
+    assert [item.content for item in result] == ["Self-referencing agent"]
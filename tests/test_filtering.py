@@ -1,6 +1,12 @@
 """Tests for the filtering module."""
 
-from edify.filtering import categorize_feedback, filter_feedback, is_noise
+from edify.filtering import (
+    categorize_feedback,
+    classify_content,
+    filter_feedback,
+    filter_rule_items,
+    is_noise,
+)
 from edify.models import FeedbackItem, FeedbackType
 
 
@@ -123,3 +129,51 @@ def test_filter_feedback_preserves_order() -> None:
     result = filter_feedback(items)
     assert result[0].content == "First feedback"
     assert result[1].content == "Second feedback"
+
+
+def test_classify_content_matches_separate_checks() -> None:
+    """classify_content agrees with is_noise and categorize_feedback."""
+    contents = [
+        "<command-name>/clear</command-name>",
+        "short",
+        "Please review this refactored code",
+        "What's the next step in the plan",
+        "No, that is wrong",
+        "Always run the tests",
+        "Lorem ipsum dolor sit amet",
+    ]
+    for content in contents:
+        item = FeedbackItem(
+            timestamp="2025-01-01T00:00:00Z",
+            session_id="test-session",
+            feedback_type=FeedbackType.MESSAGE,
+            content=content,
+        )
+        expected = None if is_noise(content) else categorize_feedback(item)
+        assert classify_content(content) == expected
+
+
+def test_filter_rule_items_ignores_case_for_prefixes() -> None:
+    """Excluded prefixes and duplicate prefixes are matched case-insensitively."""
+    contents = [
+        "HOW do I run the tests again",
+        "Always run the full test suite",
+        "ALWAYS RUN THE FULL TEST SUITE",
+        "Never commit generated files",
+    ]
+    items = [
+        FeedbackItem(
+            timestamp=f"2025-01-01T00:00:0{n}Z",
+            session_id="test-session",
+            feedback_type=FeedbackType.MESSAGE,
+            content=content,
+        )
+        for n, content in enumerate(contents)
+    ]
+
+    result = filter_rule_items(items, min_length=10)
+
+    assert [item.content for item in result] == [
+        "Always run the full test suite",
+        "Never commit generated files",
+    ]
@@ -0,0 +1,59 @@
+"""Tests for the memory-mapped JSONL reader."""
+
+from pathlib import Path
+
+import pytest
+
+from edify.jsonl import first_line, iter_lines, iter_lines_reverse
+
+
+@pytest.fixture
+def jsonl_file(tmp_path: Path) -> Path:
+    """File with a blank line and no trailing newline."""
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(b'{"n":1}\n\n{"n":2}\n{"n":3}')
+    return path
+
+
+def test_iter_lines_keeps_blank_lines_and_last_line(jsonl_file: Path) -> None:
+    """Forward iteration yields every line so enumerate gives line numbers."""
+    assert list(iter_lines(jsonl_file)) == [b'{"n":1}', b"", b'{"n":2}', b'{"n":3}']
+
+
+def test_iter_lines_reverse(jsonl_file: Path) -> None:
+    """Reverse iteration yields the same lines last first."""
+    assert list(iter_lines_reverse(jsonl_file)) == [
+        b'{"n":3}',
+        b'{"n":2}',
+        b"",
+        b'{"n":1}',
+    ]
+
+
+def test_iter_lines_reverse_window(tmp_path: Path) -> None:
+    """A window limits reading to the file tail; the cut line is a fragment."""
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(b'{"n":1}\n{"n":2}\n{"n":3}\n')
+
+    assert list(iter_lines_reverse(path, window=12)) == [b'{"n":3}', b":2}"]
+
+
+def test_first_line(jsonl_file: Path) -> None:
+    """First line is returned without its newline."""
+    assert first_line(jsonl_file) == b'{"n":1}'
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    """Empty files cannot be mapped but read as having no lines."""
+    path = tmp_path / "empty.jsonl"
+    path.touch()
+
+    assert list(iter_lines(path)) == []
+    assert list(iter_lines_reverse(path)) == []
+    assert first_line(path) == b""
+
+
+def test_missing_file(tmp_path: Path) -> None:
+    """Missing files raise OSError on first use."""
+    with pytest.raises(OSError, match="No such file"):
+        next(iter_lines(tmp_path / "missing.jsonl"))
@@ -3,7 +3,8 @@
 import pytest
 from pydantic import ValidationError
 
-from edify.models import SessionInfo
+from edify.models import FeedbackItem, FeedbackRecord, FeedbackType, SessionInfo
+from edify.parsing import extract_record_from_entry
 
 from . import pytest_helpers as helpers
 
@@ -25,3 +26,31 @@ def test_session_info_validation() -> None:
     with pytest.raises(ValidationError):
         # Intentionally pass wrong types to test Pydantic validation
         SessionInfo(session_id=123, title="foo", timestamp="bar")  # type: ignore[arg-type]
+
+
+def test_feedback_record_round_trip() -> None:
+    """Records convert to dicts, back again and into validated items."""
+    fields = {
+        "timestamp": "2025-12-16T08:39:26.932Z",
+        "session_id": helpers.SESSION_ID_MAIN,
+        "feedback_type": FeedbackType.TOOL_DENIAL,
+        "content": "Do not delete that file",
+        "tool_use_id": "toolu_1",
+    }
+    record = FeedbackRecord.from_dict(fields)
+
+    assert FeedbackRecord.from_dict(record.to_dict()) == record
+    assert record.to_item() == FeedbackItem.model_validate(fields)
+
+
+def test_extract_record_validates_unexpected_types() -> None:
+    """Entries with non-string fields still raise ValidationError."""
+    entry = {
+        "type": "user",
+        "message": {"content": "Please keep the tests fast"},
+        "timestamp": 123,
+        "sessionId": helpers.SESSION_ID_MAIN,
+    }
+
+    with pytest.raises(ValidationError):
+        extract_record_from_entry(entry)
@@ -1,12 +1,16 @@
 """Tests for message parsing and feedback extraction."""
 
+from pathlib import Path
+
 import pytest
 from pydantic import ValidationError
 
 from edify.models import FeedbackItem, FeedbackType
 from edify.parsing import (
+    _extract_feedback_from_file,
     extract_feedback_from_entry,
     is_trivial,
+    may_be_user_entry,
 )
 
 from . import pytest_helpers as helpers
@@ -236,3 +240,31 @@ def test_extract_feedback_pydantic_validation_error() -> None:
     }
     with pytest.raises(ValidationError):
         extract_feedback_from_entry(entry)
+
+
+def test_may_be_user_entry_skips_only_impossible_lines() -> None:
+    """Prefilter rejects lines without "user" and keeps ambiguous ones."""
+    assert may_be_user_entry(b'{"type":"user","message":{}}') is True
+    assert may_be_user_entry(b'{"type": "user"}') is True
+    assert may_be_user_entry(b'{"type":"\\u0075ser"}') is True
+    assert may_be_user_entry(b'{"type":"assistant","userType":"external"}') is False
+    assert may_be_user_entry(b'{"type":"summary","summary":"user"}') is True
+
+
+def test_extract_from_file_matches_full_decode(tmp_path: Path) -> None:
+    """Prefiltered extraction finds user entries in any JSON spelling."""
+    session_file = tmp_path / "session.jsonl"
+    session_file.write_bytes(
+        b'{"type":"assistant","message":{"content":"Design the parser"}}\n'
+        b'{"type": "user", "message": {"content": "Use a state machine"}}\n'
+        b'{"type":"\\u0075ser","message":{"content":"Add error recovery"}}\n'
+        b"{not json\n"
+        b"\n"
+    )
+
+    feedback = _extract_feedback_from_file(session_file)
+
+    assert [item.content for item in feedback] == [
+        "Use a state machine",
+        "Add error recovery",
+    ]
@@ -0,0 +1,73 @@
+"""Tests for expanding directory and glob arguments into files."""
+
+from pathlib import Path
+
+import pytest
+
+from edify.exceptions import FileReadError
+from edify.path_expansion import expand_paths
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """Markdown and other files, including hidden and archive directories."""
+    for name in (
+        "a.md",
+        "notes.txt",
+        "sub/b.md",
+        "sub/deep/c.md",
+        "archive/old.md",
+        ".git/x.md",
+    ):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    return tmp_path
+
+
+def _names(paths: list[Path], root: Path) -> list[str]:
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_directory_expands_to_markdown_skipping_hidden(tree: Path) -> None:
+    """Directories yield *.md files at any depth, outside hidden dirs."""
+    assert _names(expand_paths([str(tree)]), tree) == [
+        "a.md",
+        "archive/old.md",
+        "sub/b.md",
+        "sub/deep/c.md",
+    ]
+
+
+def test_include_and_exclude_patterns(tree: Path) -> None:
+    """Include replaces the default; exclude prunes dirs and files."""
+    paths = expand_paths([str(tree)], include=["*.md", "*.txt"], exclude=["archive"])
+    assert _names(paths, tree) == ["a.md", "notes.txt", "sub/b.md", "sub/deep/c.md"]
+
+    paths = expand_paths([str(tree)], exclude=["sub/deep/*", "a.md"])
+    assert _names(paths, tree) == ["archive/old.md", "sub/b.md"]
+
+
+def test_glob_and_explicit_files_keep_order_once(tree: Path) -> None:
+    """Globs expand recursively; a file named twice is counted once."""
+    paths = expand_paths([str(tree / "a.md"), str(tree / "sub/**/*.md")])
+
+    assert _names(paths, tree) == ["a.md", "sub/b.md", "sub/deep/c.md"]
+    assert expand_paths([str(tree / "missing.md")]) == [tree / "missing.md"]
+
+
+def test_glob_without_matches_is_an_error(tree: Path) -> None:
+    """A pattern that matches nothing is reported rather than ignored."""
+    with pytest.raises(FileReadError, match="no files match"):
+        expand_paths([str(tree / "*.rst")])
+
+
+def test_exclude_matches_globs_like_directories(tree: Path) -> None:
+    """Exclude patterns match paths relative to the glob's literal base."""
+    directory = expand_paths([str(tree)], exclude=["sub/deep/*", "archive"])
+    globbed = expand_paths([str(tree / "**/*.md")], exclude=["sub/deep/*", "archive"])
+
+    assert _names(globbed, tree) == _names(directory, tree) == ["a.md", "sub/b.md"]
+    assert expand_paths([str(tree / "sub/**/*.md")], exclude=["deep"]) == [
+        tree / "sub/b.md"
+    ]
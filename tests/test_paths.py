@@ -4,7 +4,11 @@ from pathlib import Path
 
 import pytest
 
-from edify.paths import encode_project_path, get_project_history_dir
+from edify.paths import (
+    decode_project_path,
+    encode_project_path,
+    get_project_history_dir,
+)
 
 
 def test_encode_project_path_basic() -> None:
@@ -48,3 +52,9 @@ def test_get_project_history_dir_uses_encoding() -> None:
     result = get_project_history_dir(project)
     encoded = encode_project_path(project)
     assert result.name == encoded
+
+
+def test_decode_project_path() -> None:
+    """Decoding inverts encoding for paths without dashes."""
+    assert decode_project_path("-home-user-project") == "/home/user/project"
+    assert decode_project_path("-") == "/"
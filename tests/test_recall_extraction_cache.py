@@ -0,0 +1,178 @@
+"""Tests for the persistent cache of recall session extractions."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from edify.models import SessionInfo
+from edify.recall import extraction_cache
+from edify.recall.cli import _extract_session_data
+from edify.recall.extraction_cache import (
+    ExtractionSet,
+    ExtractionStore,
+    extract_session,
+    load_extractions,
+    save_extractions,
+)
+from edify.recall.index_parser import IndexEntry
+from edify.session_index import create_index_engine
+
+ENTRY = IndexEntry(
+    key="token cache eviction",
+    description="prune old rows",
+    referenced_file="agents/decisions/cache.md",
+    section="Caching",
+    keywords=frozenset({"token", "cache", "eviction", "prune"}),
+)
+
+
+def _user(prompt: str, session_id: str) -> str:
+    return json.dumps(
+        {"type": "user", "message": {"content": prompt}, "sessionId": session_id}
+    )
+
+
+def _assistant(session_id: str, tool_name: str, tool_input: dict[str, str]) -> str:
+    block = {
+        "type": "tool_use",
+        "id": f"toolu_{session_id}_{tool_name}",
+        "name": tool_name,
+        "input": tool_input,
+    }
+    return json.dumps(
+        {
+            "type": "assistant",
+            "message": {"content": [block]},
+            "timestamp": "2025-12-16T10:00:00.000Z",
+            "sessionId": session_id,
+        }
+    )
+
+
+def _session(history: Path, session_id: str, prompt: str) -> SessionInfo:
+    lines = [
+        _user(prompt, session_id),
+        _assistant(session_id, "Bash", {"command": "ls -la", "description": "list"}),
+        _assistant(session_id, "Read", {"file_path": "agents/decisions/cache.md"}),
+    ]
+    (history / f"{session_id}.jsonl").write_text("".join(f"{x}\n" for x in lines))
+    return SessionInfo(session_id=session_id, title=prompt, timestamp="2025-12-16")
+
+
+def test_rerun_reads_only_changed_sessions(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Unchanged sessions come from the cache; appended ones are read again.
+
+    Given: Two sessions extracted once into a cache
+    When: One session is appended to and recall data is extracted again
+    Then: Only that session is read, and results match an uncached run
+    """
+    sessions = [
+        _session(tmp_path, "s1", "Prune the token cache eviction"),
+        _session(tmp_path, "s2", "Unrelated question about fonts"),
+    ]
+    cache = ExtractionSet()
+    _extract_session_data(sessions, tmp_path, [ENTRY], 0.5, cache=cache)
+    assert sorted(cache.updated) == [
+        str(tmp_path / "s1.jsonl"),
+        str(tmp_path / "s2.jsonl"),
+    ]
+
+    with (tmp_path / "s2.jsonl").open("a") as f:
+        f.write(f"{_user('Now prune the token cache', 's2')}\n")
+    cache = ExtractionSet(saved=cache.updated)
+    scan = mocker.spy(extraction_cache, "scan_session")
+    cached = _extract_session_data(sessions, tmp_path, [ENTRY], 0.5, cache=cache)
+
+    assert [call.args[0].name for call in scan.call_args_list] == ["s2.jsonl"]
+    assert list(cache.updated) == [str(tmp_path / "s2.jsonl")]
+    assert cached == _extract_session_data(sessions, tmp_path, [ENTRY], 0.5)
+    assert list(cached[1]) == ["s1", "s2"]
+
+
+def test_threshold_change_reuses_cached_extractions(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Scoring runs on cached topics, so a new threshold reads no files."""
+    sessions = [_session(tmp_path, "s1", "Prune the token cache eviction")]
+    cache = ExtractionSet()
+    _, strict = _extract_session_data(sessions, tmp_path, [ENTRY], 1.1, cache=cache)
+    scan = mocker.spy(extraction_cache, "scan_session")
+
+    _, relevant = _extract_session_data(
+        sessions, tmp_path, [ENTRY], 0.5, cache=ExtractionSet(saved=cache.updated)
+    )
+
+    assert scan.call_count == 0
+    assert strict == {}
+    assert [score.entry_key for score in relevant["s1"]] == [ENTRY.key]
+
+
+def test_touched_file_is_read_again(tmp_path: Path) -> None:
+    """A changed mtime invalidates the cached extraction."""
+    session_file = tmp_path / "s1.jsonl"
+    _session(tmp_path, "s1", "Prune the token cache eviction")
+    cache = ExtractionSet(saved={str(session_file): extract_session(session_file)})
+    assert cache.get(session_file) is not None
+
+    st = session_file.stat()
+    os.utime(session_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(session_file) is None
+    assert cache.get(tmp_path / "missing.jsonl") is None
+
+
+def test_store_round_trip_keeps_only_path_inputs(tmp_path: Path) -> None:
+    """Stored tool calls keep their file path but no other tool input."""
+    session_file = tmp_path / "s1.jsonl"
+    _session(tmp_path, "s1", "Prune the token cache eviction")
+    store = ExtractionStore(create_index_engine(str(tmp_path / "index.db")))
+
+    store.save(tmp_path, {str(session_file): extract_session(session_file)})
+    loaded = store.load(tmp_path).get(session_file)
+
+    assert loaded is not None
+    assert [(tc.tool_name, tc.input) for tc in loaded.tool_calls] == [
+        ("Bash", {}),
+        ("Read", {"file_path": "agents/decisions/cache.md"}),
+    ]
+    assert {"prune", "token", "cache", "eviction"} <= loaded.topics
+    assert store.load(tmp_path / "other").saved == {}
+
+
+def test_default_store_saves_only_updated(tmp_path: Path) -> None:
+    """Extractions made during a run persist to the default store."""
+    session_file = tmp_path / "s1.jsonl"
+    _session(tmp_path, "s1", "Prune the token cache eviction")
+    save_extractions(tmp_path, ExtractionSet())
+    assert load_extractions(tmp_path).saved == {}
+
+    extraction = extract_session(session_file)
+    save_extractions(tmp_path, ExtractionSet(updated={str(session_file): extraction}))
+
+    assert load_extractions(tmp_path).get(session_file) == extraction
+
+
+@pytest.mark.parametrize(
+    "constant",
+    [
+        "edify.recall.extraction_cache.EXTRACTION_VERSION",
+        "edify.recall.extraction_cache.FEEDBACK_RULES_VERSION",
+    ],
+)
+def test_changed_extraction_version_is_a_cache_miss(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, constant: str
+) -> None:
+    """Extractions stored by another version are not loaded."""
+    session_file = tmp_path / "s1.jsonl"
+    _session(tmp_path, "s1", "Prune the token cache eviction")
+    store = ExtractionStore(create_index_engine(str(tmp_path / "index.db")))
+    store.save(tmp_path, {str(session_file): extract_session(session_file)})
+
+    monkeypatch.setattr(constant, -1)
+
+    assert store.load(tmp_path).get(session_file) is None
@@ -0,0 +1,61 @@
+"""Tests for the per-session file access index."""
+
+import pytest
+
+from edify.recall.file_access import FileAccessIndex
+from edify.recall.tool_calls import ToolCall
+
+
+def _call(tool_name: str, path: str | None) -> ToolCall:
+    key = "file_path" if tool_name == "Read" else "path"
+    return ToolCall(
+        tool_name=tool_name,
+        tool_id=f"{tool_name}_{path}",
+        input={} if path is None else {key: path},
+        timestamp="2025-12-16T10:00:00.000Z",
+        session_id="session1",
+    )
+
+
+@pytest.mark.parametrize(
+    ("tool_file", "target", "matches"),
+    [
+        ("agents/decisions/cache.md", "agents/decisions/cache.md", True),
+        ("/home/u/proj/agents/cache.md", "agents/cache.md", True),
+        ("/home/u/proj/agents/cache.md", "proj/other.md", False),
+        ("agents/cache.md", "/home/u/proj/agents/cache.md", True),
+        ("cache.md", "/home/u/proj/agents/cache.md", True),
+        ("agents", "agents/decisions/cache.md", True),
+        ("/home/u/proj", "/home/u/proj/agents/cache.md", True),
+        ("/", "/home/u/proj/agents/cache.md", True),
+        ("agents/decisions.md", "agents/decisions.md/x.md", False),
+        ("agents", "/home/u/proj/agents/cache.md", False),
+        ("/home/u/proj/agents", "agents/cache.md", False),
+        ("agents/decisions", "agents/cache.md", False),
+    ],
+)
+def test_path_matching_rules(tool_file: str, target: str, *, matches: bool) -> None:
+    """Same path, absolute/relative suffix, or an extensionless parent match."""
+    access = FileAccessIndex([_call("Read", tool_file)])
+
+    assert (access.first_read(target) == 0) is matches
+
+
+def test_first_positions_per_tool_kind() -> None:
+    """Reads and searches are indexed separately, earliest call first."""
+    access = FileAccessIndex(
+        [
+            _call("Bash", None),
+            _call("Glob", "/proj/agents"),
+            _call("Read", "/proj/agents/a.md"),
+            _call("Grep", "agents/a.md"),
+            _call("Read", "agents/a.md"),
+            _call("Grep", None),
+        ]
+    )
+
+    assert access.first_read("agents/a.md") == 2
+    assert access.first_search("agents/a.md") == 3
+    assert access.first_search("/proj/agents/a.md") == 1
+    assert access.first_read("/proj/agents/b.md") is None
+    assert access.first_search("src/c.md") is None
@@ -0,0 +1,91 @@
+"""Tests for recall session analysis across worker processes."""
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from edify.cli import cli
+from edify.models import SessionInfo
+from edify.recall.cli import _extract_session_data
+from edify.recall.index_parser import IndexEntry
+
+ENTRIES = [
+    IndexEntry(
+        key="token cache eviction",
+        description="prune old rows",
+        referenced_file="agents/decisions/cache.md",
+        section="Caching",
+        keywords=frozenset({"token", "cache", "eviction", "prune"}),
+    ),
+    IndexEntry(
+        key="worktree merge",
+        description="resolve conflicts",
+        referenced_file="agents/decisions/git.md",
+        section="Git",
+        keywords=frozenset({"worktree", "merge", "conflicts"}),
+    ),
+]
+
+
+def _session(history: Path, session_id: str, prompt: str, read: str) -> SessionInfo:
+    user = {"type": "user", "message": {"content": prompt}, "sessionId": session_id}
+    assistant = {
+        "type": "assistant",
+        "message": {
+            "content": [
+                {
+                    "type": "tool_use",
+                    "id": f"toolu_{session_id}",
+                    "name": "Read",
+                    "input": {"file_path": read},
+                }
+            ]
+        },
+        "timestamp": "2025-12-16T10:00:00.000Z",
+        "sessionId": session_id,
+    }
+    (history / f"{session_id}.jsonl").write_text(
+        f"{json.dumps(user)}\n{json.dumps(assistant)}\n"
+    )
+    return SessionInfo(session_id=session_id, title=prompt, timestamp="2025-12-16")
+
+
+def test_parallel_analysis_matches_serial(tmp_path: Path) -> None:
+    """Worker processes produce the same results, in session order.
+
+    Given: Five sessions on different topics and one missing session file
+    When: Analyzed serially and with two worker processes
+    Then: Tool calls and relevant entries are identical, keyed in order
+    """
+    prompts = [
+        ("Prune the token cache eviction", "agents/decisions/cache.md"),
+        ("Fix the worktree merge conflicts", "src/merge.py"),
+        ("Token cache prune again", "README.md"),
+        ("Unrelated question about fonts", "fonts.md"),
+        ("Merge the worktree", "agents/decisions/git.md"),
+    ]
+    sessions = [
+        _session(tmp_path, f"s{i}", prompt, read)
+        for i, (prompt, read) in enumerate(prompts)
+    ]
+    sessions.insert(2, SessionInfo(session_id="gone", title="", timestamp=""))
+
+    serial = _extract_session_data(sessions, tmp_path, ENTRIES, 0.5)
+    parallel = _extract_session_data(sessions, tmp_path, ENTRIES, 0.5, jobs=2)
+
+    assert parallel == serial
+    sessions_data, relevant = parallel
+    assert list(sessions_data) == ["s0", "s1", "s2", "s3", "s4"]
+    assert list(relevant) == ["s0", "s1", "s2", "s4"]
+
+
+def test_recall_rejects_negative_jobs(tmp_path: Path) -> None:
+    """--jobs must be zero (all cores) or a positive worker count."""
+    index = tmp_path / "memory-index.md"
+    index.write_text("# Index\n")
+
+    result = CliRunner().invoke(cli, ["recall", "--index", str(index), "--jobs", "-1"])
+
+    assert result.exit_code != 0
+    assert "--jobs" in result.output
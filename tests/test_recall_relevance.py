@@ -3,9 +3,15 @@
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
+from edify.recall import relevance
 from edify.recall.index_parser import IndexEntry
-from edify.recall.relevance import find_relevant_entries, score_relevance
+from edify.recall.relevance import (
+    KeywordIndex,
+    find_relevant_entries,
+    score_relevance,
+)
 
 
 def test_score_relevance_exact_match() -> None:
@@ -208,3 +214,53 @@ def test_find_relevant_entries_no_entries() -> None:
     relevant = find_relevant_entries("session1", session_keywords, [], threshold=0.3)
 
     assert relevant == []
+
+
+def _vocabulary_entries(count: int) -> list[IndexEntry]:
+    """Entries with overlapping keyword sets drawn from a small vocabulary."""
+    words = [f"w{i}" for i in range(40)]
+    return [
+        IndexEntry(
+            key=f"entry {i}",
+            description="generated",
+            referenced_file=f"file{i % 7}.md",
+            section="Section",
+            keywords=frozenset(words[(i * 7 + j * 3) % 40] for j in range(1 + i % 5)),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.2, 0.5, 1.0])
+def test_keyword_index_matches_scoring_every_entry(threshold: float) -> None:
+    """The inverted index ranks exactly what exhaustive scoring ranks."""
+    entries = _vocabulary_entries(200)
+    index = KeywordIndex(entries)
+
+    for start in range(0, 40, 9):
+        session_keywords = {f"w{i}" for i in range(start, start + 6)}
+        exhaustive = [
+            score
+            for entry in entries
+            if (
+                score := score_relevance("s", session_keywords, entry, threshold)
+            ).is_relevant
+        ]
+        exhaustive.sort(key=lambda r: r.score, reverse=True)
+
+        assert index.find_relevant("s", session_keywords, threshold) == exhaustive
+
+
+def test_keyword_index_scores_only_entries_sharing_keywords(
+    mocker: MockerFixture,
+) -> None:
+    """Entries with no keyword in common with the session are never scored."""
+    entries = _vocabulary_entries(200)
+    index = KeywordIndex(entries)
+    spy = mocker.spy(relevance, "score_relevance")
+
+    relevant = index.find_relevant("s", {"w0", "w1"}, threshold=0.3)
+
+    sharing = [e for e in entries if e.keywords & {"w0", "w1"}]
+    assert relevant
+    assert spy.call_count <= len(sharing) < len(entries)
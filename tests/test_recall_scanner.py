@@ -0,0 +1,81 @@
+"""Tests for single-pass session scanning."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from pytest_mock import MockerFixture
+
+from edify.models import SessionInfo
+from edify.recall import scanner
+from edify.recall.cli import _extract_session_data
+from edify.recall.index_parser import IndexEntry
+from edify.recall.scanner import scan_session
+from edify.recall.tool_calls import ToolCallCollector
+from edify.recall.topics import TopicCollector
+
+USER_LINE = (
+    '{"type":"user","message":{"content":"Refactor the token cache eviction"},'
+    '"sessionId":"s1"}'
+)
+ASSISTANT_LINE = (
+    '{"type":"assistant","message":{"content":[{"type":"tool_use",'
+    '"id":"toolu_01","name":"Read","input":{"file_path":"/cache.md"}}]},'
+    '"timestamp":"2025-12-16T10:00:00.000Z","sessionId":"s1"}'
+)
+# Blank, malformed and non-object lines between the two entries
+SESSION = f"{USER_LINE}\n\nnot json\n[1, 2]\n{ASSISTANT_LINE}\n"
+
+
+class _TypeCounter:
+    """Custom collector counting entries by type."""
+
+    def __init__(self) -> None:
+        self.types: list[str] = []
+
+    def collect(self, entry: dict[str, Any], line_num: int, file_name: str) -> None:
+        self.types.append(f"{entry['type']}@{line_num}")
+
+
+def test_scan_decodes_each_line_once_for_all_collectors(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Every collector sees each object entry; each line is decoded once."""
+    session_file = tmp_path / "s1.jsonl"
+    session_file.write_text(SESSION)
+    loads = mocker.spy(json, "loads")
+    tool_calls, topics, custom = ToolCallCollector(), TopicCollector(), _TypeCounter()
+
+    assert scan_session(session_file, [tool_calls, topics, custom]) is True
+
+    assert loads.call_count == 4  # blank line skipped before decoding
+    assert [tc.tool_id for tc in tool_calls.sorted_calls()] == ["toolu_01"]
+    assert {"refactor", "token", "cache", "eviction"} <= topics.keywords
+    assert custom.types == ["user@1", "assistant@5"]
+
+
+def test_scan_reports_unreadable_file(tmp_path: Path) -> None:
+    """A missing file is reported as unreadable rather than raising."""
+    assert scan_session(tmp_path / "missing.jsonl", [TopicCollector()]) is False
+
+
+def test_extract_session_data_reads_each_session_once(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Recall analysis reads a session file once for tool calls and topics."""
+    (tmp_path / "s1.jsonl").write_text(SESSION)
+    read = mocker.spy(scanner, "iter_lines")
+    entry = IndexEntry(
+        key="token cache eviction",
+        description="Refactor token cache",
+        referenced_file="/cache.md",
+        section="Caching",
+        keywords=frozenset({"token", "cache", "eviction"}),
+    )
+    session = SessionInfo(session_id="s1", title="t", timestamp="2025-12-16")
+
+    sessions_data, relevant = _extract_session_data([session], tmp_path, [entry], 0.1)
+
+    assert read.call_count == 1
+    assert [tc.tool_name for tc in sessions_data["s1"]] == ["Read"]
+    assert [score.entry_key for score in relevant["s1"]] == [entry.key]
@@ -0,0 +1,211 @@
+"""Tests for concurrent, rate-limited token counting."""
+
+import asyncio
+import gc
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from anthropic import APIConnectionError, APIStatusError, RateLimitError
+from pytest_mock import MockerFixture
+
+from edify.exceptions import ApiError, ApiRateLimitError
+from edify.request_scheduler import RequestScheduler
+from edify.token_cache import TokenCache, create_cache_engine
+from edify.tokens import ModelId, _count_contents_async, count_tokens_for_files
+
+MODEL = ModelId("claude-sonnet-4-5-20250929")
+
+
+def _rate_limit_error(retry_after: str | None = None) -> RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    return RateLimitError("rate limited", response=Mock(headers=headers), body={})
+
+
+def _status_error(status_code: int) -> APIStatusError:
+    response = Mock(headers={}, status_code=status_code)
+    return APIStatusError(f"status {status_code}", response=response, body={})
+
+
+def test_scheduler_limits_requests_in_flight() -> None:
+    """No more than concurrency requests run at once."""
+    in_flight = peak = 0
+
+    async def request() -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    async def run() -> None:
+        scheduler = RequestScheduler(concurrency=3, requests_per_minute=60_000)
+        await asyncio.gather(*(scheduler.run(request) for _ in range(10)))
+
+    asyncio.run(run())
+
+    assert peak == 3
+
+
+def test_scheduler_retries_rate_limited_requests() -> None:
+    """A RateLimitError is retried after the retry-after delay."""
+    outcomes: list[RateLimitError | int] = [_rate_limit_error("0"), 7]
+
+    async def request() -> int:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, RateLimitError):
+            raise outcome
+        return outcome
+
+    async def run() -> int:
+        return await RequestScheduler().run(request)
+
+    assert asyncio.run(run()) == 7
+    assert outcomes == []
+
+
+def test_scheduler_gives_up_after_max_retries() -> None:
+    """The error propagates once every retry has been rate limited."""
+    attempts = 0
+
+    async def request() -> None:
+        nonlocal attempts
+        attempts += 1
+        raise _rate_limit_error()
+
+    async def run() -> None:
+        await RequestScheduler(max_retries=2, backoff_base=0).run(request)
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(run())
+    assert attempts == 3
+
+
+@pytest.mark.parametrize(
+    "make_error",
+    [
+        lambda: _status_error(500),
+        lambda: _status_error(529),
+        lambda: APIConnectionError(request=Mock()),
+    ],
+    ids=["server-error", "overloaded", "connection-error"],
+)
+def test_scheduler_retries_transient_errors(
+    make_error: Callable[[], Exception],
+) -> None:
+    """Server and connection errors are retried with backoff."""
+    outcomes: list[Exception | int] = [make_error(), make_error(), 7]
+
+    async def request() -> int:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def run() -> int:
+        return await RequestScheduler(backoff_base=0).run(request)
+
+    assert asyncio.run(run()) == 7
+    assert outcomes == []
+
+
+def test_scheduler_does_not_retry_client_errors() -> None:
+    """A 4xx other than a rate limit fails on the first attempt."""
+    attempts = 0
+
+    async def request() -> None:
+        nonlocal attempts
+        attempts += 1
+        raise _status_error(400)
+
+    async def run() -> None:
+        await RequestScheduler(backoff_base=0).run(request)
+
+    with pytest.raises(APIStatusError):
+        asyncio.run(run())
+    assert attempts == 1
+
+
+def test_failed_count_cancels_and_retrieves_other_requests() -> None:
+    """One failing request cancels the rest before the error propagates.
+
+    Given: Three contents, two failing at different times and one hanging
+    When: Counted concurrently
+    Then: The first error propagates with no request left running, and the
+        event loop reports no unretrieved task exceptions
+    """
+    unhandled: list[dict[str, object]] = []
+
+    async def count_tokens(**kwargs: object) -> Mock:
+        content = kwargs["messages"][0]["content"]  # type: ignore[index]
+        if content == "slow":
+            await asyncio.Event().wait()
+        await asyncio.sleep(0 if content == "first" else 0.01)
+        raise _status_error(400)
+
+    async def run() -> set[asyncio.Task[object]]:
+        asyncio.get_running_loop().set_exception_handler(
+            lambda _loop, context: unhandled.append(context)
+        )
+        client = Mock()
+        client.messages.count_tokens = count_tokens
+        contents = {"a": "first", "b": "second", "c": "slow"}
+        with pytest.raises(ApiError):
+            await _count_contents_async(
+                contents, MODEL, client, None, RequestScheduler(backoff_base=0)
+            )
+        left_running = asyncio.all_tasks() - {asyncio.current_task()}
+        await asyncio.sleep(0.02)
+        gc.collect()
+        return left_running
+
+    assert asyncio.run(run()) == set()
+    assert unhandled == []
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> list[Path]:
+    """Three files, the first and last with identical content."""
+    paths = [tmp_path / name for name in ("a.md", "b.md", "c.md")]
+    for path, content in zip(paths, ("same", "other", "same"), strict=True):
+        path.write_text(content)
+    return paths
+
+
+def test_count_tokens_serves_cache_hits_without_api(
+    files: list[Path], mocker: MockerFixture
+) -> None:
+    """Cached content is answered directly; other content is sent once."""
+    cache = TokenCache(create_cache_engine(":memory:"))
+    mocker.patch("edify.token_cache.get_default_cache", return_value=cache)
+    mocker.patch("edify.tokens.AsyncAnthropic")
+    counter = mocker.patch(
+        "edify.tokens._count_tokens_for_content_async", return_value=4
+    )
+    first = count_tokens_for_files(files, MODEL)
+    first_calls = counter.call_count
+    counter.reset_mock()
+
+    second = count_tokens_for_files(files, MODEL)
+
+    assert [r.count for r in first] == [4, 4, 4]
+    assert first_calls == 2
+    assert second == first
+    assert counter.call_count == 0
+
+
+def test_count_tokens_reports_exhausted_rate_limit(
+    files: list[Path], mocker: MockerFixture
+) -> None:
+    """Persistent rate limiting surfaces as ApiRateLimitError."""
+    mocker.patch(
+        "edify.token_cache.get_default_cache",
+        return_value=TokenCache(create_cache_engine(":memory:")),
+    )
+    client = mocker.patch("edify.tokens.AsyncAnthropic").return_value
+    client.__aenter__.return_value = client
+    client.messages.count_tokens = mocker.AsyncMock(side_effect=_rate_limit_error("0"))
+
+    with pytest.raises(ApiRateLimitError):
+        count_tokens_for_files(files, MODEL)
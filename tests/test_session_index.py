@@ -0,0 +1,126 @@
+"""Tests for the persistent session file index."""
+
+import os
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from edify import session_index
+from edify.session_index import (
+    STATUS_EMPTY,
+    STATUS_MALFORMED,
+    STATUS_OK,
+    SessionIndex,
+    create_index_engine,
+    scan_history_dir,
+)
+
+SESSION_LINE = (
+    '{"type":"user","message":{"content":"Fix the parser"},'
+    '"timestamp":"2025-12-16T10:00:00.000Z","sessionId":"main-123"}\n'
+)
+AGENT_LINE = (
+    '{"type":"user","message":{"content":"Sub task"},'
+    '"timestamp":"2025-12-16T10:05:00.000Z","sessionId":"main-123","agentId":"a1"}\n'
+)
+
+
+def _index(tmp_path: Path) -> SessionIndex:
+    return SessionIndex(create_index_engine(str(tmp_path / "index.db")))
+
+
+def test_scan_extracts_first_line_metadata(tmp_path: Path) -> None:
+    """Scan records title, timestamp, sessionId and agentId per file."""
+    history = tmp_path / "history"
+    history.mkdir()
+    (history / "main.jsonl").write_text(SESSION_LINE)
+    (history / "agent-a1.jsonl").write_text(AGENT_LINE)
+    (history / "agent-a2.jsonl").write_text("")
+    (history / "agent-a3.jsonl").write_text("{invalid")
+    (history / "notes.txt").write_text("ignored")
+
+    result = {f.path.name: f for f in _index(tmp_path).scan(history)}
+
+    assert sorted(result) == [
+        "agent-a1.jsonl",
+        "agent-a2.jsonl",
+        "agent-a3.jsonl",
+        "main.jsonl",
+    ]
+    assert result["main.jsonl"].status == STATUS_OK
+    assert result["main.jsonl"].title == "Fix the parser"
+    assert result["main.jsonl"].timestamp == "2025-12-16T10:00:00.000Z"
+    assert result["agent-a1.jsonl"].session_id == "main-123"
+    assert result["agent-a1.jsonl"].agent_id == "a1"
+    assert result["agent-a2.jsonl"].status == STATUS_EMPTY
+    assert result["agent-a3.jsonl"].status == STATUS_MALFORMED
+
+
+def test_scan_missing_directory(tmp_path: Path) -> None:
+    """Missing history directory yields no files."""
+    assert _index(tmp_path).scan(tmp_path / "missing") == []
+
+
+def test_rescan_reads_only_new_or_changed_files(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Unchanged files are served from the index without being opened."""
+    history = tmp_path / "history"
+    history.mkdir()
+    (history / "main.jsonl").write_text(SESSION_LINE)
+    agent = history / "agent-a1.jsonl"
+    agent.write_text("")
+    _index(tmp_path).scan(history)
+
+    # Grow the agent file and add a new session
+    agent.write_text(AGENT_LINE)
+    os.utime(agent, ns=(0, 1))
+    (history / "other.jsonl").write_text(SESSION_LINE)
+    spy = mocker.spy(session_index, "_read_metadata")
+
+    result = {f.path.name: f for f in _index(tmp_path).scan(history)}
+
+    reread = sorted(call.args[0].name for call in spy.call_args_list)
+    assert reread == ["agent-a1.jsonl", "other.jsonl"]
+    assert result["agent-a1.jsonl"].agent_id == "a1"
+    assert result["main.jsonl"].title == "Fix the parser"
+
+
+def test_rescan_drops_deleted_files(tmp_path: Path) -> None:
+    """Entries for deleted files are removed from the index."""
+    history = tmp_path / "history"
+    history.mkdir()
+    session_file = history / "main.jsonl"
+    session_file.write_text(SESSION_LINE)
+    index = _index(tmp_path)
+    index.scan(history)
+
+    session_file.unlink()
+
+    assert index.scan(history) == []
+
+
+def test_scan_history_dir_persists_in_user_cache(
+    tmp_path: Path, isolate_user_cache: Path
+) -> None:
+    """Default index is stored alongside the token cache."""
+    history = tmp_path / "history"
+    history.mkdir()
+    (history / "main.jsonl").write_text(SESSION_LINE)
+
+    result = scan_history_dir(history)
+
+    assert [f.title for f in result] == ["Fix the parser"]
+    assert (isolate_user_cache / "session_index.db").exists()
+
+
+def test_default_engine_is_shared_and_uses_wal(isolate_user_cache: Path) -> None:
+    """The default engine is created once and safe for concurrent processes."""
+    engine = session_index.get_default_engine()
+
+    with engine.connect() as conn:
+        journal = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+
+    assert journal == "wal"
+    assert session_index.get_default_engine() is engine
+    assert (isolate_user_cache / "session_index.db").exists()
@@ -0,0 +1,59 @@
+"""Tests for SQLite engines shared by concurrent processes."""
+
+import multiprocessing
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from edify.token_cache import TokenCache, TokenCacheEntry, create_cache_engine
+
+PROCESSES = 32
+ROUNDS = 20
+
+
+def _worker(db_path: str, worker: int) -> None:
+    """Write own entries and rewrite a shared hot set, contending every round."""
+    engine = create_cache_engine(db_path)
+    for n in range(ROUNDS):
+        cache = TokenCache(engine)
+        cache.get_many([f"shared-{i}" for i in range(10)], "model")
+        cache.put_many("model", {f"shared-{n % 10}": n, f"w{worker}-{n}": n})
+
+
+def test_cache_engine_uses_wal(tmp_path: Path) -> None:
+    """File caches are opened in WAL mode with relaxed syncing."""
+    engine = create_cache_engine(str(tmp_path / "cache.db"))
+
+    with engine.connect() as conn:
+        journal = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+
+    assert journal == "wal"
+    assert synchronous == 1  # NORMAL
+
+
+def test_concurrent_processes_share_one_cache_file(tmp_path: Path) -> None:
+    """Many processes creating and writing one new cache file all succeed.
+
+    Given: A cache path that does not exist yet
+    When: 32 processes create it and write to it at the same time
+    Then: Every process exits cleanly and every write is present
+    """
+    db_path = tmp_path / "token_cache.db"
+
+    # Forked workers skip re-importing edify, so they start contending at once
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_worker, args=(str(db_path), worker))
+        for worker in range(PROCESSES)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=120)
+
+    assert [w.exitcode for w in workers] == [0] * PROCESSES
+    with sessionmaker(bind=create_cache_engine(str(db_path)))() as session:
+        rows = session.scalar(select(func.count()).select_from(TokenCacheEntry))
+    assert rows == PROCESSES * ROUNDS + 10
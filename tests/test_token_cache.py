@@ -186,9 +186,9 @@ class TestCacheIntegration:
         file1.write_text(content)
         file2.write_text(content)
 
-        # Mock count_tokens_for_file in token_cache module to return 10
+        # Mock the async per-content counter to return 10
         mock_count = mocker.patch(
-            "edify.token_cache._count_tokens_for_content", return_value=10
+            "edify.tokens._count_tokens_for_content_async", return_value=10
         )
         # Mock get_default_cache to return in-memory cache
         real_cache = TokenCache(create_cache_engine(":memory:"))
@@ -245,7 +245,7 @@ class TestCacheIntegration:
             side_effect=RuntimeError("DB schema mismatch"),
         )
         mock_count = mocker.patch(
-            "edify.tokens.count_tokens_for_file", return_value=10
+            "edify.tokens._count_tokens_for_content_async", return_value=10
         )
 
         results = count_tokens_for_files([test_file], ModelId("test-model"))
@@ -0,0 +1,65 @@
+"""Tests for batched token cache lookups and writes."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from edify.token_cache import TokenCache, TokenCacheEntry, create_cache_engine
+
+
+class TestTokenCacheBatch:
+    """Tests for TokenCache get_many/put_many/flush."""
+
+    def test_bulk_round_trip_commits_once_per_call(self) -> None:
+        """get_many and put_many handle 1000 keys with O(1) commits.
+
+        Given: Empty token cache and 1000 content hashes
+        When: Calling put_many for half of them, then get_many for all
+        Then: get_many returns only the stored half; put_many commits once
+              and get_many does not commit at all
+        """
+        engine = create_cache_engine(":memory:")
+        cache = TokenCache(engine)
+        commits: list[object] = []
+        event.listen(engine, "commit", commits.append)
+        keys = [f"{n:032x}" for n in range(1000)]
+
+        cache.put_many("model-1", {key: n for n, key in enumerate(keys[:500])})
+        after_put = len(commits)
+        found = cache.get_many(keys, "model-1")
+
+        assert found == {key: n for n, key in enumerate(keys[:500])}
+        assert after_put == 1
+        assert len(commits) == 1
+
+    def test_get_many_defers_last_used_to_flush(self) -> None:
+        """Hits from get_many are touched by the next flush, not the lookup.
+
+        Given: Token cache with an entry whose last_used is in the past
+        When: Calling get_many, then flush
+        Then: last_used is unchanged after get_many and updated after flush
+        """
+        engine = create_cache_engine(":memory:")
+        cache = TokenCache(engine)
+        cache.put("abc123", "model-1", 42)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as session:
+            entry = session.get(TokenCacheEntry, ("abc123", "model-1"))
+            assert entry is not None
+            past = entry.last_used - timedelta(days=1)
+            entry.last_used = past
+            session.commit()
+
+        def last_used() -> datetime:
+            with session_factory() as session:
+                entry = session.get(TokenCacheEntry, ("abc123", "model-1"))
+                assert entry is not None
+                return entry.last_used
+
+        cache.get_many(["abc123"], "model-1")
+        before_flush = last_used()
+        cache.flush()
+
+        assert before_flush == past
+        assert last_used() > past
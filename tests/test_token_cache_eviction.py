@@ -0,0 +1,146 @@
+"""Tests for token cache eviction, statistics and the tokens cache commands."""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from edify.cli import cli
+from edify.token_cache import (
+    FileHashEntry,
+    TokenCache,
+    TokenCacheEntry,
+    create_cache_engine,
+)
+from edify.token_cache_maintenance import (
+    CacheLimits,
+    cache_stats,
+    clear_cache,
+    prune_cache,
+)
+
+MODEL = "claude-sonnet-4-5-20250929"
+NO_LIMITS = CacheLimits(max_age_days=None, max_rows=None)
+
+
+@pytest.fixture
+def engine() -> Engine:
+    """Cache with entries a-e last used 0-4 days ago, each with a file hash."""
+    engine = create_cache_engine(":memory:")
+    now = datetime.now(UTC)
+    with sessionmaker(bind=engine)() as session:
+        for age, md5 in enumerate("abcde"):
+            session.add(
+                TokenCacheEntry(
+                    md5_hex=md5,
+                    model_id=MODEL,
+                    token_count=age,
+                    last_used=now - timedelta(days=age),
+                )
+            )
+            session.add(
+                FileHashEntry(path=f"/{md5}", size=1, mtime_ns=1, inode=1, md5_hex=md5)
+            )
+        session.commit()
+    return engine
+
+
+def _remaining(engine: Engine) -> tuple[list[str], list[str]]:
+    with sessionmaker(bind=engine)() as session:
+        entries = session.scalars(select(TokenCacheEntry.md5_hex)).all()
+        hashes = session.scalars(select(FileHashEntry.md5_hex)).all()
+    return sorted(entries), sorted(hashes)
+
+
+def test_prune_evicts_entries_older_than_max_age(engine: Engine) -> None:
+    """Entries unused for longer than max_age_days go, with their file hashes.
+
+    Given: Entries last used 0-4 days ago
+    When: Pruning with a 2.5 day limit
+    Then: Only the three newest entries and their hashes remain
+    """
+    result = prune_cache(engine, CacheLimits(max_age_days=2.5, max_rows=None))
+
+    assert result.removed_rows == 2
+    assert _remaining(engine) == (["a", "b", "c"], ["a", "b", "c"])
+
+
+def test_prune_keeps_most_recently_used_rows(engine: Engine) -> None:
+    """A row cap evicts the least recently used entries first."""
+    prune_cache(engine, NO_LIMITS.model_copy(update={"max_rows": 2}))
+
+    assert _remaining(engine) == (["a", "b"], ["a", "b"])
+
+
+def test_prune_within_limits_removes_nothing(engine: Engine) -> None:
+    """Nothing is evicted when every limit already holds."""
+    result = prune_cache(engine, CacheLimits(), vacuum=False)
+
+    assert result.removed_rows == 0
+    assert _remaining(engine)[0] == ["a", "b", "c", "d", "e"]
+
+
+def test_clear_empties_every_table(engine: Engine) -> None:
+    """Clearing removes all entries, file hashes and counters."""
+    TokenCache(engine).get_many(["a"], MODEL)
+    TokenCache(engine).flush()
+
+    result = clear_cache(engine)
+
+    assert result.removed_rows == 5
+    assert _remaining(engine) == ([], [])
+    assert cache_stats(engine).hits == 0
+
+
+def test_stats_report_lifetime_hit_rate(engine: Engine) -> None:
+    """Hits and misses accumulate across cache instances once flushed.
+
+    Given: Two lookups of cached content and one of unknown content
+    When: Reading stats after each cache has been flushed
+    Then: Hit rate is 2/3 alongside row and model counts
+    """
+    for md5s in (["a", "missing"], ["b"]):
+        cache = TokenCache(engine)
+        cache.get_many(md5s, MODEL)
+        cache.flush()
+
+    stats = cache_stats(engine)
+
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert stats.hit_rate == pytest.approx(2 / 3)
+    assert (stats.rows, stats.models, stats.file_hashes) == (5, 1, 5)
+    assert stats.size_bytes > 0
+
+
+def test_cli_cache_stats_json(engine: Engine, mocker: MockerFixture) -> None:
+    """`tokens cache stats --json` prints stats as JSON without counting."""
+    mocker.patch("edify.token_cache.get_default_cache_engine", return_value=engine)
+
+    result = CliRunner().invoke(cli, ["tokens", "cache", "stats", "--json"])
+
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.output)
+    assert output["rows"] == 5
+    assert output["hit_rate"] is None
+
+
+def test_cli_cache_prune_overrides_config(
+    engine: Engine, mocker: MockerFixture
+) -> None:
+    """Command-line limits take precedence over configured ones."""
+    mocker.patch("edify.token_cache.get_default_cache_engine", return_value=engine)
+    mocker.patch(
+        "edify.token_cache_maintenance.get_token_cache_config",
+        return_value={"max_rows": 4},
+    )
+
+    result = CliRunner().invoke(cli, ["tokens", "cache", "prune", "--max-rows", "1"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith("Removed 4 entries")
+    assert _remaining(engine)[0] == ["a"]
@@ -0,0 +1,66 @@
+"""Tests for the stat-keyed file hash layer of the token cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from edify import tokens
+from edify.token_cache import TokenCache, create_cache_engine, stat_file
+from edify.tokens import ModelId, count_tokens_for_files
+
+MODEL = ModelId("claude-sonnet-4-5-20250929")
+
+
+@pytest.fixture
+def cache(mocker: MockerFixture) -> TokenCache:
+    """In-memory cache used by count_tokens_for_files, with a mocked API."""
+    cache = TokenCache(create_cache_engine(":memory:"))
+    mocker.patch("edify.token_cache.get_default_cache", return_value=cache)
+    mocker.patch("edify.tokens.AsyncAnthropic")
+    mocker.patch("edify.tokens._count_tokens_for_content_async", return_value=3)
+    return cache
+
+
+def test_get_file_hashes_requires_identical_stat(tmp_path: Path) -> None:
+    """A recorded hash is returned only while size, mtime and inode match.
+
+    Given: A file whose hash was recorded for its current stat
+    When: Looking it up before and after its mtime changes
+    Then: The hash is returned first, then treated as unknown
+    """
+    path = tmp_path / "a.md"
+    path.write_text("hello")
+    cache = TokenCache(create_cache_engine(":memory:"))
+    cache.put_file_hashes({stat_file(path): "abc"})
+
+    before = cache.get_file_hashes([stat_file(path)])
+    os.utime(path, ns=(0, 0))
+    after = cache.get_file_hashes([stat_file(path)])
+
+    assert before == {str(path.resolve()): "abc"}
+    assert after == {}
+
+
+def test_warm_run_skips_reading_unchanged_files(
+    tmp_path: Path, cache: TokenCache, mocker: MockerFixture
+) -> None:
+    """Unchanged files are answered from their stat without being read.
+
+    Given: Two files counted once already
+    When: Counting again after one of them is rewritten
+    Then: Only the rewritten file is read; both counts are returned
+    """
+    unchanged = tmp_path / "unchanged.md"
+    changed = tmp_path / "changed.md"
+    unchanged.write_text("stays the same")
+    changed.write_text("first version")
+    count_tokens_for_files([unchanged, changed], MODEL)
+    changed.write_text("second, longer version")
+    read = mocker.spy(tokens, "_read_file")
+
+    results = count_tokens_for_files([unchanged, changed], MODEL)
+
+    assert [r.count for r in results] == [3, 3]
+    assert [call.args[0] for call in read.call_args_list] == [changed]
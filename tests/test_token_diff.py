@@ -0,0 +1,204 @@
+"""Tests for token count deltas against a git revision."""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+from pytest_mock.plugin import MockType
+
+from edify.cli import cli
+from edify.git import read_blobs
+from edify.token_cache import TokenCache, create_cache_engine
+from edify.token_diff import count_token_deltas, read_at_revision
+from edify.tokens import ModelId
+from tests.pytest_helpers import init_repo_at
+
+MODEL = ModelId("claude-sonnet-4-5-20250929")
+
+
+def _word_count(content: str, *_args: object) -> int:
+    """Fake API count: one token per word."""
+    return len(content.split())
+
+
+def _commit(repo: Path, files: dict[str, str]) -> None:
+    for name, text in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    subprocess.run(["git", "-C", str(repo), "add", "."], check=True)
+    subprocess.run(
+        ["git", "-C", str(repo), "commit", "-qm", "docs"],
+        capture_output=True,
+        check=True,
+    )
+
+
+@pytest.fixture
+def counter(mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch) -> MockType:
+    """Word-counting fake API behind an in-memory cache."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test-key")
+    mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
+    mocker.patch("edify.tokens_cli.resolve_model_alias", return_value=MODEL)
+    mocker.patch(
+        "edify.token_cache.get_default_cache",
+        return_value=TokenCache(create_cache_engine(":memory:")),
+    )
+    mocker.patch("edify.tokens.AsyncAnthropic")
+    return mocker.patch(
+        "edify.tokens._count_tokens_for_content_async", side_effect=_word_count
+    )
+
+
+def test_read_blobs_handles_missing_paths_and_trees(tmp_path: Path) -> None:
+    """Blobs come back byte for byte; absent paths and directories are None."""
+    init_repo_at(tmp_path)
+    _commit(tmp_path, {"a b.md": "line one\n\nline two", "dir/c.md": "c\n"})
+
+    blobs = read_blobs("HEAD", ["a b.md", "gone.md", "dir", "dir/c.md"], tmp_path)
+
+    assert blobs == [b"line one\n\nline two", None, None, b"c\n"]
+
+
+def test_since_reports_deltas_counting_only_changed_blobs(
+    tmp_path: Path, counter: MockType
+) -> None:
+    """Unchanged files cost one request for both sides of the comparison.
+
+    Given: Three committed files; one is then edited and one added
+    When: Counting all files with --since HEAD
+    Then: Per-file and total deltas, and the edited file's old blob is
+          the only request beyond the working tree
+    """
+    init_repo_at(tmp_path)
+    _commit(tmp_path, {"a.md": "one two", "b.md": "three", "c.md": "four five"})
+    (tmp_path / "a.md").write_text("one two three four")
+    (tmp_path / "d.md").write_text("six")
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "tokens",
+            str(tmp_path),
+            "--exclude",
+            "README.md",
+            "--since",
+            "HEAD",
+            "--json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.output)
+    assert [
+        (Path(f["path"]).name, f["before"], f["after"]) for f in output["files"]
+    ] == [
+        ("a.md", 2, 4),
+        ("b.md", 1, 1),
+        ("c.md", 2, 2),
+        ("d.md", None, 1),
+    ]
+    assert (output["before"], output["after"], output["delta"]) == (5, 8, 3)
+    assert counter.call_count == 5
+
+
+def test_since_text_lists_changed_files(tmp_path: Path, counter: MockType) -> None:
+    """Text output shows changes largest first and counts unchanged files."""
+    init_repo_at(tmp_path)
+    _commit(tmp_path, {"a.md": "one two", "b.md": "three"})
+    (tmp_path / "a.md").write_text("one")
+
+    result = CliRunner().invoke(
+        cli,
+        ["tokens", str(tmp_path / "a.md"), str(tmp_path / "b.md"), "--since", "HEAD"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"{tmp_path / 'a.md'}: 2 -> 1 (-1)" in result.output
+    assert "1 unchanged files" in result.output
+    assert "Total: 3 -> 2 tokens (-1)" in result.output
+
+
+def test_since_unknown_revision_fails(tmp_path: Path, counter: MockType) -> None:
+    """An unknown revision is reported before any request is made."""
+    init_repo_at(tmp_path)
+
+    result = CliRunner().invoke(
+        cli, ["tokens", str(tmp_path / "README.md"), "--since", "no-such-rev"]
+    )
+
+    assert result.exit_code == 1
+    assert "Cannot read files at no-such-rev" in result.output
+    counter.assert_not_called()
+
+
+def test_crlf_file_unchanged_since_revision_is_counted_once(
+    tmp_path: Path, counter: MockType
+) -> None:
+    """Both sides are decoded with the same newline handling."""
+    init_repo_at(tmp_path)
+    path = tmp_path / "crlf.md"
+    path.write_bytes(b"one two\r\nthree\r\n")
+    subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+    subprocess.run(
+        ["git", "-C", str(tmp_path), "commit", "-qm", "crlf"],
+        capture_output=True,
+        check=True,
+    )
+
+    assert read_at_revision("HEAD", [path]) == [path.read_text()]
+    [delta] = count_token_deltas([path], "HEAD", MODEL)
+
+    assert (delta.before, delta.after) == (3, 3)
+    assert counter.call_count == 1
+
+
+def test_since_reports_files_deleted_from_directories_and_globs(
+    tmp_path: Path, counter: MockType
+) -> None:
+    """Files a directory or glob selected at the revision count as deleted.
+
+    Given: Committed files in and under a directory; two are then deleted
+    When: Counting the directory, and a glob, with --since HEAD
+    Then: Deleted files go from their old count to none, excluded and
+          unselected files stay out, and totals include the deletions
+    """
+    init_repo_at(tmp_path)
+    _commit(
+        tmp_path,
+        {
+            "a.md": "one two",
+            "b.md": "three four five",
+            "sub/c.md": "six",
+            "sub/d.txt": "seven",
+            "skip/e.md": "eight",
+        },
+    )
+    (tmp_path / "b.md").unlink()
+    (tmp_path / "sub/c.md").unlink()
+    (tmp_path / "skip/e.md").unlink()
+    exclude = ["--exclude", "README.md", "--exclude", "skip"]
+
+    result = CliRunner().invoke(
+        cli, ["tokens", str(tmp_path), *exclude, "--since", "HEAD", "--json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.output)
+    assert [
+        (Path(f["path"]).relative_to(tmp_path).as_posix(), f["before"], f["after"])
+        for f in output["files"]
+    ] == [("a.md", 2, 2), ("b.md", 3, None), ("sub/c.md", 1, None)]
+    assert (output["before"], output["after"], output["delta"]) == (6, 2, -4)
+
+    result = CliRunner().invoke(
+        cli, ["tokens", f"{tmp_path}/**/*.md", *exclude, "--since", "HEAD"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"{tmp_path / 'b.md'}: 3 -> deleted (-3)" in result.output
+    assert f"{tmp_path / 'sub/c.md'}: 1 -> deleted (-1)" in result.output
+    assert "Total: 6 -> 2 tokens (-4)" in result.output
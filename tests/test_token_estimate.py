@@ -0,0 +1,121 @@
+"""Tests for offline token estimation and its calibration."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+from sqlalchemy.engine import Engine
+
+from edify.cli import cli
+from edify.token_cache import TokenCache, create_cache_engine, stat_file
+from edify.token_estimate import (
+    DEFAULT_ERROR,
+    calibrate_estimators,
+    fit_calibration,
+    load_calibration,
+    raw_estimate,
+)
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", 0),
+        ("hello world", 2),
+        ("## Heading\n", 3),
+        ("internationalization", 3),
+        ("2025-12-16", 6),
+        ("漢字", 2),
+    ],
+)
+def test_raw_estimate_pieces(text: str, expected: int) -> None:
+    """Words, digit groups, symbol pairs, line breaks and non-ASCII count."""
+    assert raw_estimate(text) == expected
+
+
+def test_fit_calibration_recovers_linear_relation() -> None:
+    """A least-squares fit of exact = 2 * raw + 10 is exact, with no error."""
+    samples = [(raw, 2 * raw + 10) for raw in (10, 50, 100, 400, 1000)]
+
+    calibration = fit_calibration(MODEL, samples)
+
+    assert calibration is not None
+    assert calibration.scale == pytest.approx(2)
+    assert calibration.offset == pytest.approx(10)
+    assert calibration.error == pytest.approx(0)
+    assert calibration.estimate("hello world") == 14
+
+
+def test_fit_calibration_needs_enough_samples() -> None:
+    """Fewer than five usable samples give no calibration."""
+    assert fit_calibration(MODEL, [(10, 20)] * 4 + [(0, 5)]) is None
+
+
+@pytest.fixture
+def engine() -> Engine:
+    """Empty in-memory token cache."""
+    return create_cache_engine(":memory:")
+
+
+def test_calibrate_uses_unchanged_cached_files(tmp_path: Path, engine: Engine) -> None:
+    """Calibration pairs cached counts with files whose stat still matches.
+
+    Given: Six files counted at 1.5x their raw estimate, one then edited
+    When: Calibrating and loading the calibration by alias
+    Then: The scale is 1.5 from the five unchanged files
+    """
+    cache = TokenCache(engine)
+    paths = []
+    for n in range(6):
+        path = tmp_path / f"{n}.md"
+        path.write_text("word " * (10 * (n + 1)))
+        paths.append(path)
+        md5_hex = f"md5-{n}"
+        cache.put_many(MODEL, {md5_hex: 15 * (n + 1)})
+        cache.put_file_hashes({stat_file(path): md5_hex})
+    paths[0].write_text("edited")
+
+    fitted = calibrate_estimators(engine)
+    calibration = load_calibration(engine, "Sonnet")
+
+    assert [c.samples for c in fitted] == [5]
+    assert calibration.model_id == MODEL
+    assert calibration.scale == pytest.approx(1.5)
+    assert load_calibration(engine, "opus").error == DEFAULT_ERROR
+
+
+def test_cli_estimate_never_calls_api(
+    tmp_path: Path, engine: Engine, mocker: MockerFixture
+) -> None:
+    """--estimate works without an API key and reports an error band."""
+    mocker.patch("edify.token_cache.get_default_cache_engine", return_value=engine)
+    mocker.patch("edify.tokens_cli.get_api_key", return_value=None)
+    mocker.patch.dict("os.environ", {"ANTHROPIC_API_KEY": ""})
+    anthropic = mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
+    path = tmp_path / "prompt.md"
+    path.write_text("hello world " * 50)
+
+    result = CliRunner().invoke(cli, ["tokens", str(path), "--estimate", "--json"])
+
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.output)
+    assert output["estimated"] is True
+    [entry] = output["files"]
+    assert entry["count"] == output["total"] == 100
+    assert entry["low"] < entry["count"] < entry["high"]
+    anthropic.assert_not_called()
+
+
+def test_cli_estimate_rejects_ndjson(tmp_path: Path) -> None:
+    """--estimate has no streaming output, so --ndjson is a usage error."""
+    path = tmp_path / "prompt.md"
+    path.write_text("hello world")
+
+    result = CliRunner().invoke(cli, ["tokens", str(path), "--estimate", "--ndjson"])
+
+    assert result.exit_code == 2
+    assert "--ndjson cannot be combined with --estimate" in result.output
@@ -0,0 +1,136 @@
+"""Tests for per-section token counting of Markdown files."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+from pytest_mock.plugin import MockType
+
+from edify.cli import cli
+from edify.token_cache import TokenCache, create_cache_engine
+from edify.token_sections import (
+    SectionCount,
+    count_sections_for_files,
+    split_sections,
+)
+from edify.tokens import ModelId
+
+MODEL = ModelId("claude-sonnet-4-5-20250929")
+FRAMING = 5
+DOCUMENT = """Intro line.
+# Title
+One two three.
+```python
+# not a heading
+```
+## Details
+Four five six seven eight.
+"""
+
+
+def _word_count(content: str, *_args: object) -> int:
+    """Fake API count: one token per word plus request framing."""
+    return len(content.split()) + FRAMING
+
+
+@pytest.fixture
+def counter(mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch) -> MockType:
+    """Word-counting fake API behind an in-memory cache."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test-key")
+    mocker.patch(
+        "edify.token_cache.get_default_cache",
+        return_value=TokenCache(create_cache_engine(":memory:")),
+    )
+    mocker.patch("edify.tokens.AsyncAnthropic")
+    return mocker.patch(
+        "edify.tokens._count_tokens_for_content_async", side_effect=_word_count
+    )
+
+
+def test_split_sections_ignores_headings_in_fences() -> None:
+    """Sections start at headings outside code fences and cover all text."""
+    sections = split_sections(DOCUMENT)
+
+    assert [(s.heading, s.line) for s in sections] == [
+        ("", 1),
+        ("Title", 2),
+        ("Details", 7),
+    ]
+    assert "".join(s.content for s in sections) == DOCUMENT
+
+
+def test_blank_lines_before_first_heading_join_its_section(
+    tmp_path: Path, counter: MockType
+) -> None:
+    """No whitespace-only section is sent, which the API would reject."""
+    text = "\n\n# Heading\nOne two.\n"
+    blank = tmp_path / "blank.md"
+    blank.write_text(" \n\n")
+    path = tmp_path / "doc.md"
+    path.write_text(text)
+
+    assert [(s.heading, s.line, s.content) for s in split_sections(text)] == [
+        ("Heading", 3, text)
+    ]
+    result, empty = count_sections_for_files([path, blank], MODEL)
+
+    assert result.sections == [SectionCount(heading="Heading", line=3, count=4)]
+    assert empty.count == 0
+    assert empty.sections == []
+    assert all(call.args[0].strip() for call in counter.call_args_list)
+
+
+def test_sections_sum_to_file_count(tmp_path: Path, counter: MockType) -> None:
+    """Framing is counted once per file, not once per section."""
+    path = tmp_path / "doc.md"
+    path.write_text(DOCUMENT)
+
+    [result] = count_sections_for_files([path], MODEL)
+
+    assert result.sections == [
+        SectionCount(heading="", line=1, count=2),
+        SectionCount(heading="Title", line=2, count=11),
+        SectionCount(heading="Details", line=7, count=7),
+    ]
+    assert result.count == 20 + FRAMING
+    assert counter.call_count == 4  # three sections and the framing probe
+
+
+def test_editing_one_section_costs_one_request(
+    tmp_path: Path, counter: MockType
+) -> None:
+    """Unchanged sections are answered from the cache on a re-count.
+
+    Given: A file counted once by section
+    When: One section is edited and the file is counted again
+    Then: Only the edited section reaches the API
+    """
+    path = tmp_path / "doc.md"
+    path.write_text(DOCUMENT)
+    count_sections_for_files([path], MODEL)
+    path.write_text(DOCUMENT.replace("Four five", "Four"))
+    counter.reset_mock()
+
+    [result] = count_sections_for_files([path], MODEL)
+
+    assert counter.call_count == 1
+    assert result.sections[-1].count == 6
+
+
+def test_cli_sections_json_lists_largest_first(
+    tmp_path: Path, counter: MockType, mocker: MockerFixture
+) -> None:
+    """`tokens --sections --json` reports sections by descending count."""
+    mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
+    mocker.patch("edify.tokens_cli.resolve_model_alias", return_value=MODEL)
+    path = tmp_path / "doc.md"
+    path.write_text(DOCUMENT)
+
+    result = CliRunner().invoke(cli, ["tokens", str(path), "--sections", "--json"])
+
+    assert result.exit_code == 0, result.output
+    [entry] = json.loads(result.output)["files"]
+    assert [s["heading"] for s in entry["sections"]] == ["Title", "Details", ""]
+    assert entry["count"] == 20 + FRAMING
@@ -0,0 +1,131 @@
+"""Unit tests for the in-memory and persisted model alias memo."""
+
+import json
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from edify import model_aliases
+from edify.model_aliases import CacheData, resolve_model_alias
+
+HAIKU_OLD = {"id": "claude-haiku-4-5-20251001", "created_at": "2025-10-01T00:00:00Z"}
+HAIKU_NEW = {"id": "claude-haiku-5-20260901", "created_at": "2026-09-01T00:00:00Z"}
+
+
+def _write_cache(cache_dir: Path, age: timedelta) -> Path:
+    cache_dir.mkdir()
+    cache_file = cache_dir / "models_cache.json"
+    fetched_at = datetime.now(tz=UTC) - age
+    cache_file.write_text(
+        json.dumps({"fetched_at": fetched_at.isoformat(), "models": [HAIKU_OLD]})
+    )
+    return cache_file
+
+
+def test_repeat_lookups_skip_file_and_filtering(
+    tmp_path: Path, mock_models_api: Callable[..., Mock], mocker: MockerFixture
+) -> None:
+    """The cache file is parsed once and each alias resolved once.
+
+    Given: A fresh cache file listing a haiku model
+    When: "haiku" is resolved repeatedly
+    Then: One parse, one match, no API call; the alias is persisted
+    """
+    cache_dir = tmp_path / "cache"
+    cache_file = _write_cache(cache_dir, timedelta(hours=1))
+    client = mock_models_api()
+    parse = mocker.spy(CacheData, "model_validate_json")
+    match = mocker.spy(model_aliases, "_latest_match")
+
+    results = {resolve_model_alias("HAIKU", client, cache_dir) for _ in range(100)}
+
+    assert results == {HAIKU_OLD["id"]}
+    assert parse.call_count == 1
+    assert match.call_count == 1
+    client.models.list.assert_not_called()
+    persisted = json.loads(cache_file.read_text())
+    assert persisted["aliases"] == {"haiku": HAIKU_OLD["id"]}
+
+
+def test_unknown_alias_is_fetched_once(
+    tmp_path: Path, mock_models_api: Callable[..., Mock]
+) -> None:
+    """An alias matching no model is memoized after one API fetch."""
+    cache_dir = tmp_path / "cache"
+    client = mock_models_api()
+
+    for _ in range(3):
+        assert resolve_model_alias("mystery", client, cache_dir) == "mystery"
+
+    client.models.list.assert_called_once()
+
+
+def test_aging_list_refreshes_without_blocking(
+    tmp_path: Path, mock_models_api: Callable[..., Mock]
+) -> None:
+    """Near the TTL, lookups answer from the memo while a refresh runs.
+
+    Given: A cache file 20 hours old and a models API that is slow to reply
+    When: "haiku" is resolved
+    Then: The memoized model returns at once; after the background refresh
+          the newer model is resolved and persisted
+    """
+    cache_dir = tmp_path / "cache"
+    cache_file = _write_cache(cache_dir, timedelta(hours=20))
+    client = mock_models_api(models=[HAIKU_OLD, HAIKU_NEW])
+    release = threading.Event()
+    listed = client.models.list.return_value
+    client.models.list.side_effect = lambda: release.wait() and listed
+
+    assert resolve_model_alias("haiku", client, cache_dir) == HAIKU_OLD["id"]
+
+    release.set()
+    refresh = model_aliases._tables[cache_dir].refresh
+    assert refresh is not None
+    refresh.join(timeout=5)
+    assert resolve_model_alias("haiku", client, cache_dir) == HAIKU_NEW["id"]
+    client.models.list.assert_called_once()
+    assert json.loads(cache_file.read_text())["aliases"]["haiku"] == HAIKU_NEW["id"]
+
+
+def test_alias_ttl_is_separate_from_model_list_ttl(
+    tmp_path: Path,
+    mock_models_api: Callable[..., Mock],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An expired memo refreshes in the background before the list expires."""
+    cache_dir = tmp_path / "cache"
+    _write_cache(cache_dir, timedelta(hours=2))
+    client = mock_models_api(models=[HAIKU_OLD, HAIKU_NEW])
+    monkeypatch.setattr(model_aliases, "ALIAS_TTL_HOURS", 1)
+
+    assert resolve_model_alias("haiku", client, cache_dir) == HAIKU_OLD["id"]
+
+    refresh = model_aliases._tables[cache_dir].refresh
+    assert refresh is not None
+    refresh.join(timeout=5)
+    client.models.list.assert_called_once()
+
+
+def test_concurrent_saves_use_separate_temp_files(tmp_path: Path) -> None:
+    """Writers never share a temp file; the cache ends whole, with no leftovers."""
+    cache_file = tmp_path / "models_cache.json"
+    tables = [model_aliases._AliasTable(cache_file) for _ in range(8)]
+    for n, table in enumerate(tables):
+        table.replace_models([])
+        assert table.data is not None
+        table.data.aliases = {f"alias-{n}": "x" * 10_000}
+
+    threads = [threading.Thread(target=table.save) for table in tables]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(CacheData.model_validate_json(cache_file.read_text()).aliases) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["models_cache.json"]
@@ -0,0 +1,96 @@
+"""Tests for streaming token counts as each file finishes."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from edify.cli import cli
+from edify.token_cache import TokenCache, create_cache_engine
+from edify.token_sections import count_sections_for_files
+from edify.tokens import ModelId, TokenCount, count_tokens_for_files
+
+MODEL = ModelId("claude-sonnet-4-5-20250929")
+
+
+async def _slow_for_long_content(content: str, *_args: object) -> int:
+    """Fake API count: longer content takes longer and counts more."""
+    await asyncio.sleep(len(content) / 1000)
+    return len(content)
+
+
+@pytest.fixture
+def files(tmp_path: Path, mocker: MockerFixture) -> list[Path]:
+    """Create a slow large file followed by two quicker ones."""
+    mocker.patch(
+        "edify.token_cache.get_default_cache",
+        return_value=TokenCache(create_cache_engine(":memory:")),
+    )
+    mocker.patch("edify.tokens.AsyncAnthropic")
+    mocker.patch(
+        "edify.tokens._count_tokens_for_content_async",
+        side_effect=_slow_for_long_content,
+    )
+    paths = []
+    for name, size in (("large.md", 50), ("small.md", 5), ("medium.md", 20)):
+        path = tmp_path / name
+        path.write_text("x" * size)
+        paths.append(path)
+    return paths
+
+
+def test_results_stream_in_completion_order(files: list[Path]) -> None:
+    """on_result sees quick files first; the return value keeps input order."""
+    streamed: list[TokenCount] = []
+
+    results = count_tokens_for_files(files, MODEL, on_result=streamed.append)
+
+    assert [Path(r.path).name for r in streamed] == [
+        "small.md",
+        "medium.md",
+        "large.md",
+    ]
+    assert [r.count for r in results] == [50, 5, 20]
+
+
+def test_sections_stream_in_completion_order(files: list[Path]) -> None:
+    """A sectioned file is reported as soon as its last section is counted."""
+    streamed: list[TokenCount] = []
+
+    results = count_sections_for_files(files, MODEL, on_result=streamed.append)
+
+    assert [Path(r.path).name for r in streamed] == [
+        "small.md",
+        "medium.md",
+        "large.md",
+    ]
+    assert streamed == sorted(results, key=lambda r: r.count)
+
+
+def test_cli_ndjson_streams_then_summarizes(
+    files: list[Path], mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """--ndjson prints a line per file, then totals with the largest first.
+
+    Given: A directory holding three files of different sizes
+    When: Counting the directory with --ndjson
+    Then: One object per file, then a summary ranking them by count
+    """
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test-key")
+    mocker.patch("edify.tokens_cli.Anthropic", autospec=True)
+    mocker.patch("edify.tokens_cli.resolve_model_alias", return_value=MODEL)
+
+    result = CliRunner().invoke(cli, ["tokens", str(files[0].parent), "--ndjson"])
+
+    assert result.exit_code == 0, result.output
+    *lines, summary = [json.loads(line) for line in result.output.splitlines()]
+    assert sorted(line["count"] for line in lines) == [5, 20, 50]
+    assert summary["total"] == 75
+    assert [Path(f["path"]).name for f in summary["largest"]] == [
+        "large.md",
+        "medium.md",
+        "small.md",
+    ]